@@ -0,0 +1,233 @@
+"""
+Group /about Page Text Analyzer
+Facebook Group Data Extractor - Single-pass parsing of /about page text
+
+Purpose:
+- Pull every field scrape_group_data() needs from the /about page body text
+  in one pass, instead of one pass per field (line split for the description,
+  three findall scans for the member count, repeated lower() for privacy)
+
+Key Features:
+- analyze_about_text() is a pure function: text in, dict out (no Selenium)
+- Each line is lower-cased once; cheap substring checks decide which of the
+  compiled patterns run on it
+- Same rules as the original scraper code:
+  - description: first suitable line within 4 lines after "About this group"
+  - member count: "1,169 total members" beats "Members · 1,167", which beats
+    a line ending in "1,167 members"
+  - privacy: "public group" beats "private group"
+- Extra labels: visibility (Visible/Hidden) and the "Created ..." history line
+- Built-in check and benchmark: python about_parser.py --size-kb 512
+
+Usage:
+    from about_parser import analyze_about_text
+    about = analyze_about_text(page_text)
+    about['description'], about['member_count'], about['privacy']
+"""
+
+from __future__ import annotations
+
+# Standard library imports
+import re          # Member count patterns
+from typing import Any, Dict, Optional  # Type hints
+
+
+# Lines after the "About this group" heading searched for the description
+DESCRIPTION_WINDOW = 4
+
+# Minimum description length and words that mark a line as page chrome, not description
+DESCRIPTION_MIN_LENGTH = 21
+DESCRIPTION_SKIP_WORDS = ('public', 'private', 'visible', 'anyone can see',
+                          'see more', 'members', 'activity', 'created')
+
+# Member count patterns, best first; only tried on lines containing "member"
+_COUNT = r"(\d{1,3}(?:,\d{3})*)"
+_MEMBER_PATTERNS = (
+    ("total", re.compile(_COUNT + r"\s+total\s+members?", re.IGNORECASE)),   # "1,169 total members"
+    ("members_dot", re.compile(r"Members\s+·\s+" + _COUNT, re.IGNORECASE)),  # "Members · 1,167"
+    ("line_end", re.compile(_COUNT + r"\s+members?\s*$", re.IGNORECASE)),     # "1,167 members" at end of line
+)
+
+# Names of the member count patterns in precedence order
+MEMBER_COUNT_SOURCES = tuple(source for source, _ in _MEMBER_PATTERNS)
+
+
+def analyze_about_text(page_text: str) -> Dict[str, Any]:
+    """
+    Extract description, member count, privacy and other labels from /about text.
+
+    Args:
+        page_text: Body text of a group's /about page
+
+    Returns:
+        dict with keys (None when not found):
+            - 'description': str, at most 500 characters
+            - 'member_count': int
+            - 'member_count_source': which pattern matched ('total', 'members_dot', 'line_end')
+            - 'privacy': 'Public' or 'Private'
+            - 'visibility': 'Visible' or 'Hidden'
+            - 'created': the "Created ..." / "Group created ..." line
+    """
+    result: Dict[str, Any] = {
+        "description": None,
+        "member_count": None,
+        "member_count_source": None,
+        "privacy": None,
+        "visibility": None,
+        "created": None,
+    }
+    if not page_text:
+        return result
+
+    best_rank = len(_MEMBER_PATTERNS)
+    public = private = False
+    heading_line: Optional[int] = None  # index of the "About this group" line
+    description_done = False
+
+    for index, line in enumerate(page_text.split("\n")):
+        lower = line.lower()
+
+        # Description: first suitable line shortly after the first heading
+        if not description_done:
+            if heading_line is None:
+                if "about this group" in lower:
+                    heading_line = index
+            elif index - heading_line > DESCRIPTION_WINDOW:
+                description_done = True
+            else:
+                text = line.strip()
+                if len(text) >= DESCRIPTION_MIN_LENGTH and not any(w in lower for w in DESCRIPTION_SKIP_WORDS):
+                    result["description"] = text[:500]
+                    description_done = True
+
+        # Member count: keep the best-ranked pattern seen so far (first match within a rank)
+        if best_rank and "member" in lower:
+            for rank, (source, pattern) in enumerate(_MEMBER_PATTERNS[:best_rank]):
+                match = pattern.search(line)
+                if match:
+                    count = int(match.group(1).replace(",", ""))
+                    if count > 0:
+                        best_rank = rank
+                        result["member_count"] = count
+                        result["member_count_source"] = source
+                        break
+
+        if "group" in lower:
+            if "public group" in lower:
+                public = True
+            elif "private group" in lower:
+                private = True
+
+        stripped = lower.strip()
+        if result["visibility"] is None and stripped in ("visible", "hidden"):
+            result["visibility"] = stripped.capitalize()
+        if result["created"] is None and (stripped.startswith("created") or stripped.startswith("group created")):
+            result["created"] = line.strip()
+
+    if public:
+        result["privacy"] = "Public"
+    elif private:
+        result["privacy"] = "Private"
+    return result
+
+
+# Saved /about text (trimmed) used by the built-in check and benchmark
+SAMPLE_ABOUT_TEXT = """Facebook
+Dallas Cowboys Ticket Exchange
+Public group · 13.6K members
+Join group
+About
+Discussion
+Featured
+Members
+About this group
+Buy, sell and trade Dallas Cowboys tickets at face value. No scalpers, no bots.
+Public
+Anyone can see who's in the group and what they post.
+Visible
+Anyone can find this group.
+History
+Group created on August 3, 2016. Name last changed on May 1, 2019.
+Members · 13,612
+Activity
+12 new posts today
+13,612 total members
+"""
+
+SAMPLE_EXPECTED = {
+    "description": "Buy, sell and trade Dallas Cowboys tickets at face value. No scalpers, no bots.",
+    "member_count": 13612,
+    "member_count_source": "total",
+    "privacy": "Public",
+    "visibility": "Visible",
+    "created": "Group created on August 3, 2016. Name last changed on May 1, 2019.",
+}
+
+
+def _legacy_parse(page_text: str) -> Dict[str, Any]:
+    """The original multi-pass scraper logic, kept for the benchmark comparison."""
+    result: Dict[str, Any] = {"description": None, "member_count": None, "privacy": None}
+    lines = page_text.split('\n')
+    for i, line in enumerate(lines):
+        if 'about this group' in line.lower():
+            for j in range(i + 1, min(i + 5, len(lines))):
+                desc_line = lines[j].strip()
+                if desc_line and len(desc_line) > 20:
+                    if not any(skip in desc_line.lower() for skip in DESCRIPTION_SKIP_WORDS):
+                        result['description'] = desc_line[:500]
+                        break
+            break
+    for pattern in (r'(\d{1,3}(?:,\d{3})*)\s+total\s+members?', r'Members\s+·\s+(\d{1,3}(?:,\d{3})*)',
+                    r'(\d{1,3}(?:,\d{3})*)\s+members?\s*$'):
+        matches = re.findall(pattern, page_text, re.IGNORECASE)
+        if matches and int(matches[0].replace(',', '')) > 0:
+            result['member_count'] = int(matches[0].replace(',', ''))
+            break
+    if 'public' in page_text.lower() and 'public group' in page_text.lower():
+        result['privacy'] = 'Public'
+    elif 'private' in page_text.lower() and 'private group' in page_text.lower():
+        result['privacy'] = 'Private'
+    return result
+
+
+def _run_check_and_benchmark(size_kb: int, repeat: int) -> bool:
+    import time
+
+    print("=" * 60)
+    print("ABOUT PAGE ANALYZER")
+    print("=" * 60)
+    about = analyze_about_text(SAMPLE_ABOUT_TEXT)
+    ok = all(about[key] == value for key, value in SAMPLE_EXPECTED.items())
+    for key, value in SAMPLE_EXPECTED.items():
+        mark = "✅" if about[key] == value else "❌"
+        print(f"{mark} {key}: {about[key]!r}")
+
+    # Large page: the sample followed by a long feed of post text
+    filler = "Someone shared a post about parking near the stadium and tailgate plans\n"
+    page = SAMPLE_ABOUT_TEXT + filler * (size_kb * 1024 // len(filler))
+    for name, func in (("single pass", analyze_about_text), ("multi pass (old)", _legacy_parse)):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func(page)
+        elapsed = (time.perf_counter() - start) / repeat
+        print(f"{name:>17}: {elapsed * 1000:7.2f} ms per {len(page) / 1024:,.0f} KB page")
+    print("=" * 60)
+    return ok
+
+
+__all__ = [
+    "MEMBER_COUNT_SOURCES",
+    "analyze_about_text",
+]
+
+
+if __name__ == "__main__":
+    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Check and benchmark the /about page analyzer')
+    parser.add_argument('--size-kb', type=int, default=512, help='Size of the synthetic large page (default: 512 KB)')
+    parser.add_argument('--repeat', type=int, default=20, help='Runs per timing (default: 20)')
+    args = parser.parse_args()
+
+    sys.exit(0 if _run_check_and_benchmark(args.size_kb, args.repeat) else 1)
@@ -0,0 +1,169 @@
+"""
+Layout Drift Circuit Breaker
+Facebook Group Data Extractor - Fail fast when the page markup changes
+
+Purpose:
+- Notice within minutes, not hours, that extraction stopped working: when the
+  site changes its markup every group falls through every selector, waits out
+  every timeout and ends up with 'Unknown' / 0 values
+- Pause or stop the run once too many recent groups came back empty
+
+Key Features:
+- Per-field failure rate over a sliding window of the last N groups
+  (a field "fails" when it still holds the scraper's default value)
+- Only fields the caller asked for are judged, and only on pages that loaded:
+  failed scrapes, login walls (restricted) and steps that ran out of time are
+  skipped, since they say nothing about the markup
+- Watches group name and member count by default; many groups simply have no
+  description, so it is opt-in
+- Configurable threshold, window and minimum sample count
+- Action 'stop' raises LayoutDriftError; 'pause' sleeps, clears the window
+  and stops after max_pauses pauses (e.g. for a temporary block)
+- The trip is logged with the selectors / patterns that stopped matching
+  (from strategy_stats.py)
+
+Usage:
+    breaker = CircuitBreaker.from_config(cfg)
+    for url in urls:
+        record = scrape_group_data(driver, url)
+        breaker.observe(record)          # raises LayoutDriftError when tripped
+"""
+
+from __future__ import annotations
+
+# Standard library imports
+import time        # Pausing the run
+import logging     # Logging trips and failing strategies
+from collections import deque  # Sliding windows
+from configparser import ConfigParser  # Breaker settings
+from typing import Deque, Dict, Iterable, List, Mapping, Optional  # Type hints
+
+# Local module imports
+from strategy_stats import get_strategy_stats  # Strategies that stopped matching
+
+
+# Value a field keeps in scrape_group_data() when nothing was extracted
+FIELD_DEFAULTS = {
+    "group_name": "Unknown",
+    "member_count": 0,
+    "description": "No description available",
+    "privacy": "",
+}
+
+
+class LayoutDriftError(RuntimeError):
+    """Raised when the failure rate of an extracted field crosses the threshold."""
+
+    def __init__(self, rates: Dict[str, float], strategies: List[str]):
+        self.rates = rates
+        self.strategies = strategies
+        fields = ", ".join(f"{field} {rate:.0%}" for field, rate in rates.items())
+        super().__init__(f"Extraction failure rate above threshold: {fields}")
+
+
+class CircuitBreaker:
+    """Sliding-window failure rates per field with a stop/pause action."""
+
+    def __init__(self, fields: Iterable[str] = ("group_name", "member_count"),
+                 window: int = 20, threshold: float = 0.8, min_samples: int = 10,
+                 action: str = "stop", pause_seconds: float = 900, max_pauses: int = 2,
+                 enabled: bool = True):
+        self.fields = [f for f in fields if f in FIELD_DEFAULTS]
+        self.window = max(1, int(window))
+        self.threshold = float(threshold)
+        self.min_samples = max(1, min(int(min_samples), self.window))
+        self.action = action if action in ("stop", "pause") else "stop"
+        self.pause_seconds = float(pause_seconds)
+        self.max_pauses = int(max_pauses)
+        self.enabled = enabled
+        self.pauses = 0
+        self.trips = 0
+        self._windows: Dict[str, Deque[bool]] = {f: deque(maxlen=self.window) for f in self.fields}
+
+    @classmethod
+    def from_config(cls, cfg: Optional[ConfigParser] = None) -> "CircuitBreaker":
+        if cfg is None:
+            cfg = ConfigParser()
+            cfg.read("config.ini")
+        fields = [f.strip() for f in cfg.get("circuit_breaker", "fields",
+                                             fallback="group_name, member_count").split(",")]
+        return cls(
+            fields=[f for f in fields if f],
+            window=int(cfg.get("circuit_breaker", "window", fallback="20")),
+            threshold=float(cfg.get("circuit_breaker", "failure_threshold", fallback="0.8")),
+            min_samples=int(cfg.get("circuit_breaker", "min_samples", fallback="10")),
+            action=cfg.get("circuit_breaker", "action", fallback="stop").strip().lower(),
+            pause_seconds=float(cfg.get("circuit_breaker", "pause_minutes", fallback="15")) * 60,
+            max_pauses=int(cfg.get("circuit_breaker", "max_pauses", fallback="2")),
+            enabled=cfg.getboolean("circuit_breaker", "enabled", fallback=True),
+        )
+
+    def failure_rates(self) -> Dict[str, float]:
+        """Failure rate per watched field over the current window (fields with enough samples)."""
+        return {f: sum(w) / len(w) for f, w in self._windows.items() if len(w) >= self.min_samples}
+
+    def tripped_fields(self) -> Dict[str, float]:
+        return {f: rate for f, rate in self.failure_rates().items() if rate >= self.threshold}
+
+    def observe(self, record: Optional[Mapping], fields: Optional[Iterable[str]] = None) -> None:
+        """
+        Record the outcome of one scrape and act if a field crossed the threshold.
+
+        Args:
+            record: Result of scrape_group_data() (None if the scrape failed - ignored)
+            fields: Fields that were requested (default: all watched fields)
+
+        Raises:
+            LayoutDriftError: when tripped with action 'stop', or after max_pauses pauses
+        """
+        if not self.enabled:
+            return
+        # Defaults from a page that never loaded (or only showed a login wall) are not layout drift
+        if record is None or record.get("restricted") or record.get("timed_out_steps"):
+            return
+        requested = set(fields) if fields is not None else None
+        for field, window in self._windows.items():
+            if requested is not None and field not in requested:
+                continue
+            failed = record.get(field, FIELD_DEFAULTS[field]) in (FIELD_DEFAULTS[field], None)
+            window.append(failed)
+
+        tripped = self.tripped_fields()
+        if tripped:
+            self._trip(tripped)
+
+    def _trip(self, rates: Dict[str, float]) -> None:
+        self.trips += 1
+        strategies = failing_strategies(rates)
+        logging.error("Layout drift suspected - failure rate over the last %s groups: %s", self.window,
+                      ", ".join(f"{field} {rate:.0%}" for field, rate in rates.items()))
+        for line in strategies:
+            logging.error("  No longer matching: %s", line)
+
+        if self.action == "pause" and self.pauses < self.max_pauses:
+            self.pauses += 1
+            logging.warning("Pausing extraction for %.0f minutes (pause %s of %s)...",
+                            self.pause_seconds / 60, self.pauses, self.max_pauses)
+            time.sleep(self.pause_seconds)
+            for window in self._windows.values():
+                window.clear()
+            return
+        raise LayoutDriftError(rates, strategies)
+
+
+def failing_strategies(fields: Iterable[str]) -> List[str]:
+    """Selectors / patterns of the given fields that missed on their most recent attempts."""
+    lines = []
+    stats = get_strategy_stats()
+    for row in stats.rows():
+        if row["kind"] in fields and row["misses_since_hit"]:
+            lines.append(f"{row['kind']}: {row['strategy']} ({row['misses_since_hit']} misses in a row, "
+                         f"last hit {row['last_hit'] or 'never'})")
+    return lines
+
+
+__all__ = [
+    "CircuitBreaker",
+    "LayoutDriftError",
+    "failing_strategies",
+]
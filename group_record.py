@@ -0,0 +1,324 @@
+"""
+Compact Group Record Type
+Facebook Group Data Extractor - Slotted record shared by scraper and phases
+
+Purpose:
+- Replace the per-group dicts built by scrape_group_data() and phase 2 with a
+  single record type that costs a fraction of the memory
+- Keep the dict-style interface (record['group_name'], .get(), .keys(), .items())
+  so CSV writers, the Parquet backend and the results database work unchanged
+
+Key Features:
+- __slots__: no per-instance __dict__, one pointer per known field
+- Unset fields (None) are simply absent from keys()
+- Low-cardinality strings (keyword, privacy, timestamps, source) are interned,
+  so thousands of records share one copy of each value
+- Canonical numeric group URLs are stored as the integer group ID and rebuilt
+  on access (exactly the same string comes back)
+- Unknown keys go to a lazily created 'extra' dict
+- Fast serialization: to_row() for csv.writer, to_json() for JSONL,
+  and the Mapping interface for ResultsDB.upsert_records()
+- Built-in benchmark: python group_record.py --records 1000000
+"""
+
+from __future__ import annotations
+
+# Standard library imports
+import sys         # String interning
+import json        # JSONL serialization
+from operator import attrgetter  # Fast multi-field reads
+from collections.abc import MutableMapping  # dict-compatible interface
+from typing import Any, Dict, Iterable, Iterator, List, Optional  # Type hints
+
+
+# Known fields in output order (phase 1 column order first, then phase 2 additions)
+FIELDS = (
+    "group_name",
+    "group_url",
+    "member_count",
+    "description",
+    "privacy",
+    "admin_names",
+    "admin_profile_urls",
+    "member_names",
+    "member_profile_urls",
+    "extraction_date",
+    "keyword",
+    "captured_at",
+    "source",
+    "restricted",
+    "timed_out_steps",
+)
+
+# Fields whose values repeat across many records
+INTERNED_FIELDS = frozenset({"privacy", "extraction_date", "keyword", "captured_at", "source"})
+
+_FIELD_SET = frozenset(FIELDS)
+
+# group_url values of this form are stored as the numeric ID
+_URL_PREFIX = "https://www.facebook.com/groups/"
+_URL_PREFIX_LEN = len(_URL_PREFIX)
+
+
+class GroupRecord(MutableMapping):
+    """
+    One extracted group, with a dict-compatible interface.
+
+    A value of None means "not set": the key is absent from keys() and
+    record[key] raises KeyError, exactly as if it had never been assigned.
+
+    Example:
+        record = GroupRecord(group_url=url, keyword=kw, captured_at=ts)
+        record['member_count'] = 1169
+        writer.writerow(record.to_row(fieldnames))
+    """
+
+    __slots__ = FIELDS + ("extra",)
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None, **fields: Any):
+        # Every slot is always assigned so serialization can use attrgetter (C speed)
+        self.group_name = self.group_url = self.member_count = self.description = None
+        self.privacy = self.admin_names = self.admin_profile_urls = None
+        self.member_names = self.member_profile_urls = self.extraction_date = None
+        self.keyword = self.captured_at = self.source = self.restricted = self.timed_out_steps = None
+        self.extra = None
+        if data:
+            for key, value in data.items():
+                self[key] = value
+        for key, value in fields.items():
+            self[key] = value
+
+    # ---- Mapping interface ----
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            if value is None:
+                raise KeyError(key)
+            if type(value) is int and key == "group_url":
+                return _URL_PREFIX + str(value)
+            return value
+        extra = self.extra
+        if extra is None:
+            raise KeyError(key)
+        return extra[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _FIELD_SET:
+            if type(value) is str:
+                if key in INTERNED_FIELDS:
+                    value = sys.intern(value)
+                elif key == "group_url" and value.startswith(_URL_PREFIX):
+                    group_id = value[_URL_PREFIX_LEN:]
+                    if group_id.isascii() and group_id.isdigit() and group_id[0] != "0":
+                        value = int(group_id)
+            setattr(self, key, value)
+        elif self.extra is None:
+            self.extra = {key: value}
+        else:
+            self.extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _FIELD_SET:
+            if getattr(self, key) is None:
+                raise KeyError(key)
+            setattr(self, key, None)
+            return
+        if self.extra is None:
+            raise KeyError(key)
+        del self.extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        for key, value in zip(FIELDS, _ALL_FIELDS(self)):
+            if value is not None:
+                yield key
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        count = len(self.extra) if self.extra else 0
+        for value in _ALL_FIELDS(self):
+            if value is not None:
+                count += 1
+        return count
+
+    def __contains__(self, key: object) -> bool:
+        if key in _FIELD_SET:
+            return getattr(self, key) is not None  # type: ignore[arg-type]
+        return bool(self.extra) and key in self.extra
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            if value is None:
+                return default
+            if type(value) is int and key == "group_url":
+                return _URL_PREFIX + str(value)
+            return value
+        if self.extra is None:
+            return default
+        return self.extra.get(key, default)
+
+    def __repr__(self) -> str:
+        return f"GroupRecord({self.to_dict()!r})"
+
+    def __reduce__(self):
+        return (GroupRecord, (self.to_dict(),))
+
+    # ---- Record helpers ----
+
+    def fill_from(self, other: Dict[str, Any], fields: Iterable[str]) -> "GroupRecord":
+        """Copy the listed fields from another record if they have a value (0 counts)."""
+        for key in fields:
+            value = other.get(key)
+            if value is not None and value != "":
+                self[key] = value
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {key: value for key, value in zip(FIELDS, _ALL_FIELDS(self)) if value is not None}
+        url = out.get("group_url")
+        if type(url) is int:
+            out["group_url"] = _URL_PREFIX + str(url)
+        if self.extra:
+            out.update(self.extra)
+        return out
+
+    def to_row(self, fieldnames: Iterable[str]) -> List[Any]:
+        """Values in fieldnames order ('' for missing) for csv.writer."""
+        fieldnames = tuple(fieldnames)
+        plan = _ROW_PLANS.get(fieldnames)
+        if plan is None:
+            plan = _row_plan(fieldnames)
+        getter, url_index = plan
+        if getter is None:
+            get = self.get
+            return [get(key, "") for key in fieldnames]
+        values = getter(self)
+        if len(fieldnames) == 1:
+            values = (values,)
+        row = ["" if v is None else v for v in values]
+        if url_index is not None and type(row[url_index]) is int:
+            row[url_index] = _URL_PREFIX + str(row[url_index])
+        return row
+
+    def to_json(self) -> str:
+        """One JSONL line (without the trailing newline)."""
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+
+# All known fields in FIELDS order, read in one C-level call
+_ALL_FIELDS = attrgetter(*FIELDS)
+
+# fieldnames -> (attrgetter or None if any field is unknown, index of group_url)
+_ROW_PLANS: Dict[tuple, tuple] = {}
+
+
+def _row_plan(fieldnames: tuple) -> tuple:
+    if fieldnames and all(key in _FIELD_SET for key in fieldnames):
+        getter = attrgetter(*fieldnames)
+        url_index = fieldnames.index("group_url") if "group_url" in fieldnames else None
+        plan = (getter, url_index)
+    else:
+        plan = (None, None)
+    if len(_ROW_PLANS) < 64:
+        _ROW_PLANS[fieldnames] = plan
+    return plan
+
+
+def _run_benchmark(count: int) -> None:
+    """Compare memory and serialization speed of GroupRecord vs plain dicts."""
+    import io
+    import csv
+    import gc
+    import time
+
+    keywords = [f"Team {i} Tickets" for i in range(200)]
+
+    def make_fields(i: int) -> Dict[str, Any]:
+        # Timestamps and privacy strings are rebuilt per record, as the scrapers do
+        second = i // 50
+        return {
+            "keyword": keywords[i % len(keywords)],
+            "group_url": f"https://www.facebook.com/groups/{100000000000000 + i}",
+            "captured_at": f"2025-10-30 21:{second // 60 % 60:02d}:{second % 60:02d}",
+            "group_name": f"Group {i}",
+            "member_count": 1000 + i % 50000,
+            "privacy": "".join(["Pub", "lic"]) if i % 3 else "".join(["Priv", "ate"]),
+            "extraction_date": f"2025-10-30 21:{second // 60 % 60:02d}:{second % 60:02d}",
+        }
+
+    def deep_size(records: list) -> int:
+        # Every distinct object reachable from the records, counted once
+        seen = set()
+        size = sys.getsizeof(records)
+        for r in records:
+            objects = [r]
+            if isinstance(r, dict):
+                objects.extend(r.values())
+            else:
+                objects.extend(v for v in _ALL_FIELDS(r) if v is not None)
+            for obj in objects:
+                if id(obj) not in seen:
+                    seen.add(id(obj))
+                    size += sys.getsizeof(obj)
+        return size
+
+    def measure(factory) -> tuple:
+        gc.collect()
+        start = time.perf_counter()
+        records = [factory(make_fields(i)) for i in range(count)]
+        build_s = time.perf_counter() - start
+        return records, deep_size(records), build_s
+
+    print("=" * 60)
+    print(f"GROUP RECORD BENCHMARK ({count:,} records)")
+    print("=" * 60)
+
+    dicts, dict_size, dict_build = measure(dict)
+    fieldnames = list(FIELDS)
+    start = time.perf_counter()
+    writer = csv.DictWriter(io.StringIO(), fieldnames=fieldnames)
+    for r in dicts:
+        writer.writerow(r)
+    dict_csv = time.perf_counter() - start
+    start = time.perf_counter()
+    for r in dicts:
+        json.dumps(r, ensure_ascii=False)
+    dict_json = time.perf_counter() - start
+    del dicts, writer
+    gc.collect()
+
+    records, rec_size, rec_build = measure(GroupRecord)
+    start = time.perf_counter()
+    writer = csv.writer(io.StringIO())
+    for r in records:
+        writer.writerow(r.to_row(fieldnames))
+    rec_csv = time.perf_counter() - start
+    start = time.perf_counter()
+    for r in records:
+        r.to_json()
+    rec_json = time.perf_counter() - start
+
+    print(f"dict:        {dict_size / count:6.0f} B/record, build {dict_build:.1f}s, "
+          f"CSV {dict_csv:.1f}s, JSONL {dict_json:.1f}s")
+    print(f"GroupRecord: {rec_size / count:6.0f} B/record, build {rec_build:.1f}s, "
+          f"CSV {rec_csv:.1f}s, JSONL {rec_json:.1f}s")
+    print(f"Memory ratio: {dict_size / max(rec_size, 1):.1f}x smaller")
+    print("=" * 60)
+
+
+__all__ = [
+    "GroupRecord",
+    "FIELDS",
+]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the slotted group record type")
+    parser.add_argument('--records', type=int, default=1_000_000, help='Number of synthetic records (default: 1M)')
+    args = parser.parse_args()
+
+    _run_benchmark(args.records)
@@ -8,136 +8,513 @@ Purpose:
 - Normalize and deduplicate keywords
 
 Input Sources:
-- Excel files (.xlsx) via pandas/openpyxl
+- Excel files (.xlsx) streamed with openpyxl read_only mode
 - CSV files
+- Sheet and column selection from config ([keywords] sheets / columns);
+  the sheet name is kept as the team's sport
 - Fallback to minimal static list if no files found
 
+Performance:
+- Resource files are parsed in parallel (one process per file)
+- Parsed teams are cached per file, keyed by content hash; unchanged files
+  are never re-parsed on later runs
+
 Keyword Patterns Generated:
-For each team name found in input files:
-- "{Team} Tickets" - e.g., "Arizona Cardinals Tickets"
-- "{Team} Ticket Exchange" - e.g., "Atlanta Falcons Ticket Exchange"
-- "{Team} Verified Tickets" - e.g., "Baltimore Ravens Verified Tickets"
-- "{Team} Official Tickets" - e.g., "Buffalo Bills Official Tickets"
+For each team name found in input files, the template set of its sport from the
+[keyword_templates] config section, or the default set:
+- "{team} Tickets" - e.g., "Arizona Cardinals Tickets"
+- "{team} Ticket Exchange" - e.g., "Atlanta Falcons Ticket Exchange"
+- "{team} Verified Tickets" - e.g., "Baltimore Ravens Verified Tickets"
+- "{team} Official Tickets" - e.g., "Buffalo Bills Official Tickets"
+Templates may also use {sport} (the sheet name).
+Templates listed in [keywords] pruned_templates_file (written by
+template_analysis.py) are skipped, as long as their set keeps one template.
 
 Workflow:
 1. Scan Resources directory for Excel/CSV files
-2. Extract team names from all cells
-3. Normalize (strip whitespace, lowercase for dedup)
-4. Apply keyword patterns to each team
-5. Return deduplicated keyword list
+2. Extract team names from the selected sheets/columns (or the cache)
+3. Apply the sport's templates to each team (templates pre-split once)
+4. Deduplicate on NFKC + casefold + collapsed whitespace, so near-identical
+   keywords never become separate searches
+5. Return deduplicated keyword list (or KeywordSpec list with team/template/sport)
 """
 
 from __future__ import annotations
 
 # Standard library imports
-import os     # File and directory operations
-import csv    # CSV file reading
-from typing import List, Iterable  # Type hints
+import os       # File and directory operations
+import csv      # CSV file reading
+import hashlib  # Content hashes for the parse cache
+import logging  # Logging cache and parse results
+import unicodedata  # NFKC normalization for keyword dedup
+from configparser import ConfigParser  # Template sets from config
+from concurrent.futures import ProcessPoolExecutor  # Parallel file parsing
+import bisect   # Team lookup in expanded keyword specs
+from array import array  # Compact template ids per keyword
+from typing import Dict, List, Iterable, Iterator, NamedTuple, Optional, Sequence, Tuple  # Type hints
+
+# Local module imports
+from json_store import load_json, save_json  # Parse cache persistence
+
+
+# Bumped when the cached team layout changes (older caches are ignored)
+CACHE_VERSION = 1
+
+# Cells that are placeholders rather than team names
+_EMPTY_CELLS = {"", "-"}
+
+# Template set used for sports without their own [keyword_templates] entry
+DEFAULT_TEMPLATES = (
+    "{team} Tickets",
+    "{team} Ticket Exchange",
+    "{team} Verified Tickets",
+    "{team} Official Tickets",
+)
+
+
+class KeywordSpec(NamedTuple):
+    """A search keyword and where it came from."""
+    keyword: str
+    team: str
+    template: str
+    sport: str
+
+
+def _normalize_sheet(name: str) -> str:
+    return " ".join((name or "").split())
+
+
+def _column_index(column: str, header: Sequence) -> Optional[int]:
+    """Resolve a column letter (A, B, ...) or a header name to a 0-based index."""
+    column = (column or "").strip()
+    if not column:
+        return None
+    if column.isalpha() and len(column) <= 2:
+        index = 0
+        for ch in column.upper():
+            index = index * 26 + (ord(ch) - ord("A") + 1)
+        return index - 1
+    wanted = column.casefold()
+    for i, cell in enumerate(header):
+        if cell is not None and str(cell).strip().casefold() == wanted:
+            return i
+    return None
 
 
-def _load_xlsx_keywords(xlsx_path: str) -> List[str]:
+def _teams_from_rows(rows: Iterable[Sequence], sport: str, columns: Sequence[str],
+                     header_rows: int) -> List[Tuple[str, str]]:
+    """Collect (team, sport) pairs from the selected columns of a row stream."""
+    teams: List[Tuple[str, str]] = []
+    indexes: Optional[List[int]] = None
+    for row_number, row in enumerate(rows):
+        if indexes is None:
+            # Column names are resolved against the first row of the sheet
+            indexes = []
+            for i in (_column_index(c, row) for c in columns):
+                if i is not None and i not in indexes:
+                    indexes.append(i)
+            if not indexes:
+                return teams
+        if row_number < header_rows:
+            continue
+        for i in indexes:
+            if i >= len(row) or row[i] is None:
+                continue
+            cell = str(row[i]).strip()
+            if cell not in _EMPTY_CELLS:
+                teams.append((cell, sport))
+    return teams
+
+
+def _load_xlsx_teams(xlsx_path: str, sheets: Sequence[str], columns: Sequence[str],
+                     header_rows: int) -> List[Tuple[str, str]]:
     try:
-        import pandas as pd  # type: ignore
+        from openpyxl import load_workbook  # type: ignore
     except Exception:
+        logging.warning("openpyxl is not installed - skipping %s (pip install openpyxl)", xlsx_path)
         return []
 
+    wanted = {_normalize_sheet(s).casefold() for s in sheets}
+    teams: List[Tuple[str, str]] = []
     try:
-        df = pd.read_excel(xlsx_path)
-    except Exception:
+        # read_only streams rows instead of building the whole workbook in memory
+        workbook = load_workbook(xlsx_path, read_only=True, data_only=True)
+    except Exception as e:
+        logging.warning("Could not open %s: %s", xlsx_path, e)
         return []
-
-    candidates: List[str] = []
-    for col in df.columns:
-        try:
-            series = df[col].dropna().astype(str)
-            candidates.extend(series.tolist())
-        except Exception:
-            continue
-    return candidates
+    try:
+        for sheet in workbook.worksheets:
+            sport = _normalize_sheet(sheet.title)
+            if wanted and sport.casefold() not in wanted:
+                continue
+            teams.extend(_teams_from_rows(sheet.iter_rows(values_only=True), sport, columns, header_rows))
+    except Exception as e:
+        logging.warning("Could not read %s: %s", xlsx_path, e)
+    finally:
+        workbook.close()
+    return teams
 
 
-def _load_csv_keywords(csv_path: str) -> List[str]:
-    keywords: List[str] = []
+def _load_csv_teams(csv_path: str, columns: Sequence[str], header_rows: int) -> List[Tuple[str, str]]:
+    sport = os.path.splitext(os.path.basename(csv_path))[0]
     try:
         with open(csv_path, "r", encoding="utf-8", newline="") as f:
-            reader = csv.reader(f)
-            for row in reader:
-                for cell in row:
-                    cell = (cell or "").strip()
-                    if cell:
-                        keywords.append(cell)
-    except Exception:
+            return _teams_from_rows(csv.reader(f), sport, columns, header_rows)
+    except Exception as e:
+        logging.warning("Could not read %s: %s", csv_path, e)
         return []
-    return keywords
 
 
-def _patterns_for(team: str) -> List[str]:
-    team = (team or "").strip()
-    if not team:
+def _parse_resource(task) -> List[Tuple[str, str]]:
+    """Process-pool worker: parse one resource file."""
+    path, sheets, columns, header_rows = task
+    if path.lower().endswith(".xlsx"):
+        return _load_xlsx_teams(path, sheets, columns, header_rows)
+    return _load_csv_teams(path, columns, header_rows)
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _resource_files(resources_dir: str) -> List[str]:
+    if not os.path.isdir(resources_dir):
         return []
-    return [
-        f"{team} Tickets",
-        f"{team} Ticket Exchange",
-        f"{team} Verified Tickets",
-        f"{team} Official Tickets",
-    ]
+    files = []
+    for name in sorted(os.listdir(resources_dir)):
+        lower = name.lower()
+        if name.startswith("~$"):
+            continue  # Excel lock files
+        if lower.endswith(".xlsx") or lower.endswith(".csv"):
+            files.append(os.path.join(resources_dir, name))
+    return files
 
 
-def generate_keywords_from_resources(resources_dir: str = "Resources") -> List[str]:
+def load_teams_from_resources(resources_dir: str = "Resources", sheets: Optional[Sequence[str]] = None,
+                              columns: Optional[Sequence[str]] = None, header_rows: int = 1,
+                              cache_file: Optional[str] = None, workers: int = 0) -> List[Tuple[str, str]]:
     """
-    Scan the resources directory for known files and produce a deduplicated list
-    of search keywords by applying patterns.
+    Read (team, sport) pairs from every .xlsx/.csv file in the resources directory.
+
+    Args:
+        resources_dir: Directory with the team lists
+        sheets: Sheet names to read (None/empty = all sheets); sport = sheet name
+        columns: Column letters or header names holding team names (default: column A)
+        header_rows: Leading rows to skip in each sheet/CSV
+        cache_file: JSON cache of parsed teams keyed by file content hash (None = no cache)
+        workers: Parser processes for uncached files (0 = one per file, up to CPU count)
+
+    Returns:
+        (team, sport) pairs in file/sheet/row order
+    """
+    sheets = [s for s in (sheets or []) if s.strip()]
+    columns = [c for c in (columns or ["A"]) if c.strip()] or ["A"]
+    options = {"sheets": sorted(sheets), "columns": list(columns), "header_rows": header_rows}
+
+    cache = load_json(cache_file, None) if cache_file else None
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        cache = {"version": CACHE_VERSION, "files": {}}
+    cached_files: Dict[str, dict] = cache.get("files", {})
+
+    files = _resource_files(resources_dir)
+    results: Dict[str, List[Tuple[str, str]]] = {}
+    new_entries: Dict[str, dict] = {}
+    to_parse: List[str] = []
+    for path in files:
+        st = os.stat(path)
+        entry = cached_files.get(path)
+        if entry and entry.get("options") == options:
+            # Unchanged size/mtime: trust the stored hash; otherwise re-hash the content
+            if entry.get("size") == st.st_size and entry.get("mtime") == st.st_mtime:
+                results[path] = [tuple(t) for t in entry.get("teams", [])]
+                new_entries[path] = entry
+                continue
+            sha = _file_sha256(path)
+            if entry.get("sha256") == sha:
+                results[path] = [tuple(t) for t in entry.get("teams", [])]
+                new_entries[path] = dict(entry, size=st.st_size, mtime=st.st_mtime)
+                continue
+        to_parse.append(path)
+
+    if to_parse:
+        tasks = [(path, sheets, columns, header_rows) for path in to_parse]
+        workers = workers or min(len(tasks), os.cpu_count() or 1)
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parsed = list(pool.map(_parse_resource, tasks))
+        else:
+            parsed = [_parse_resource(task) for task in tasks]
+        for path, teams in zip(to_parse, parsed):
+            st = os.stat(path)
+            results[path] = teams
+            new_entries[path] = {
+                "sha256": _file_sha256(path),
+                "size": st.st_size,
+                "mtime": st.st_mtime,
+                "options": options,
+                "teams": [list(t) for t in teams],
+            }
+        logging.info("Parsed %d resource file(s), %d from cache", len(to_parse), len(files) - len(to_parse))
+    elif files:
+        logging.info("All %d resource file(s) unchanged - using cached team list", len(files))
+
+    if cache_file and (to_parse or set(new_entries) != set(cached_files)):
+        try:
+            save_json(cache_file, {"version": CACHE_VERSION, "files": new_entries})
+        except Exception as e:
+            logging.warning("Could not save keyword cache %s: %s", cache_file, e)
+
+    teams: List[Tuple[str, str]] = []
+    for path in files:
+        teams.extend(results.get(path, []))
+    return teams
+
+
+def normalize_keyword(text: str) -> str:
+    """Dedup key for a keyword: NFKC, casefold and whitespace collapsed."""
+    return " ".join(unicodedata.normalize("NFKC", text or "").casefold().split())
+
+
+def load_keyword_templates(cfg: Optional[ConfigParser] = None) -> Dict[str, List[str]]:
+    """
+    Read template sets from the [keyword_templates] config section.
+
+    Each option is a sport/league (matched against the sheet name, case-insensitive)
+    or 'default'; its value lists one template per line. A sport with its own set
+    uses it instead of the default set.
+
+    Templates pruned by template_analysis.py ([keywords] pruned_templates_file)
+    are removed from every set that would still have another template left.
+    """
+    templates: Dict[str, List[str]] = {"default": list(DEFAULT_TEMPLATES)}
+    if cfg is not None and cfg.has_section("keyword_templates"):
+        for sport, value in cfg.items("keyword_templates"):
+            lines = [line.strip() for line in (value or "").splitlines() if line.strip()]
+            if lines:
+                templates[normalize_keyword(sport)] = lines
+
+    pruned_file = "output/pruned_templates.json"
+    if cfg is not None:
+        pruned_file = cfg.get("keywords", "pruned_templates_file", fallback=pruned_file).strip()
+    pruned = set(load_pruned_templates(pruned_file)) if pruned_file else set()
+    if pruned:
+        for sport, lines in templates.items():
+            kept = [t for t in lines if t not in pruned]
+            if kept and len(kept) < len(lines):
+                logging.info("Skipping %d pruned template(s) for %s", len(lines) - len(kept), sport)
+                templates[sport] = kept
+    return templates
+
+
+def load_pruned_templates(path: str) -> List[str]:
+    """Templates marked as low-yield in a template_analysis.py pruning file."""
+    data = load_json(path, None) if path and os.path.exists(path) else None
+    if not isinstance(data, dict):
+        return []
+    return [t for t in data.get("pruned", []) if isinstance(t, str)]
+
+
+def _split_template(template: str) -> Tuple[str, str]:
+    prefix, _, suffix = template.partition("{team}")
+    return prefix, suffix
+
+
+def _collapse_piece(piece: str, normalize: bool = False) -> str:
+    # Collapsed template piece, keeping a single space where it had boundary whitespace
+    text = normalize_keyword(piece) if normalize else " ".join(piece.split())
+    if not text:
+        return " " if piece and piece.isspace() else ""
+    lead = " " if piece[:1].isspace() else ""
+    trail = " " if piece[-1:].isspace() else ""
+    return lead + text + trail
+
+
+class KeywordSpecs(Sequence):
+    """
+    Deduplicated expansion result, stored column-wise.
+
+    Keywords are kept in a plain list; team, template and sport are recovered
+    from per-team offsets and a compact template-id array, so expanding millions
+    of keywords does not build millions of KeywordSpec objects. Indexing and
+    iteration yield KeywordSpec tuples on demand.
+    """
+
+    def __init__(self) -> None:
+        self.keywords: List[str] = []
+        self._template_ids = array("I")
+        self._templates: List[str] = []
+        self._team_offsets: List[int] = []
+        self._teams: List[Tuple[str, str]] = []
+
+    @property
+    def teams(self) -> List[Tuple[str, str]]:
+        """(team, sport) pairs that produced at least one keyword, in input order."""
+        return list(self._teams)
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self.keywords)
+        team, sport = self._teams[bisect.bisect_right(self._team_offsets, index) - 1]
+        template = self._templates[self._template_ids[index]]
+        return KeywordSpec(self.keywords[index], team, template, sport)
+
+    def __iter__(self) -> Iterator[KeywordSpec]:
+        keywords, template_ids, templates = self.keywords, self._template_ids, self._templates
+        offsets = self._team_offsets + [len(keywords)]
+        for t, (team, sport) in enumerate(self._teams):
+            for i in range(offsets[t], offsets[t + 1]):
+                yield KeywordSpec(keywords[i], team, templates[template_ids[i]], sport)
+
+
+def expand_keyword_specs(teams: Iterable[Tuple[str, str]],
+                         templates: Optional[Dict[str, List[str]]] = None) -> KeywordSpecs:
+    """
+    Expand (team, sport) pairs with the template set of each sport.
+
+    Keywords are produced team by team in input order and deduplicated on
+    normalize_keyword(); the first spec for a keyword wins. Templates are
+    pre-split around {team} and normalized once, so each team costs two list
+    comprehensions and a set update; only teams whose keywords collide with
+    earlier ones fall back to per-keyword checks.
     """
-    teams: List[str] = []
+    templates = templates or {"default": list(DEFAULT_TEMPLATES)}
+    default = templates.get("default") or list(DEFAULT_TEMPLATES)
+
+    result = KeywordSpecs()
+    template_index: Dict[str, int] = {}
+
+    # Prepared template sets per sport: (template ids, display pieces, normalized pieces)
+    prepared: Dict[str, tuple] = {}
+
+    def prepare(sport: str) -> tuple:
+        ids, display, norm, norm_seen = [], [], [], set()
+        for template in templates.get(normalize_keyword(sport), default):
+            text = template.replace("{sport}", sport)
+            if text.count("{team}") != 1:
+                logging.warning("Skipping keyword template without exactly one {team}: %s", template)
+                continue
+            prefix, suffix = _split_template(text)
+            pieces = (_collapse_piece(prefix, True), _collapse_piece(suffix, True))
+            if pieces in norm_seen:
+                continue  # Near-identical template in the same set
+            norm_seen.add(pieces)
+            if template not in template_index:
+                template_index[template] = len(result._templates)
+                result._templates.append(template)
+            ids.append(template_index[template])
+            display.append((_collapse_piece(prefix), _collapse_piece(suffix)))
+            norm.append(pieces)
+        return array("I", ids), display, norm
+
+    keywords = result.keywords
+    template_ids = result._template_ids
+    seen_keys: set = set()
+    seen_teams: set = set()
+    for team, sport in teams:
+        team = " ".join((team or "").split())
+        if not team:
+            continue
+        norm_team = normalize_keyword(team)
+        if (norm_team, sport) in seen_teams:
+            continue
+        seen_teams.add((norm_team, sport))
+
+        plan = prepared.get(sport)
+        if plan is None:
+            plan = prepared[sport] = prepare(sport)
+        ids, display, norm = plan
+        if not ids:
+            continue
+
+        keys = [(p + norm_team + s).strip() for p, s in norm]
+        start = len(keywords)
+        if seen_keys.isdisjoint(keys):
+            before = len(seen_keys)
+            seen_keys.update(keys)
+            if len(seen_keys) - before == len(keys):
+                keywords.extend([(p + team + s).strip() for p, s in display])
+                template_ids.extend(ids)
+            else:
+                seen_keys.difference_update(keys)
+                start = -1
+        else:
+            start = -1
+        if start < 0:
+            # Some keywords of this team duplicate earlier ones: check one by one
+            start = len(keywords)
+            for key, template_id, (p, s) in zip(keys, ids, display):
+                if key in seen_keys:
+                    continue
+                seen_keys.add(key)
+                keywords.append((p + team + s).strip())
+                template_ids.append(template_id)
+        if len(keywords) > start:
+            result._team_offsets.append(start)
+            result._teams.append((team, sport))
+    return result
 
-    # Prefer known Excel file
-    xlsx_path = os.path.join(resources_dir, "All Teams by Sport.xlsx")
-    if os.path.exists(xlsx_path):
-        teams.extend(_load_xlsx_keywords(xlsx_path))
 
-    # Any CSV files in the directory
-    if os.path.isdir(resources_dir):
-        for name in os.listdir(resources_dir):
-            if name.lower().endswith(".csv"):
-                teams.extend(_load_csv_keywords(os.path.join(resources_dir, name)))
+def generate_keyword_specs(resources_dir: str = "Resources", sheets: Optional[Sequence[str]] = None,
+                           columns: Optional[Sequence[str]] = None, header_rows: int = 1,
+                           cache_file: Optional[str] = None, workers: int = 0,
+                           templates: Optional[Dict[str, List[str]]] = None) -> KeywordSpecs:
+    """
+    Scan the resources directory and expand every team with its sport's templates.
+
+    See load_teams_from_resources() for the sheet/column selection and cache options
+    and load_keyword_templates() for the template sets.
+
+    Returns:
+        KeywordSpecs: deduplicated sequence of KeywordSpec(keyword, team, template, sport)
+    """
+    teams = load_teams_from_resources(
+        resources_dir, sheets=sheets, columns=columns, header_rows=header_rows,
+        cache_file=cache_file, workers=workers)
 
     # Fallback minimal list if nothing found
     if not teams:
         teams = [
-            "Arizona Cardinals",
-            "Atlanta Falcons",
-            "Baltimore Ravens",
-            "Buffalo Bills",
+            ("Arizona Cardinals", "NFL"),
+            ("Atlanta Falcons", "NFL"),
+            ("Baltimore Ravens", "NFL"),
+            ("Buffalo Bills", "NFL"),
         ]
 
-    # Normalize and deduplicate team names
-    normalized = []
-    seen = set()
-    for t in teams:
-        t = (t or "").strip()
-        if not t:
-            continue
-        if t.lower() in seen:
-            continue
-        seen.add(t.lower())
-        normalized.append(t)
-
-    # Expand to keywords
-    keywords: List[str] = []
-    k_seen = set()
-    for team in normalized:
-        for k in _patterns_for(team):
-            key = k.strip()
-            if key.lower() in k_seen:
-                continue
-            k_seen.add(key.lower())
-            keywords.append(key)
+    return expand_keyword_specs(teams, templates)
 
-    return keywords
+
+def generate_keywords_from_resources(resources_dir: str = "Resources", sheets: Optional[Sequence[str]] = None,
+                                     columns: Optional[Sequence[str]] = None, header_rows: int = 1,
+                                     cache_file: Optional[str] = None, workers: int = 0,
+                                     templates: Optional[Dict[str, List[str]]] = None) -> List[str]:
+    """
+    Scan the resources directory for known files and produce a deduplicated list
+    of search keywords by applying patterns.
+    """
+    return generate_keyword_specs(
+        resources_dir, sheets=sheets, columns=columns, header_rows=header_rows,
+        cache_file=cache_file, workers=workers, templates=templates).keywords
 
 
 __all__ = [
+    "KeywordSpec",
+    "KeywordSpecs",
     "generate_keywords_from_resources",
+    "generate_keyword_specs",
+    "expand_keyword_specs",
+    "load_keyword_templates",
+    "load_pruned_templates",
+    "load_teams_from_resources",
+    "normalize_keyword",
 ]
 
 
@@ -0,0 +1,48 @@
+"""
+Small JSON State Files
+Facebook Group Data Extractor - Shared helper for persisted run state
+
+Purpose:
+- Load and save the small JSON state files kept between runs
+  (merge manifests, caches, run history)
+- Never leave a half-written file behind if the process is interrupted
+
+Key Features:
+- Missing or corrupt files fall back to a caller-supplied default
+- Atomic writes (temp file + os.replace)
+"""
+
+from __future__ import annotations
+
+# Standard library imports
+import os      # File and directory operations
+import json    # JSON encoding/decoding
+from typing import Any  # Type hints
+
+
+def load_json(path: str, default: Any = None) -> Any:
+    """Return the parsed JSON at path, or default if it is missing or unreadable."""
+    if not path or not os.path.exists(path):
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return default
+
+
+def save_json(path: str, data: Any) -> None:
+    """Write data as JSON to path atomically, creating the directory if needed."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+__all__ = [
+    "load_json",
+    "save_json",
+]
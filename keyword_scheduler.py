@@ -0,0 +1,216 @@
+"""
+Yield-Based Keyword Scheduler
+Facebook Group Data Extractor - Phase 2 search ordering
+
+Purpose:
+- Spend a limited number of searches per day on the keywords most likely to
+  turn up groups we have not seen before
+- Replace "first N keywords in file order" with ordering by expected new yield
+
+Key Features:
+- Persisted history per keyword and per template: searches spent, URLs found,
+  URLs that were new at the time
+- Expected yield per keyword = its own new-URLs-per-search, shrunk towards its
+  template's average (so a template that works lifts all of its keywords)
+- Exploration bonus (UCB) so keywords never tried still get searched
+- Keywords searched recently (min_interval_hours) are skipped
+- Daily search budget shared by all runs of the same day
+
+Workflow:
+1. scheduler = KeywordScheduler.from_config(cfg)
+2. planned = scheduler.plan(keyword_specs)      # ordered, within today's budget
+3. scheduler.record(spec, found=len(urls), new=new_count) after every search
+   (scheduler.record_failed(spec) for a search that errored out)
+4. scheduler.save()
+"""
+
+from __future__ import annotations
+
+# Standard library imports
+import math        # Exploration bonus
+import heapq       # Top-N selection over large keyword lists
+import logging     # Logging the plan
+from datetime import datetime, timedelta  # Daily budget and search intervals
+from configparser import ConfigParser  # Scheduler settings
+from typing import Callable, Dict, Iterable, List, Optional  # Type hints
+
+# Local module imports
+from json_store import load_json, save_json  # History persistence
+from input_processor import KeywordSpec, normalize_keyword  # Keyword specs and dedup key
+
+
+# Bumped when the history file layout changes (older files are ignored)
+HISTORY_VERSION = 1
+
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _empty_stats() -> Dict[str, int]:
+    return {"searches": 0, "found": 0, "new": 0}
+
+
+class KeywordScheduler:
+    """Orders keyword specs by expected new groups per search."""
+
+    def __init__(self, history_file: str = "output/keyword_history.json", daily_budget: int = 5,
+                 exploration: float = 1.0, prior_weight: float = 2.0, min_interval_hours: float = 24):
+        self.history_file = history_file
+        self.daily_budget = max(0, int(daily_budget))
+        self.exploration = max(0.0, float(exploration))
+        self.prior_weight = max(0.0, float(prior_weight))
+        self.min_interval = timedelta(hours=max(0.0, float(min_interval_hours)))
+
+        history = load_json(history_file, None) if history_file else None
+        if not isinstance(history, dict) or history.get("version") != HISTORY_VERSION:
+            history = {}
+        self.keywords: Dict[str, dict] = history.get("keywords", {})
+        self.templates: Dict[str, dict] = history.get("templates", {})
+        self.daily: Dict[str, int] = history.get("daily", {})
+
+    @classmethod
+    def from_config(cls, cfg: ConfigParser) -> "KeywordScheduler":
+        """Build a scheduler from the [scheduler] config section."""
+        return cls(
+            history_file=cfg.get("scheduler", "history_file", fallback="output/keyword_history.json").strip(),
+            daily_budget=int(cfg.get("scheduler", "daily_search_budget", fallback="5")),
+            exploration=float(cfg.get("scheduler", "exploration", fallback="1.0")),
+            prior_weight=float(cfg.get("scheduler", "prior_weight", fallback="2.0")),
+            min_interval_hours=float(cfg.get("scheduler", "min_interval_hours", fallback="24")),
+        )
+
+    # ---- Budget ----
+
+    def searches_today(self) -> int:
+        return int(self.daily.get(datetime.now().strftime("%Y-%m-%d"), 0))
+
+    def remaining_budget(self) -> int:
+        return max(0, self.daily_budget - self.searches_today())
+
+    # ---- Scoring ----
+
+    def _global_rate(self) -> float:
+        searches = sum(t["searches"] for t in self.templates.values())
+        new = sum(t["new"] for t in self.templates.values())
+        return new / searches if searches else 1.0
+
+    def _template_rate(self, template: str, global_rate: float) -> float:
+        stats = self.templates.get(template)
+        if not stats:
+            return global_rate
+        w = self.prior_weight
+        return (stats["new"] + w * global_rate) / (stats["searches"] + w)
+
+    def plan(self, specs: Iterable[KeywordSpec], budget: Optional[int] = None,
+             free: Optional[Callable[[KeywordSpec], bool]] = None) -> List[KeywordSpec]:
+        """
+        Choose and order the keywords to search in this run.
+
+        Args:
+            specs: All candidate keyword specs
+            budget: Maximum searches (default: what is left of today's budget)
+            free: Optional predicate for keywords that cost no search (e.g. cached
+                results); they are kept in rank order without using up the budget
+
+        Returns:
+            Keyword specs, highest expected new yield (plus exploration bonus) first
+        """
+        budget = self.remaining_budget() if budget is None else max(0, int(budget))
+        if budget <= 0:
+            logging.info("Daily search budget used up (%d searches today)", self.searches_today())
+            return []
+
+        now = datetime.now()
+        cutoff = (now - self.min_interval).strftime(_TIME_FORMAT)
+        global_rate = self._global_rate()
+        total_searches = sum(t["searches"] for t in self.templates.values())
+        log_total = math.log(total_searches + 1)
+        bonus_scale = self.exploration * max(global_rate, 1e-6)
+        w = self.prior_weight
+        template_rates: Dict[str, float] = {}
+
+        def scored():
+            for order, spec in enumerate(specs):
+                stats = self.keywords.get(normalize_keyword(spec.keyword))
+                if stats and stats.get("last_searched", "") > cutoff:
+                    continue
+                prior = template_rates.get(spec.template)
+                if prior is None:
+                    prior = template_rates[spec.template] = self._template_rate(spec.template, global_rate)
+                searches = stats["searches"] if stats else 0
+                rate = (stats["new"] + w * prior) / (searches + w) if stats else prior
+                score = rate + bonus_scale * math.sqrt((log_total + 1) / (searches + 1))
+                # Ties keep the input order
+                yield score, -order, spec
+
+        def rank(item):
+            return item[0], item[1]
+
+        if free is None:
+            chosen = heapq.nlargest(budget, scored(), key=rank)
+        else:
+            # Widen the top-N until it holds `budget` keywords that need a real search
+            candidates = list(scored())
+            size = budget
+            while True:
+                chosen = heapq.nlargest(size, candidates, key=rank)
+                paid = 0
+                for end, (_, _, spec) in enumerate(chosen, 1):
+                    if not free(spec):
+                        paid += 1
+                        if paid == budget:
+                            chosen = chosen[:end]
+                            break
+                if paid == budget or size >= len(candidates):
+                    break
+                size *= 2
+        planned = [spec for _, _, spec in chosen]
+        untried = sum(1 for spec in planned if normalize_keyword(spec.keyword) not in self.keywords)
+        logging.info("Scheduled %d keyword(s) (%d never tried before)", len(planned), untried)
+        return planned
+
+    # ---- History ----
+
+    def record(self, spec: KeywordSpec, found: int, new: int) -> None:
+        """Record one search: URLs found and how many were new at the time."""
+        now = datetime.now()
+        stats = self.keywords.setdefault(normalize_keyword(spec.keyword), _empty_stats())
+        stats["searches"] += 1
+        stats["found"] += int(found)
+        stats["new"] += int(new)
+        stats["last_searched"] = now.strftime(_TIME_FORMAT)
+
+        template = self.templates.setdefault(spec.template, _empty_stats())
+        template["searches"] += 1
+        template["found"] += int(found)
+        template["new"] += int(new)
+
+        self._count_search(now)
+
+    def record_failed(self, spec: KeywordSpec) -> None:
+        """Record a search that failed: it used up budget but says nothing about yield."""
+        self._count_search(datetime.now())
+
+    def _count_search(self, now: datetime) -> None:
+        day = now.strftime("%Y-%m-%d")
+        self.daily[day] = int(self.daily.get(day, 0)) + 1
+
+    def save(self) -> None:
+        if not self.history_file:
+            return
+        # Keep a month of daily counters
+        oldest = (datetime.now() - timedelta(days=31)).strftime("%Y-%m-%d")
+        self.daily = {day: n for day, n in self.daily.items() if day >= oldest}
+        try:
+            save_json(self.history_file, {
+                "version": HISTORY_VERSION,
+                "keywords": self.keywords,
+                "templates": self.templates,
+                "daily": self.daily,
+            })
+        except Exception as e:
+            logging.warning(f"Could not save keyword history {self.history_file}: {e}")
+
+
+__all__ = [
+    "KeywordScheduler",
+]
@@ -0,0 +1,233 @@
+"""
+Bulk Member Count Normalization
+Facebook Group Data Extractor - Vectorized member count parsing
+
+Purpose:
+- Turn whole columns of member count text ("1,234", "13.6K", "1.5M",
+  "1.2 K members") into integers in one vectorized pass
+- Re-normalize member counts in historical CSVs, and search card counts
+  in bulk, without a Python-level loop per value
+
+Key Features:
+- One regex extract per column with pyarrow compute (vectorized C++ kernels),
+  pandas string ops when pyarrow is missing, NumPy for the arithmetic
+- Returns an exactness flag per value: True for plain integers ("1,234"),
+  False for abbreviated counts ("13.6K") that are only approximate
+- K/M suffixes only count when they follow the number ("members" is not millions)
+- Dot thousands separators ("1.234.567") are read as thousands, not decimals
+- Values already numeric pass through as exact
+- CSV mode streams the file in chunks; built-in benchmark at 10M values
+
+Usage:
+    from member_counts import parse_member_counts
+    counts, exact = parse_member_counts(df["member_count"])
+
+    python member_counts.py output/merged_results.csv          # -> *_counts.csv
+    python member_counts.py --benchmark 10000000
+"""
+
+from __future__ import annotations
+
+# Standard library imports
+import os          # File paths
+import sys         # Exit codes
+import time        # Benchmark timing
+import argparse    # Command-line arguments
+import importlib.util  # pandas availability check
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple  # Type hints
+
+if TYPE_CHECKING:
+    import pandas as pd  # type: ignore
+
+
+# Number with optional K/M suffix; the suffix must end the word ("1.2 K", not "1.2 members")
+MEMBER_COUNT_PATTERN = r"(\d[\d,.]*)\s*([km])?\b"
+
+_MULTIPLIERS = {"k": 1_000, "m": 1_000_000}
+
+# "1.234" / "1.234.567" without a suffix: dots are thousands separators
+_DOT_THOUSANDS = r"\d{1,3}(?:\.\d{3})+"
+
+# Digits left after removing separators that can be cast to a number
+_PLAIN_NUMBER = r"^\d+(?:\.\d+)?$"
+
+
+def _parse_with_arrow(series) -> Tuple:
+    """(numbers, multipliers, no_suffix) NumPy arrays computed with pyarrow kernels."""
+    import pyarrow as pa  # type: ignore
+    import pyarrow.compute as pc  # type: ignore
+
+    try:
+        arr = pa.array(series.to_numpy(dtype=object), type=pa.string(), from_pandas=True)
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        # Mixed column (numbers among strings): let pandas render everything as text
+        arr = pa.array(series.astype("string").to_numpy(dtype=object), type=pa.string(), from_pandas=True)
+    parts = pc.extract_regex(pc.utf8_lower(arr), r"(?P<digits>\d[\d,.]*)\s*(?P<suffix>[km]?)\b")
+    digits = pc.struct_field(parts, "digits")
+    suffix = pc.struct_field(parts, "suffix")
+
+    no_suffix = pc.equal(suffix, "")
+    dot_thousands = pc.and_(no_suffix, pc.match_substring_regex(digits, "^" + _DOT_THOUSANDS + "$"))
+    cleaned = pc.replace_substring(digits, ",", "")
+    cleaned = pc.if_else(dot_thousands, pc.replace_substring(cleaned, ".", ""), cleaned)
+    castable = pc.match_substring_regex(cleaned, _PLAIN_NUMBER)
+    numbers = pc.cast(pc.if_else(castable, cleaned, pa.scalar(None, pa.string())), pa.float64())
+
+    multiplier = pc.if_else(pc.equal(suffix, "k"), 1_000.0, pc.if_else(pc.equal(suffix, "m"), 1_000_000.0, 1.0))
+    return (numbers.to_numpy(zero_copy_only=False),
+            pc.fill_null(multiplier, 1.0).to_numpy(zero_copy_only=False),
+            pc.fill_null(no_suffix, False).to_numpy(zero_copy_only=False))
+
+
+def _parse_with_pandas(series) -> Tuple:
+    """Same as _parse_with_arrow() using pandas object-dtype string ops (slower)."""
+    import numpy as np  # type: ignore
+    import pandas as pd  # type: ignore
+
+    parts = series.astype("string").str.lower().str.extract(MEMBER_COUNT_PATTERN)
+    digits, suffix = parts[0], parts[1]
+    no_suffix = suffix.isna().to_numpy()
+    dot_thousands = digits.str.fullmatch(_DOT_THOUSANDS).fillna(False).to_numpy(dtype=bool) & no_suffix
+    cleaned = digits.str.replace(",", "", regex=False)
+    cleaned = cleaned.mask(dot_thousands, cleaned.str.replace(".", "", regex=False))
+    numbers = pd.to_numeric(cleaned, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    multiplier = suffix.map(_MULTIPLIERS).to_numpy(dtype="float64", na_value=1.0)
+    return numbers, multiplier, no_suffix
+
+
+def parse_member_counts(values: Iterable) -> Tuple["pd.Series", "pd.Series"]:
+    """
+    Parse member count values in bulk.
+
+    Args:
+        values: pandas Series (or any iterable) of strings and/or numbers
+
+    Returns:
+        (counts, exact): nullable Int64 Series (<NA> where nothing parsed) and a
+        boolean Series that is True where the count is exact (no K/M rounding)
+    """
+    import numpy as np  # type: ignore
+    import pandas as pd  # type: ignore
+
+    series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+    index = series.index
+
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        numbers = pd.to_numeric(series, errors="coerce")
+        counts = numbers.round().astype("Int64")
+        return counts, pd.Series(numbers.notna().to_numpy() & (numbers == numbers.round()).to_numpy(), index=index)
+
+    try:
+        numbers, multiplier, no_suffix = _parse_with_arrow(series)
+    except ImportError:
+        numbers, multiplier, no_suffix = _parse_with_pandas(series)
+
+    numbers = numbers.astype("float64")
+    scaled = np.round(numbers * multiplier)
+    valid = ~np.isnan(scaled)
+
+    counts = pd.array(np.where(valid, scaled, 0).astype("int64"), dtype="Int64")
+    counts[~valid] = pd.NA
+    exact = valid & no_suffix & (numbers == np.round(numbers))
+    return pd.Series(counts, index=index, name="member_count"), pd.Series(exact, index=index, name="member_count_exact")
+
+
+def normalize_csv(input_file: str, output_file: str, column: str = "member_count",
+                  chunksize: int = 500_000) -> Tuple[int, int, int]:
+    """
+    Rewrite a CSV with the column parsed to integers plus a <column>_exact flag.
+
+    Returns:
+        (rows, parsed, exact) counts
+    """
+    import pandas as pd  # type: ignore
+
+    rows = parsed = exact_rows = 0
+    first = True
+    for chunk in pd.read_csv(input_file, dtype=object, keep_default_na=False, chunksize=chunksize, encoding="utf-8"):
+        if column not in chunk.columns:
+            raise ValueError(f"Column '{column}' not found in {input_file}")
+        counts, exact = parse_member_counts(chunk[column])
+        chunk[column] = counts
+        chunk[f"{column}_exact"] = exact
+        chunk.to_csv(output_file, mode="w" if first else "a", header=first, index=False, encoding="utf-8")
+        first = False
+        rows += len(chunk)
+        parsed += int(counts.notna().sum())
+        exact_rows += int(exact.sum())
+    return rows, parsed, exact_rows
+
+
+def _run_benchmark(count: int) -> None:
+    """Parse `count` mixed member count strings and compare with the scalar parser."""
+    import numpy as np  # type: ignore
+    import pandas as pd  # type: ignore
+
+    samples = np.array(["1,234", "13.6K", "1.5M", "1.2 K members", "987 members", "2,345,678 members",
+                        "Members", "", "42", "7.1k members"], dtype=object)
+    values = pd.Series(samples[np.arange(count) % len(samples)], dtype=object)
+
+    print("=" * 60)
+    print(f"MEMBER COUNT PARSING BENCHMARK ({count:,} values)")
+    print("=" * 60)
+    start = time.perf_counter()
+    counts, exact = parse_member_counts(values)
+    elapsed = time.perf_counter() - start
+    print(f"vectorized: {elapsed:6.1f}s ({count / max(elapsed, 1e-9):,.0f} values/s), "
+          f"{int(counts.notna().sum()):,} parsed, {int(exact.sum()):,} exact")
+
+    try:
+        from scraper import format_member_count_text
+    except ImportError:
+        print("scalar:     skipped (scraper dependencies not installed)")
+    else:
+        sample = values.iloc[: min(count, 1_000_000)]
+        start = time.perf_counter()
+        scalar = [format_member_count_text(v) for v in sample]
+        elapsed_scalar = time.perf_counter() - start
+        agree = sum(1 for a, b in zip(scalar, counts.iloc[: len(sample)].fillna(0)) if a == b)
+        print(f"scalar:     {elapsed_scalar * count / len(sample):6.1f}s (extrapolated), "
+              f"agrees on {agree / len(sample):.1%} of values")
+    print("=" * 60)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function to handle command-line arguments"""
+    parser = argparse.ArgumentParser(description='Normalize member count text to integers in bulk')
+    parser.add_argument('input', nargs='?', help='CSV file to normalize')
+    parser.add_argument('--column', default='member_count', help='Column to parse (default: member_count)')
+    parser.add_argument('--output', default=None, help='Output CSV (default: <input>_counts.csv)')
+    parser.add_argument('--benchmark', type=int, default=None, metavar='N', help='Benchmark with N synthetic values')
+    args = parser.parse_args(argv)
+
+    if importlib.util.find_spec("pandas") is None:
+        print("❌ member_counts.py requires pandas (pip install pandas)")
+        return 1
+
+    if args.benchmark:
+        _run_benchmark(args.benchmark)
+        return 0
+    if not args.input:
+        parser.error("input CSV is required (or use --benchmark)")
+    if not os.path.exists(args.input):
+        print(f"❌ Input file not found: {args.input}")
+        return 1
+
+    output = args.output or os.path.splitext(args.input)[0] + "_counts.csv"
+    try:
+        rows, parsed, exact = normalize_csv(args.input, output, column=args.column)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"✅ {rows:,} rows: {parsed:,} counts parsed, {exact:,} exact -> {output}")
+    return 0
+
+
+__all__ = [
+    "parse_member_counts",
+    "normalize_csv",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
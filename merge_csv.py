@@ -6,23 +6,570 @@ Usage:
     python merge_csv.py
     python merge_csv.py --output merged_results.csv
     python merge_csv.py --pattern "test_single_group_results*.csv"
+    python merge_csv.py --streaming --memory-limit-mb 256
+    python merge_csv.py --pattern "search_results_*.csv" --workers 8
+    python merge_csv.py --full-rebuild
+    python merge_csv.py --coalesce --policy member_count=latest
+    python merge_csv.py --pattern "search_results_*.csv" --db output/results.db
+
+Merge Modes:
+- In-memory (default): keeps one row per group in a dict, output in first-seen order
+- Streaming (--streaming): bounded-memory external merge for inputs larger than RAM.
+  Rows are sorted by group key in chunks that fit the memory ceiling, spilled to
+  temporary run files next to the output, then k-way merged. Output is ordered by
+  group key. Both modes pick the same row for every group.
+
+Schema Handling:
+- The output header is the union of all input headers: columns of the first file,
+  then columns first seen in later files (files taken in sorted name order), so
+  enriched columns that only some phase 2 outputs have are never dropped
+- Empty fields are counted over the union header (a missing column counts as empty)
+
+Parallel Ingestion:
+- In-memory mode parses files in a process pool (--workers); each worker returns a
+  per-file, already deduplicated partial result and the partials are combined in
+  file order, so the output is identical for any number of workers
+
+Incremental Merging:
+- <output>.manifest.json records each merged input's path, size, mtime and SHA-256,
+  plus the merge mode (in-memory/streaming/coalesce and coalescing policies)
+- Later runs merge only new or changed inputs into the existing output (updated in
+  place via a temp file); unchanged inputs are not re-read
+- Append-only inputs (e.g. test_single_group_results.csv) are recognized by the
+  hash of the previously merged prefix; only the appended rows are read
+- Changing the merge mode or policies forces a full rebuild
+- --full-rebuild ignores the manifest and re-merges every input
+
+Field-Level Coalescing (--coalesce, requires pandas):
+- Instead of keeping the whole row with the fewest empty fields, every field is
+  merged on its own with vectorized groupby operations
+- Rows are ordered by extraction_date / captured_at; by default each field takes
+  its most recent non-empty value, member_count takes the maximum
+- Policies per field: latest, first, max, min (--policy field=policy)
+
+Results Database (--db):
+- New or changed input rows are also upserted into the shared SQLite results
+  database (see results_db.py), in batches of DB_BATCH_SIZE rows
 """
 
 import csv
 import os
 import glob
+import heapq
+import shutil
+import hashlib
 import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from collections import OrderedDict
 
-def merge_csv_files(input_dir="output", output_file="output/merged_results.csv", pattern="test_single_group_results*.csv"):
+from seen_set import group_key
+from json_store import load_json, save_json
+
+# Maximum number of run files merged at once in streaming mode
+MAX_OPEN_RUNS = 64
+
+# Bumped when the merge manifest layout changes (older manifests force a full rebuild)
+MANIFEST_VERSION = 2
+
+# Per-field policies for --coalesce (fields not listed take the latest non-empty value)
+FIELD_POLICIES = {
+    'member_count': 'max',
+}
+COALESCE_POLICIES = ('latest', 'first', 'max', 'min')
+
+# Timestamp format written by the scrapers (extraction_date / captured_at)
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Rows per transaction when importing inputs into the results database
+DB_BATCH_SIZE = 5000
+
+# Snapshot source the writers use for their CSV files (file name prefix -> source),
+# for rows without a 'source' column
+SOURCE_BY_PREFIX = (
+    ('test_single_group_results', 'test_single_group'),
+    ('search_results_', 'phase2'),
+    ('scraped_data_raw', 'phase1'),
+)
+
+
+def _count_empty(values):
+    """Count empty fields in a row aligned to the output header (computed once per row)"""
+    empty = 0
+    for v in values:
+        if not v or v.strip() == '':
+            empty += 1
+    return empty
+
+
+def _read_header(csv_file):
+    """Return the header row of a CSV file, or None if it cannot be read"""
+    try:
+        with open(csv_file, 'r', encoding='utf-8') as f:
+            return csv.DictReader(f).fieldnames
+    except Exception:
+        return None
+
+
+def _union_header(csv_files):
+    """
+    Union of all input headers in a stable order: columns of the first file,
+    then new columns in the order later files introduce them
+    """
+    header = []
+    seen = set()
+    for csv_file in csv_files:
+        for col in _read_header(csv_file) or []:
+            if col and col not in seen:
+                seen.add(col)
+                header.append(col)
+    return header
+
+
+def _parse_file(task):
+    """
+    Process-pool worker: read one CSV file and deduplicate it on its own
+
+    Args:
+        task (tuple): (csv_file, header)
+
+    Returns:
+        tuple: (csv_file, file_rows, partial, error) where partial maps
+               group key -> (empty_count, values) in first-seen order
+    """
+    csv_file, header = task
+    partial = OrderedDict()
+    file_rows = 0
+    try:
+        with open(csv_file, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                file_rows += 1
+                group_url = (row.get('group_url') or '').strip()
+                if not group_url:
+                    continue
+                # Numeric IDs and interned vanity names are far smaller keys than full URLs
+                key = group_key(group_url) or group_url
+                values = [row.get(col) or '' for col in header]
+                new_empty = _count_empty(values)
+                # If URL already exists, keep the one with more data (fewer empty fields)
+                existing = partial.get(key)
+                if existing is None or new_empty < existing[0]:
+                    partial[key] = (new_empty, values)
+    except Exception as e:
+        return csv_file, file_rows, partial, str(e)
+    return csv_file, file_rows, partial, None
+
+
+def _merge_in_memory(csv_files, header, workers=1):
+    """
+    Merge CSV files into one dict of unique records
+
+    Args:
+        csv_files (list): Sorted list of input CSV paths
+        header (list): Output column names (union header)
+        workers (int): Number of parser processes (1 = parse in this process)
+
+    Returns:
+        tuple: (unique_records, total_rows) where unique_records maps
+               group key -> (empty_count, values)
+    """
+    # Dictionary to store unique records (keyed by canonical group ID/name to avoid duplicates)
+    unique_records = OrderedDict()
+    total_rows = 0
+    tasks = [(csv_file, header) for csv_file in csv_files]
+
+    def combine(results):
+        nonlocal total_rows
+        # Partials arrive in file order, so the result does not depend on the worker count
+        for csv_file, file_rows, partial, error in results:
+            total_rows += file_rows
+            if error:
+                print(f"   ⚠️  Error reading {os.path.basename(csv_file)}: {error}")
+                continue
+            for key, item in partial.items():
+                existing = unique_records.get(key)
+                if existing is None or item[0] < existing[0]:
+                    unique_records[key] = item
+            print(f"   ✅ {os.path.basename(csv_file)}: {file_rows} rows")
+
+    workers = max(1, min(int(workers or 1), len(tasks)))
+    if workers == 1:
+        combine(map(_parse_file, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            combine(executor.map(_parse_file, tasks))
+
+    return unique_records, total_rows
+
+
+def _sort_key(group_url):
+    """Return a string key that sorts all rows of one group together"""
+    key = group_key(group_url)
+    if key is None:
+        return 's:' + group_url
+    if isinstance(key, int):
+        return 'i:%020d' % key
+    return 'v:' + key
+
+
+def _write_run(path, chunk):
+    """Sort a chunk of (sort_key, empty, seq, values) tuples and write it as a run file"""
+    chunk.sort(key=lambda item: (item[0], item[1], item[2]))
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        for sort_key, empty, seq, values in chunk:
+            writer.writerow([sort_key, empty, seq] + values)
+
+
+def _read_run(path):
+    """Yield (sort_key, empty, seq, values) tuples from a run file"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for rec in csv.reader(f):
+            yield rec[0], int(rec[1]), int(rec[2]), rec[3:]
+
+
+def _merge_runs(run_paths):
+    """
+    K-way merge of sorted run files, yielding the best row for each group.
+    The best row has the fewest empty fields; ties go to the row read first.
+    """
+    streams = [_read_run(p) for p in run_paths]
+    last_key = None
+    for item in heapq.merge(*streams, key=lambda item: (item[0], item[1], item[2])):
+        if item[0] != last_key:
+            last_key = item[0]
+            yield item
+
+
+def _merge_streaming(csv_files, header, output_file, memory_limit_mb=256):
+    """
+    Bounded-memory external merge of CSV files
+
+    Args:
+        csv_files (list): Sorted list of input CSV paths
+        header (list): Output column names
+        output_file (str): Path to output merged CSV file
+        memory_limit_mb (int): Approximate memory ceiling for buffered rows
+
+    Returns:
+        tuple: (unique_rows, total_rows)
+    """
+    memory_limit = max(1, int(memory_limit_mb)) * 1024 * 1024
+    output_dir = os.path.dirname(output_file)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    work_dir = tempfile.mkdtemp(prefix='merge_runs_', dir=output_dir or None)
+
+    try:
+        runs = []
+        run_count = 0
+        chunk = []
+        chunk_bytes = 0
+        seq = 0
+        total_rows = 0
+
+        for csv_file in csv_files:
+            try:
+                with open(csv_file, 'r', encoding='utf-8') as f:
+                    reader = csv.DictReader(f)
+                    file_rows = 0
+                    for row in reader:
+                        file_rows += 1
+                        total_rows += 1
+                        group_url = (row.get('group_url') or '').strip()
+                        if not group_url:
+                            continue
+                        values = [row.get(col) or '' for col in header]
+                        chunk.append((_sort_key(group_url), _count_empty(values), seq, values))
+                        seq += 1
+                        # Rough per-row footprint: field text plus tuple/list/str overhead
+                        chunk_bytes += sum(len(v) for v in values) + 60 * len(values) + 200
+                        if chunk_bytes >= memory_limit:
+                            run_path = os.path.join(work_dir, f'run_{run_count:05d}.csv')
+                            run_count += 1
+                            _write_run(run_path, chunk)
+                            runs.append(run_path)
+                            chunk = []
+                            chunk_bytes = 0
+                    print(f"   ✅ {os.path.basename(csv_file)}: {file_rows} rows")
+            except Exception as e:
+                print(f"   ⚠️  Error reading {os.path.basename(csv_file)}: {str(e)}")
+                continue
+
+        if chunk:
+            run_path = os.path.join(work_dir, f'run_{run_count:05d}.csv')
+            run_count += 1
+            _write_run(run_path, chunk)
+            runs.append(run_path)
+            chunk = []
+
+        if runs:
+            print(f"   🔀 Merging {len(runs)} sorted run(s)...")
+
+        # Keep the number of open files bounded by merging runs in groups first
+        while len(runs) > MAX_OPEN_RUNS:
+            group, runs = runs[:MAX_OPEN_RUNS], runs[MAX_OPEN_RUNS:]
+            run_path = os.path.join(work_dir, f'run_{run_count:05d}.csv')
+            run_count += 1
+            with open(run_path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                for sort_key, empty, item_seq, values in _merge_runs(group):
+                    writer.writerow([sort_key, empty, item_seq] + values)
+            for p in group:
+                os.remove(p)
+            runs.append(run_path)
+
+        unique_rows = 0
+        if runs:
+            with open(output_file, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                for _, _, _, values in _merge_runs(runs):
+                    writer.writerow(values)
+                    unique_rows += 1
+
+        return unique_rows, total_rows
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _merge_coalesce(csv_files, header, output_file, policies=None):
+    """
+    Field-level coalescing merge (vectorized with pandas)
+
+    Instead of keeping one whole row per group, every field is merged on its own:
+    rows are ordered by extraction_date/captured_at and each field takes the value
+    chosen by its policy (default: the most recent non-empty value).
+
+    Args:
+        csv_files (list): Input CSV paths in merge order
+        header (list): Output column names (union header)
+        output_file (str): Path to write the merged CSV to
+        policies (dict): Column -> policy overrides ('latest', 'first', 'max', 'min')
+
+    Returns:
+        tuple: (unique_rows, total_rows)
+    """
+    try:
+        import pandas as pd  # type: ignore
+    except Exception:
+        print("   ❌ Coalesce mode requires pandas (pip install pandas)")
+        return 0, 0
+
+    field_policies = dict(FIELD_POLICIES)
+    field_policies.update(policies or {})
+
+    frames = []
+    for csv_file in csv_files:
+        try:
+            # skipinitialspace turns whitespace-only cells into '' inside the C parser
+            df = pd.read_csv(csv_file, dtype=object, keep_default_na=False, skipinitialspace=True, encoding='utf-8')
+        except Exception as e:
+            print(f"   ⚠️  Error reading {os.path.basename(csv_file)}: {str(e)}")
+            continue
+        print(f"   ✅ {os.path.basename(csv_file)}: {len(df)} rows")
+        frames.append(df)
+
+    if not frames:
+        return 0, 0
+
+    df = pd.concat(frames, ignore_index=True, sort=False).reindex(columns=header)
+    total_rows = len(df)
+    if 'group_url' not in df.columns:
+        return 0, total_rows
+
+    # Same canonical group key as the other merge modes; computed once per distinct URL
+    urls = df['group_url'].fillna('').str.strip()
+    keys = {url: group_key(url) or url for url in urls.unique() if url}
+    df['_key'] = urls.map(keys)
+    df = df[df['_key'].notna()]
+    if df.empty:
+        return 0, total_rows
+
+    # Empty cells become missing so "last non-empty" can skip them
+    for col in header:
+        values = df[col]
+        df[col] = values.where(values.notna() & (values != ''))
+
+    # Row timestamp: extraction_date, else captured_at; stable sort keeps file order on ties
+    ts = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+    for col in ('extraction_date', 'captured_at'):
+        if col in df.columns:
+            ts = ts.fillna(pd.to_datetime(df[col], format=TIMESTAMP_FORMAT, errors='coerce'))
+    df['_ts'] = ts
+    group_order = df['_key'].drop_duplicates()
+    df = df.sort_values('_ts', kind='mergesort', na_position='first')
+
+    # Factorize once; every aggregation below groups by the same integer codes
+    codes, uniques = pd.factorize(df['_key'])
+    grouped = df[header].groupby(codes, sort=False)
+    parts = []
+    for policy in ('latest', 'first'):
+        cols = [c for c in header if field_policies.get(c, 'latest') == policy]
+        if cols:
+            parts.append(grouped[cols].last() if policy == 'latest' else grouped[cols].first())
+    for col in header:
+        policy = field_policies.get(col, 'latest')
+        if policy in ('max', 'min'):
+            numbers = pd.to_numeric(df[col], errors='coerce')
+            # Only cells like "1,234" need the (slow) string cleanup
+            retry = numbers.isna() & df[col].notna()
+            if retry.any():
+                numbers[retry] = pd.to_numeric(df.loc[retry, col].str.replace(',', '', regex=False), errors='coerce')
+            result = getattr(numbers.groupby(codes, sort=False), policy)()
+            parts.append(result.round().astype('Int64').astype(object).rename(col))
+
+    out = pd.concat(parts, axis=1)
+    out.index = uniques[out.index]
+    out = out.reindex(index=group_order.values, columns=header).fillna('')
+
+    output_dir = os.path.dirname(output_file)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    out.to_csv(output_file, index=False, encoding='utf-8')
+    return len(out), total_rows
+
+
+def _file_sha256(path, prefix_size=None):
+    """
+    Return the SHA-256 hex digest of a file's content
+
+    With prefix_size, return (prefix digest, full digest) from one pass, where the
+    prefix digest covers the first prefix_size bytes (None if the file is shorter).
+    """
+    digest = hashlib.sha256()
+    prefix_digest = None
+    remaining = prefix_size
+    with open(path, 'rb') as f:
+        if prefix_size is not None:
+            while remaining > 0:
+                block = f.read(min(remaining, 1024 * 1024))
+                if not block:
+                    break
+                digest.update(block)
+                remaining -= len(block)
+            if remaining == 0:
+                prefix_digest = digest.hexdigest()
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    if prefix_size is None:
+        return digest.hexdigest()
+    return prefix_digest, digest.hexdigest()
+
+
+def _ends_with_newline(path, size):
+    """True if byte size-1 of the file is a newline (a row boundary)"""
+    if size <= 0:
+        return False
+    with open(path, 'rb') as f:
+        f.seek(size - 1)
+        return f.read(1) == b'\n'
+
+
+def _write_tail(path, offset, tail_path):
+    """Write the header line of a CSV file plus everything after offset to tail_path"""
+    with open(path, 'rb') as src, open(tail_path, 'wb') as dst:
+        dst.write(src.readline())
+        src.seek(offset)
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+
+
+def _scan_inputs(csv_files, known_inputs):
+    """
+    Compare input files against the manifest of already-merged inputs
+
+    Size and mtime are checked first; the content hash is only computed for
+    files that are new or whose size/mtime changed. A file that grew and still
+    starts with exactly the bytes merged last time is 'appended': only the
+    part after the previous size needs merging.
+
+    Args:
+        csv_files (list): Sorted list of input CSV paths
+        known_inputs (dict): Manifest entries keyed by path ({} for a full rebuild)
+
+    Returns:
+        tuple: (entries, pending) where entries holds the manifest entry for every
+               current input and pending lists (path, status) for new/changed/appended
+               inputs (status 'appended': merge from the previous entry's size on)
+    """
+    entries = {}
+    pending = []
+    for path in csv_files:
+        st = os.stat(path)
+        previous = known_inputs.get(path)
+        if previous and previous.get('size') == st.st_size and previous.get('mtime') == st.st_mtime:
+            entries[path] = previous
+            continue
+        if previous and st.st_size > previous.get('size', 0) and _ends_with_newline(path, previous['size']):
+            prefix_sha, sha = _file_sha256(path, previous['size'])
+            entries[path] = {'size': st.st_size, 'mtime': st.st_mtime, 'sha256': sha}
+            if prefix_sha == previous.get('sha256'):
+                pending.append((path, 'appended'))
+                continue
+        else:
+            entries[path] = {'size': st.st_size, 'mtime': st.st_mtime, 'sha256': _file_sha256(path)}
+        if previous and previous.get('sha256') == entries[path]['sha256']:
+            continue  # Touched but content unchanged
+        pending.append((path, 'changed' if previous else 'new'))
+    return entries, pending
+
+
+def _import_to_db(csv_files, db_path):
+    """
+    Upsert every row of the given (file to read, input file) pairs into the results database.
+
+    Rows keep the snapshot source they were written with (their 'source' column, e.g.
+    phase2), so re-importing a merged file does not duplicate snapshots. Rows without
+    one get the source of the writer that names files like the input (SOURCE_BY_PREFIX),
+    else the input file name.
+    """
+    from results_db import ResultsDB
+
+    imported = 0
+    with ResultsDB(db_path) as db:
+        for csv_file, input_file in csv_files:
+            name = os.path.splitext(os.path.basename(input_file))[0]
+            fallback_source = next((src for prefix, src in SOURCE_BY_PREFIX if name.startswith(prefix)), name)
+            try:
+                with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+                    batch = []
+                    for row in csv.DictReader(f):
+                        if not (row.get('source') or '').strip():
+                            row['source'] = fallback_source
+                        batch.append(row)
+                        if len(batch) >= DB_BATCH_SIZE:
+                            imported += db.upsert_records(batch)
+                            batch = []
+                    imported += db.upsert_records(batch)
+            except Exception as e:
+                print(f"⚠️  Could not import {os.path.basename(csv_file)} into database: {str(e)}")
+    return imported
+
+
+def merge_csv_files(input_dir="output", output_file="output/merged_results.csv", pattern="test_single_group_results*.csv",
+                    streaming=False, memory_limit_mb=256, workers=1, full_rebuild=False,
+                    coalesce=False, policies=None, db_path=None):
     """
     Merge all CSV files matching the pattern into a single CSV file
     
+    A manifest (<output_file>.manifest.json) records the path, size, mtime and
+    content hash of every merged input and the merge mode. Later runs merge only
+    new or changed inputs (only the new rows of appended inputs) into the existing
+    output, which is updated in place. Ties between an existing output row and a
+    new row go to the existing row. A different merge mode forces a full rebuild.
+    
     Args:
         input_dir (str): Directory containing CSV files to merge
         output_file (str): Path to output merged CSV file
         pattern (str): File pattern to match (e.g., "test_single_group_results*.csv")
+        streaming (bool): Use the bounded-memory external merge instead of an in-memory dict
+        memory_limit_mb (int): Memory ceiling for buffered rows in streaming mode
+        workers (int): Number of parser processes for the in-memory mode
+        full_rebuild (bool): Ignore the manifest and re-merge every input
+        coalesce (bool): Merge field by field (latest non-empty value) instead of whole rows
+        policies (dict): Per-field coalescing policy overrides, e.g. {'member_count': 'latest'}
+        db_path (str): Also upsert new/changed input rows into this results database
     
     Returns:
         int: Number of unique rows merged
@@ -31,93 +578,149 @@ def merge_csv_files(input_dir="output", output_file="output/merged_results.csv",
     print("CSV MERGER")
     print("=" * 60)
     
-    # Find all CSV files matching the pattern
+    # Find all CSV files matching the pattern (never the merged output itself)
     search_pattern = os.path.join(input_dir, pattern)
-    csv_files = glob.glob(search_pattern)
+    output_abs = os.path.abspath(output_file)
+    csv_files = [f for f in glob.glob(search_pattern) if os.path.abspath(f) != output_abs]
     
     if not csv_files:
         print(f"❌ No CSV files found matching pattern: {pattern}")
         return 0
     
-    print(f"\n📁 Found {len(csv_files)} CSV file(s) to merge:")
-    for f in sorted(csv_files):
-        print(f"   - {os.path.basename(f)}")
-    
-    # Dictionary to store unique records (keyed by group_url to avoid duplicates)
-    unique_records = OrderedDict()
-    header = None
-    total_rows = 0
-    
-    # Read all CSV files
-    for csv_file in sorted(csv_files):
-        try:
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                
-                # Store header from first file
-                if header is None:
-                    header = reader.fieldnames
-                
-                # Read rows from this file
-                file_rows = 0
-                for row in reader:
-                    file_rows += 1
-                    total_rows += 1
-                    
-                    # Use group_url as unique key
-                    group_url = row.get('group_url', '').strip()
-                    
-                    if group_url:
-                        # If URL already exists, keep the one with more data (fewer empty fields)
-                        if group_url in unique_records:
-                            existing = unique_records[group_url]
-                            existing_empty = sum(1 for v in existing.values() if not v or v.strip() == '')
-                            new_empty = sum(1 for v in row.values() if not v or v.strip() == '')
-                            
-                            # Keep the record with fewer empty fields
-                            if new_empty < existing_empty:
-                                unique_records[group_url] = row
-                        else:
-                            unique_records[group_url] = row
-                
-                print(f"   ✅ {os.path.basename(csv_file)}: {file_rows} rows")
-                
-        except Exception as e:
-            print(f"   ⚠️  Error reading {os.path.basename(csv_file)}: {str(e)}")
-            continue
+    csv_files = sorted(os.path.normpath(f) for f in csv_files)
+
+    # Merge mode: the output of another mode/policy set cannot be extended incrementally
+    if coalesce:
+        mode = {'mode': 'coalesce', 'policies': dict(sorted({**FIELD_POLICIES, **(policies or {})}.items()))}
+    else:
+        mode = {'mode': 'streaming' if streaming else 'in-memory'}
+
+    # Load the manifest of already-merged inputs (incremental mode)
+    manifest_path = output_file + '.manifest.json'
+    manifest = None
+    if not full_rebuild and os.path.exists(output_file):
+        manifest = load_json(manifest_path)
+        if manifest and manifest.get('version') != MANIFEST_VERSION:
+            manifest = None
+        if manifest and manifest.get('merge_mode') != mode:
+            print(f"\n🔁 Merge mode changed ({(manifest.get('merge_mode') or {}).get('mode')} -> "
+                  f"{mode['mode']}) - rebuilding from all inputs")
+            manifest = None
+    known_inputs = (manifest or {}).get('inputs', {})
+
+    entries, pending = _scan_inputs(csv_files, known_inputs)
+    pending_status = dict(pending)
     
-    if not unique_records:
-        print("\n❌ No data found in CSV files")
-        return 0
+    print(f"\n📁 Found {len(csv_files)} CSV file(s) to merge:")
+    for f in csv_files:
+        label = pending_status.get(f, 'already merged')
+        print(f"   - {os.path.basename(f)} ({label})")
     
-    # Write merged data to output file
+    removed = [p for p in known_inputs if p not in entries]
+    if removed:
+        print(f"\n⚠️  {len(removed)} previously merged file(s) no longer exist; their rows stay in the output")
+        print("   Use --full-rebuild to drop them")
+
+    if manifest and not pending:
+        print("\n✅ Merged output is up to date - nothing new to merge")
+        print(f"📁 Output file: {output_file}")
+        if removed:
+            manifest['inputs'] = entries
+            save_json(manifest_path, manifest)
+        return manifest.get('unique_rows', 0)
+
+    if manifest:
+        print(f"\n🔄 Incremental merge: {len(pending)} new/changed/appended file(s) into {os.path.basename(output_file)}")
+    else:
+        print(f"\n🔄 Full merge of {len(csv_files)} file(s)")
+
+    # Write to a temporary file, then replace the output in place
+    tmp_output = output_file + '.tmp'
+    tail_dir = None
     try:
-        # Ensure output directory exists
-        output_dir = os.path.dirname(output_file)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-        
-        with open(output_file, 'w', encoding='utf-8', newline='') as f:
-            if header:
-                writer = csv.DictWriter(f, fieldnames=header)
-                writer.writeheader()
+        # Appended inputs are read from a copy of their header plus the new rows only
+        read_paths = {}
+        for path, status in pending:
+            read_paths[path] = path
+            if status == 'appended':
+                if tail_dir is None:
+                    tail_dir = tempfile.mkdtemp(prefix='merge_tail_', dir=os.path.dirname(output_abs))
+                read_paths[path] = os.path.join(tail_dir, f"{len(read_paths)}_{os.path.basename(path)}")
+                _write_tail(path, known_inputs[path]['size'], read_paths[path])
+
+        # Existing output goes first so it wins ties against re-read rows
+        merge_inputs = ([output_file] if manifest else []) + [read_paths[path] for path, _ in pending]
+
+        # Output header is the union of all input schemas (stable column order)
+        header = _union_header(merge_inputs)
+        if not header:
+            print("\n❌ No data found in CSV files")
+            return 0
+
+        if coalesce:
+            print("\n🧬 Field-level coalescing merge")
+            unique_count, total_rows = _merge_coalesce(merge_inputs, header, tmp_output, policies)
+        elif streaming:
+            print(f"\n💾 Streaming merge (memory limit: {memory_limit_mb} MB)")
+            unique_count, total_rows = _merge_streaming(merge_inputs, header, tmp_output, memory_limit_mb)
+        else:
+            unique_records, total_rows = _merge_in_memory(merge_inputs, header, workers)
+            unique_count = len(unique_records)
+            if unique_records:
+                # Ensure output directory exists
+                output_dir = os.path.dirname(output_file)
+                if output_dir and not os.path.exists(output_dir):
+                    os.makedirs(output_dir)
                 
-                for group_url, row in unique_records.items():
-                    writer.writerow(row)
+                with open(tmp_output, 'w', encoding='utf-8', newline='') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(header)
+                    
+                    for _, values in unique_records.values():
+                        writer.writerow(values)
+
+        if not unique_count:
+            print("\n❌ No data found in CSV files")
+            return 0
         
+        os.replace(tmp_output, output_file)
+        save_json(manifest_path, {
+            'version': MANIFEST_VERSION,
+            'output': output_file,
+            'header': header,
+            'unique_rows': unique_count,
+            'updated_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'merge_mode': mode,
+            'inputs': entries,
+        })
+
+        # Only rows that made it into the committed output go to the database
+        if db_path:
+            imported = _import_to_db([(read_paths[path], path) for path, _ in pending], db_path)
+            print(f"\n🗄️  Imported {imported} row(s) into results database: {db_path}")
+
         print("\n" + "=" * 60)
         print("MERGE COMPLETE")
         print("=" * 60)
         print(f"📊 Total rows read: {total_rows}")
-        print(f"📊 Unique groups: {len(unique_records)}")
+        print(f"📊 Unique groups: {unique_count}")
         print(f"📁 Output file: {output_file}")
+        print(f"🧾 Manifest: {manifest_path}")
         print("=" * 60)
         
-        return len(unique_records)
+        return unique_count
         
     except Exception as e:
         print(f"\n❌ Error writing merged CSV: {str(e)}")
         return 0
+    finally:
+        if os.path.exists(tmp_output):
+            try:
+                os.remove(tmp_output)
+            except OSError:
+                pass
+        if tail_dir:
+            shutil.rmtree(tail_dir, ignore_errors=True)
 
 
 def main():
@@ -130,6 +733,7 @@ Examples:
   python merge_csv.py
   python merge_csv.py --output output/all_results.csv
   python merge_csv.py --pattern "*.csv" --output output/merged.csv
+  python merge_csv.py --pattern "search_results_*.csv" --streaming --memory-limit-mb 512
         """
     )
     
@@ -151,12 +755,73 @@ Examples:
         help='File pattern to match (default: test_single_group_results*.csv)'
     )
     
+    parser.add_argument(
+        '--streaming',
+        action='store_true',
+        help='Use bounded-memory external merge (for inputs larger than RAM)'
+    )
+
+    parser.add_argument(
+        '--memory-limit-mb',
+        type=int,
+        default=256,
+        help='Memory ceiling for buffered rows in streaming mode (default: 256)'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Parallel parser processes for the in-memory mode (default: CPU count)'
+    )
+
+    parser.add_argument(
+        '--full-rebuild',
+        action='store_true',
+        help='Ignore the merge manifest and re-merge every input file'
+    )
+
+    parser.add_argument(
+        '--coalesce',
+        action='store_true',
+        help='Merge field by field (latest non-empty value per field) instead of whole rows'
+    )
+    
+    parser.add_argument(
+        '--policy',
+        action='append',
+        default=[],
+        metavar='FIELD=POLICY',
+        help=f"Coalescing policy for one field ({', '.join(COALESCE_POLICIES)}); repeatable"
+    )
+
+    parser.add_argument(
+        '--db',
+        default=None,
+        metavar='PATH',
+        help='Also upsert new/changed input rows into this SQLite results database'
+    )
+
     args = parser.parse_args()
     
+    policies = {}
+    for item in args.policy:
+        field, _, policy = item.partition('=')
+        if not field or policy not in COALESCE_POLICIES:
+            parser.error(f"Invalid --policy '{item}' (expected FIELD=one of {', '.join(COALESCE_POLICIES)})")
+        policies[field.strip()] = policy
+    
     merge_csv_files(
         input_dir=args.input_dir,
         output_file=args.output,
-        pattern=args.pattern
+        pattern=args.pattern,
+        streaming=args.streaming,
+        memory_limit_mb=args.memory_limit_mb,
+        workers=args.workers,
+        full_rebuild=args.full_rebuild,
+        coalesce=args.coalesce,
+        policies=policies,
+        db_path=args.db
     )
 
 
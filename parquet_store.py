@@ -0,0 +1,205 @@
+"""
+Columnar Output Backend (Parquet)
+Facebook Group Data Extractor - Parquet dataset writer and loader
+
+Purpose:
+- Store extracted group records as a Parquet dataset partitioned by extraction date
+- Let analysts load months of history quickly, reading only the columns they need
+
+Key Features:
+- Hive-style partitions: <dataset_dir>/extraction_day=YYYY-MM-DD/part-*.parquet
+- Append per batch: every save writes new part files, existing files are untouched
+- Dictionary encoding for low-cardinality text (keyword, privacy)
+- member_count stored as a typed int64 column
+- Column projection and date-range partition pruning in load_groups()
+- pyarrow is optional: without it the writer logs a warning and does nothing
+
+Usage:
+    from parquet_store import write_parquet_batch, load_groups
+    write_parquet_batch(records, "output/parquet", source="phase2")
+    df = load_groups("output/parquet", columns=["group_url", "member_count"],
+                     start_date="2025-10-01", end_date="2025-10-31")
+"""
+
+from __future__ import annotations
+
+# Standard library imports
+import os          # File and directory operations
+import uuid        # Unique part file names
+import logging     # Logging write results and errors
+from datetime import datetime  # Part file timestamps
+from typing import Dict, Iterable, List, Optional  # Type hints
+
+
+# Partition column derived from extraction_date (or captured_at for search-only records)
+PARTITION_COLUMN = "extraction_day"
+
+# Columns stored with dictionary encoding (few distinct values, repeated on every row)
+DICTIONARY_COLUMNS = ["keyword", "privacy"]
+
+# Columns stored as int64 instead of text
+INTEGER_COLUMNS = ["member_count"]
+
+# Known record columns in a stable order; unknown extra keys are appended as text
+GROUP_COLUMNS = [
+    "keyword",
+    "group_url",
+    "captured_at",
+    "group_name",
+    "member_count",
+    "description",
+    "privacy",
+    "admin_names",
+    "admin_profile_urls",
+    "member_names",
+    "member_profile_urls",
+    "extraction_date",
+    "source",
+]
+
+
+def _to_int(value) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int):
+        return value
+    try:
+        return int(float(str(value).replace(",", "").strip()))
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_text(value) -> Optional[str]:
+    if value is None:
+        return None
+    return value if isinstance(value, str) else str(value)
+
+
+def _record_day(record: Dict) -> str:
+    """Return the YYYY-MM-DD partition value for a record."""
+    for key in ("extraction_date", "captured_at"):
+        value = _to_text(record.get(key)) or ""
+        if len(value) >= 10 and value[4] == "-" and value[7] == "-":
+            return value[:10]
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+def _arrow_schema(pa, columns: List[str]):
+    fields = []
+    for col in columns:
+        if col in INTEGER_COLUMNS:
+            fields.append(pa.field(col, pa.int64()))
+        elif col in DICTIONARY_COLUMNS:
+            fields.append(pa.field(col, pa.dictionary(pa.int32(), pa.string())))
+        else:
+            fields.append(pa.field(col, pa.string()))
+    return pa.schema(fields)
+
+
+def write_parquet_batch(records: Iterable[Dict], dataset_dir: str = "output/parquet", source: str = "") -> List[str]:
+    """
+    Append a batch of group records to the Parquet dataset.
+
+    Args:
+        records: Group record dicts (phase 1 / phase 2 / test_single_group rows)
+        dataset_dir: Root directory of the partitioned dataset
+        source: Optional label stored in the 'source' column (e.g. "phase2")
+
+    Returns:
+        List of part file paths written (empty if nothing was written)
+    """
+    records = [r for r in records if r]
+    if not records:
+        return []
+
+    try:
+        import pyarrow as pa  # type: ignore
+        import pyarrow.parquet as pq  # type: ignore
+    except Exception:
+        logging.warning("pyarrow is not installed - skipping Parquet output (pip install pyarrow)")
+        return []
+
+    extra = []
+    for r in records:
+        for key in r.keys():
+            if key not in GROUP_COLUMNS and key not in extra and key != PARTITION_COLUMN:
+                extra.append(key)
+    columns = GROUP_COLUMNS + extra
+    schema = _arrow_schema(pa, columns)
+
+    # Group records by extraction day so each partition gets one part file per batch
+    by_day: Dict[str, List[Dict]] = {}
+    for r in records:
+        by_day.setdefault(_record_day(r), []).append(r)
+
+    batch_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    written: List[str] = []
+    for day, rows in sorted(by_day.items()):
+        data = {}
+        for col in columns:
+            if col in INTEGER_COLUMNS:
+                data[col] = [_to_int(r.get(col)) for r in rows]
+            elif col == "source":
+                data[col] = [_to_text(r.get(col)) or source or None for r in rows]
+            else:
+                data[col] = [_to_text(r.get(col)) for r in rows]
+        table = pa.Table.from_pydict(data, schema=schema)
+
+        part_dir = os.path.join(dataset_dir, f"{PARTITION_COLUMN}={day}")
+        os.makedirs(part_dir, exist_ok=True)
+        path = os.path.join(part_dir, f"part-{batch_id}.parquet")
+        pq.write_table(table, path, compression="zstd", use_dictionary=DICTIONARY_COLUMNS)
+        written.append(path)
+
+    logging.info(f"Appended {len(records)} records to Parquet dataset {dataset_dir} ({len(written)} file(s))")
+    return written
+
+
+def load_groups(dataset_dir: str = "output/parquet", columns: Optional[List[str]] = None,
+                start_date: Optional[str] = None, end_date: Optional[str] = None):
+    """
+    Load group records from the Parquet dataset into a pandas DataFrame.
+
+    Only the requested columns are read, and partitions outside the
+    [start_date, end_date] range (YYYY-MM-DD, inclusive) are never opened.
+
+    Args:
+        dataset_dir: Root directory of the partitioned dataset
+        columns: Columns to read (None = all); 'extraction_day' is also available
+        start_date: First extraction day to include
+        end_date: Last extraction day to include
+
+    Returns:
+        pandas.DataFrame
+    """
+    import pyarrow as pa  # type: ignore
+    import pyarrow.dataset as ds  # type: ignore
+
+    partitioning = ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.string())]), flavor="hive")
+    dataset = ds.dataset(dataset_dir, format="parquet", partitioning=partitioning)
+
+    # Part files written at different times may carry different extra columns
+    schemas = [fragment.physical_schema for fragment in dataset.get_fragments()]
+    if schemas:
+        schema = pa.unify_schemas(schemas + [pa.schema([(PARTITION_COLUMN, pa.string())])])
+        dataset = ds.dataset(dataset_dir, format="parquet", partitioning=partitioning, schema=schema)
+
+    expr = None
+    if start_date:
+        expr = ds.field(PARTITION_COLUMN) >= start_date
+    if end_date:
+        cond = ds.field(PARTITION_COLUMN) <= end_date
+        expr = cond if expr is None else expr & cond
+
+    if columns:
+        columns = [c for c in columns if c in dataset.schema.names]
+    table = dataset.to_table(columns=columns, filter=expr)
+    return table.to_pandas()
+
+
+__all__ = [
+    "write_parquet_batch",
+    "load_groups",
+]
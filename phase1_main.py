@@ -24,6 +24,8 @@ from datetime import datetime  # Generating timestamps
 # Local module imports - Phase 1 core functionality
 from login import get_driver_with_config, login_to_facebook, load_credentials_from_config, validate_credentials
 from scraper import scrape_group_data, scrape_multiple_groups, validate_group_url
+from parquet_store import write_parquet_batch
+from results_db import open_results_db
 
 
 def save_to_raw_csv(data, filename='scraped_data_raw.csv'):
@@ -126,6 +128,10 @@ def run_phase1_extraction(group_urls=None):
     # Get headless mode setting
     headless = config.getboolean('selenium', 'headless_mode', fallback=True)
     
+    # Output format: csv, parquet or both
+    output_format = config.get('scraping', 'output_format', fallback='csv').strip().lower()
+    parquet_dir = config.get('scraping', 'parquet_dir', fallback='output/parquet')
+    
     if not headless:
         print("\n🔍 Running in VISIBLE mode for debugging")
         print("   Set headless_mode=true in config.ini for headless operation")
@@ -191,23 +197,60 @@ def run_phase1_extraction(group_urls=None):
         login_func = login_to_facebook if login_success else None
         credentials = (email, password) if email and password else None
         
+        # A dead browser session gets a new driver (this function keeps closing it at the end)
+        def _rebuild_driver():
+            nonlocal driver
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            new_driver = get_driver_with_config()
+            if not new_driver:
+                raise RuntimeError("Could not initialize WebDriver")
+            driver = new_driver
+            return driver
+        
         group_data = scrape_multiple_groups(driver, valid_urls, delay_between=3, 
-                                          login_func=login_func, credentials=credentials)
+                                          login_func=login_func, credentials=credentials,
+                                          rebuild_driver=_rebuild_driver)
         
         if not group_data:
             print("❌ No data extracted")
             return False
         
+        # Label the rows so a later database import of the CSV keeps the same snapshot source
+        for record in group_data:
+            record['source'] = 'phase1'
+        
         # Step 5: Save to raw CSV
         print("\n" + "-" * 60)
         print("STEP 5: Saving to raw CSV file")
         print("-" * 60)
         
-        filepath = save_to_raw_csv(group_data, filename='scraped_data_raw.csv')
+        filepath = None
+        if output_format in ('csv', 'both'):
+            filepath = save_to_raw_csv(group_data, filename='scraped_data_raw.csv')
+            
+            if not filepath:
+                print("❌ Failed to save data to CSV")
+                return False
         
-        if not filepath:
-            print("❌ Failed to save data to CSV")
-            return False
+        if output_format in ('parquet', 'both'):
+            parquet_files = write_parquet_batch(group_data, parquet_dir, source='phase1')
+            if parquet_files:
+                print(f"✅ Data appended to Parquet dataset: {parquet_dir}")
+                filepath = filepath or parquet_dir
+            elif not filepath:
+                print("❌ Failed to save data to Parquet (is pyarrow installed?)")
+                return False
+        
+        # Write through to the shared results database
+        db = open_results_db(config)
+        if db is not None:
+            with db:
+                written = db.upsert_records(group_data, source='phase1')
+            if written:
+                print(f"✅ {written} groups written to results database: {db.path}")
         
         # Phase 1 Complete Summary
         print("\n" + "=" * 60)
@@ -232,7 +275,10 @@ def run_phase1_extraction(group_urls=None):
     finally:
         # Cleanup
         print("\n🧹 Cleaning up...")
-        driver.quit()
+        try:
+            driver.quit()
+        except Exception:
+            pass  # Already closed after a failed driver rebuild
         print("✅ WebDriver closed")
 
 
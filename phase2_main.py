@@ -11,13 +11,23 @@ This is the main orchestrator for Phase 2 functionality. It implements:
 
 Key Features:
 - Searches Facebook for groups based on generated keywords
+- Spends a daily search budget on the keywords with the best expected new-group yield
+- Reuses cached search results for recently searched keywords (no browser search)
+- Skips enrichment of results whose card title does not match the keyword's team
+- Takes name, privacy and member count from the search result card and only
+  visits the group pages still needed for the remaining fields
 - Collects unique public group URLs
 - Optional data enrichment for member counts and descriptions
-- Session management with periodic re-login
+- Passive session monitoring (auth cookies, login redirects) with re-login only
+  when the session is really gone; failed searches are retried per error class
+  and only a dead browser session rebuilds the driver
+- Stops enrichment when most recent groups come back without data (layout drift)
 - Saves results to output/search_results_TIMESTAMP.csv
+- Writes keyword hits and group records through to the results database
 
 Usage:
     python phase2_main.py
+    python phase2_main.py --refresh    # ignore cached search results
     
 The script processes keywords from Resources/All Teams by Sport.xlsx
 and saves results with timestamps.
@@ -39,7 +49,37 @@ from typing import List, Set  # Type hints for better code documentation
 from login import get_driver_with_config, login_to_facebook, load_credentials_from_config, validate_credentials
 from scraper import scrape_group_data  # Data enrichment functionality
 from search import find_group_urls  # Facebook group search
-from input_processor import generate_keywords_from_resources  # Keyword generation
+from input_processor import generate_keyword_specs, load_keyword_templates  # Keyword generation
+from seen_set import GroupSeenSet, BloomFilter  # Compact run-level URL dedup
+from group_record import GroupRecord  # Compact dict-compatible record type
+from keyword_scheduler import KeywordScheduler  # Yield-based keyword ordering
+from search_cache import SearchCache  # Keyword search result cache
+from relevance import RelevanceScorer  # Pre-enrichment relevance triage
+from parquet_store import write_parquet_batch  # Columnar output backend
+from results_db import open_results_db  # Shared SQLite results database
+from strategy_stats import get_strategy_stats  # Selector/pattern hit rates
+from circuit_breaker import CircuitBreaker, LayoutDriftError  # Enrichment layout drift detection
+from retry_policy import get_retry_policy, classify, ERROR_CLASSES, DEAD_SESSION, RESTRICTED_PAGE  # Classified retries
+from session_health import SessionMonitor  # Passive login state checks
+
+
+# Fields copied from scrape_group_data() into search records during enrichment
+ENRICHMENT_FIELDS = (
+    "group_name",
+    "member_count",
+    "description",
+    "admin_names",
+    "admin_profile_urls",
+    "member_names",
+    "member_profile_urls",
+)
+
+# Fields read from the search result card (member count is approximate, e.g. "13.6K")
+CARD_FIELDS = (
+    "group_name",
+    "privacy",
+    "member_count",
+)
 
 
 def _setup_logging(log_level: str, log_file: str) -> None:
@@ -62,7 +102,26 @@ def _load_search_config(cfg: ConfigParser):
     max_scrolls = int(cfg.get("search", "max_scrolls_per_search", fallback="8"))
     max_results = int(cfg.get("search", "max_results_per_keyword", fallback="100"))
     enable_enrichment = cfg.getboolean("search", "enable_enrichment", fallback=True)
-    keepalive_interval = int(cfg.get("search", "keepalive_interval", fallback="0"))
+    seen_bloom_file = cfg.get("search", "seen_bloom_file", fallback="").strip()
+    seen_bloom_capacity = int(cfg.get("search", "seen_bloom_capacity", fallback="1000000"))
+    cache_file = cfg.get("search", "cache_file", fallback="output/search_cache.json").strip()
+    cache_ttl_hours = float(cfg.get("search", "cache_ttl_hours", fallback="168"))
+    relevance_threshold = float(cfg.get("search", "relevance_threshold", fallback="0"))
+
+    def _list(value: str) -> List[str]:
+        return [v.strip() for v in (value or "").split(",") if v.strip()]
+
+    enrich_fields = [f for f in _list(cfg.get("search", "enrich_fields", fallback=""))
+                     if f in ENRICHMENT_FIELDS] or list(ENRICHMENT_FIELDS)
+
+    keyword_sheets = _list(cfg.get("keywords", "sheets", fallback=""))
+    keyword_columns = _list(cfg.get("keywords", "columns", fallback="A")) or ["A"]
+    keyword_header_rows = int(cfg.get("keywords", "header_rows", fallback="1"))
+    keyword_cache_file = cfg.get("keywords", "cache_file", fallback="output/keyword_cache.json").strip()
+    keyword_workers = int(cfg.get("keywords", "workers", fallback="0"))
+
+    output_format = cfg.get("scraping", "output_format", fallback="csv").strip().lower()
+    parquet_dir = cfg.get("scraping", "parquet_dir", fallback="output/parquet")
 
     log_level = cfg.get("logging", "log_level", fallback="INFO")
     log_file = cfg.get("logging", "log_file", fallback="extraction.log")
@@ -74,13 +133,26 @@ def _load_search_config(cfg: ConfigParser):
         "max_scrolls": max_scrolls,
         "max_results": max_results,
         "enable_enrichment": enable_enrichment,
-        "keepalive_interval": keepalive_interval,
+        "seen_bloom_file": seen_bloom_file,
+        "seen_bloom_capacity": seen_bloom_capacity,
+        "cache_file": cache_file,
+        "cache_ttl_hours": cache_ttl_hours,
+        "relevance_threshold": relevance_threshold,
+        "enrich_fields": enrich_fields,
+        "keyword_sheets": keyword_sheets,
+        "keyword_columns": keyword_columns,
+        "keyword_header_rows": keyword_header_rows,
+        "keyword_cache_file": keyword_cache_file,
+        "keyword_workers": keyword_workers,
+        "keyword_templates": load_keyword_templates(cfg),
+        "output_format": output_format,
+        "parquet_dir": parquet_dir,
         "log_level": log_level,
         "log_file": log_file,
     }
 
 
-def _save_search_results(records: List[dict], output_dir: str = "output") -> str:
+def _save_search_results(records: List[GroupRecord], output_dir: str = "output") -> str:
     os.makedirs(output_dir, exist_ok=True)
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
     path = os.path.join(output_dir, f"search_results_{ts}.csv")
@@ -93,10 +165,10 @@ def _save_search_results(records: List[dict], output_dir: str = "output") -> str
                 extra_keys.add(k)
     fieldnames = base_fields + sorted(extra_keys)
     with open(path, "w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
         for r in records:
-            writer.writerow(r)
+            writer.writerow(r.to_row(fieldnames))
     logging.info(f"Saved search results to: {path}")
     return path
 
@@ -130,7 +202,7 @@ def _append_urls(urls: List[str], dest: str = "extracted_urls.txt") -> None:
     logging.info(f"Appended {len(to_add)} new URLs to {dest}")
 
 
-def run_phase2_search() -> bool:
+def run_phase2_search(refresh: bool = False) -> bool:
     print("\n" + "=" * 60)
     print("PHASE 2: Search, Robustness, and Rate Limiting")
     print("Facebook Group Data Extractor")
@@ -145,8 +217,12 @@ def run_phase2_search() -> bool:
 
     # Setup driver (reuses Phase 1 utilities)
     driver = None
+    db = None
+    scheduler = None
+    cache = None
     try:
         driver = get_driver_with_config()
+        db = open_results_db(cfg)
 
         # Optional login (recommended for better search results)
         email, password = load_credentials_from_config()
@@ -161,14 +237,75 @@ def run_phase2_search() -> bool:
         else:
             logging.info("No credentials - continuing with public-only search results")
 
-        # Generate keywords
-        keywords = generate_keywords_from_resources(resources_dir="Resources")
-        # Limit to first 5 keywords to get 10-20 groups (approx 2-7 groups per keyword)
-        keywords = keywords[:5]
-        logging.info(f"Using {len(keywords)} keywords (limited for quick test)")
+        # Login state is watched passively (cookies, redirects) instead of homepage visits
+        session = SessionMonitor(expect_login=login_success)
+
+        # Recovery used by the retry policy: a new driver only for a dead session,
+        # a fresh login for a login wall
+        policy = get_retry_policy()
+
+        def _relogin(error: BaseException) -> None:
+            nonlocal login_success
+            if not (email and password and validate_credentials(email, password)):
+                raise error
+            logging.info("Login wall hit; attempting re-login...")
+            login_success = login_to_facebook(driver, email, password)
+            session.relogged_in(login_success)
+            if not login_success:
+                raise error
+
+        def _rebuild_driver(error: BaseException) -> None:
+            nonlocal driver
+            logging.warning("Browser session is dead; starting a new driver")
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            driver = get_driver_with_config()
+            if session.expect_login:
+                logging.info("Attempting re-login with fresh driver...")
+                session.relogged_in(login_to_facebook(driver, email, password))
 
-        all_urls: Set[str] = set()
-        records: List[dict] = []
+        # Generate keywords
+        keywords = generate_keyword_specs(
+            resources_dir="Resources",
+            sheets=search_cfg["keyword_sheets"],
+            columns=search_cfg["keyword_columns"],
+            header_rows=search_cfg["keyword_header_rows"],
+            cache_file=search_cfg["keyword_cache_file"] or None,
+            workers=search_cfg["keyword_workers"],
+            templates=search_cfg["keyword_templates"],
+        )
+        # Results whose card title matches the team poorly are not enriched
+        scorer = None
+        if search_cfg["relevance_threshold"] > 0:
+            scorer = RelevanceScorer(team for team, _ in keywords.teams)
+        skipped_irrelevant = 0
+        # Groups whose card already provided every wanted field
+        enrichment_avoided = 0
+        # Enrichment is switched off for the rest of the run if it keeps returning defaults
+        breaker = CircuitBreaker.from_config(cfg)
+        enrichment_stopped = False
+        # Enrichments cut short by the per-group time budgets
+        enrichment_timeouts = 0
+
+        # Spend today's search budget on the keywords with the best expected new yield
+        # (keywords with cached results are replayed without using up the budget)
+        cache = SearchCache(search_cfg["cache_file"], ttl_hours=search_cfg["cache_ttl_hours"], refresh=refresh)
+        scheduler = KeywordScheduler.from_config(cfg)
+        total_keywords = len(keywords)
+        keywords = scheduler.plan(keywords, free=lambda spec: cache.is_fresh(spec.keyword))
+        logging.info(f"Using {len(keywords)} of {total_keywords} keywords "
+                     f"(daily budget {scheduler.daily_budget}, {scheduler.searches_today()} used today)")
+
+        # Compact seen-set; the optional Bloom filter remembers groups across runs
+        bloom = None
+        if search_cfg["seen_bloom_file"]:
+            bloom = BloomFilter.open(search_cfg["seen_bloom_file"], capacity=search_cfg["seen_bloom_capacity"])
+        all_urls = GroupSeenSet(bloom=bloom)
+        found_urls: List[str] = []
+        previously_seen = 0
+        records: List[GroupRecord] = []
         ts_now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         # Safer defaults if config is too aggressive
@@ -181,124 +318,194 @@ def run_phase2_search() -> bool:
         batch_size = 20
         cooldown_between_batches = 60  # seconds
 
-        for idx, kw in enumerate(keywords, 1):
-            print(f"[{idx}/{len(keywords)}] Searching: {kw}")
+        live_searches = 0
 
-            # Check session every 5 keywords; try re-login if logged out
-            try:
-                if idx % 5 == 1:
-                    driver.get("https://www.facebook.com")
-                    time.sleep(2)
-                    body_txt = (driver.find_element_by_tag_name("body").text or "").lower() if hasattr(driver, 'find_element_by_tag_name') else driver.find_element("tag name", "body").text.lower()
-                    if any(x in body_txt for x in ["log in", "sign up", "create account"]):
-                        logging.info("Session likely logged out; attempting re-login...")
-                        if email and password and validate_credentials(email, password):
-                            login_success = login_to_facebook(driver, email, password)
-                            logging.info("Re-login %s", "successful" if login_success else "failed")
-            except Exception as e:
-                # Session might be dead - try to recover
-                logging.warning(f"Session check failed: {e}")
-                try:
-                    driver.quit()
-                except:
-                    pass
-                # Recreate driver
-                driver = get_driver_with_config()
-                if email and password and validate_credentials(email, password):
-                    logging.info("Attempting re-login with fresh driver...")
-                    login_to_facebook(driver, email, password)
-
-            urls = []
+        def _cooldown_if_due():
+            # Every live search counts, including failed ones (they still hit the site)
+            if live_searches % batch_size == 0:
+                logging.info("Cooling down for %s seconds to avoid detection...", cooldown_between_batches)
+                time.sleep(cooldown_between_batches)
+
+        for idx, spec in enumerate(keywords, 1):
+            kw = spec.keyword
+            cached_cards = cache.get(kw)
+            if cached_cards is not None:
+                print(f"[{idx}/{len(keywords)}] Cached: {kw} ({len(cached_cards)} URLs)")
+            else:
+                print(f"[{idx}/{len(keywords)}] Searching: {kw}")
+
+            # Passive session check before each live search (auth cookies and the URL the
+            # last page ended on - no extra page load); re-login only on evidence of a lost session
+            if cached_cards is None and not session.healthy(driver):
+                if session.error is not None and classify(session.error) == DEAD_SESSION:
+                    # The browser itself is gone: only a new driver (which logs in again) helps
+                    logging.warning(f"Browser session is dead ({session.reason})")
+                    try:
+                        _rebuild_driver(session.error)
+                    except Exception as e:
+                        logging.error(f"Could not start a new driver: {e}")
+                else:
+                    logging.info(f"Session lost ({session.reason}); attempting re-login...")
+                    try:
+                        login_success = login_to_facebook(driver, email, password)
+                        logging.info("Re-login %s", "successful" if login_success else "failed")
+                        session.relogged_in(login_success)
+                    except Exception as e:
+                        # Only a dead session needs a new driver (which logs in again)
+                        logging.warning(f"Re-login failed ({classify(e)}): {e}")
+                        if classify(e) == DEAD_SESSION:
+                            _rebuild_driver(e)
+                        else:
+                            session.relogged_in(False)
+
+            cards = []
             try:
-                urls = find_group_urls(
-                    driver,
-                    kw,
-                    max_scrolls=search_cfg["max_scrolls"],
-                    delay_min=search_cfg["delay_min"],
-                    delay_max=search_cfg["delay_max"],
-                    timeout=search_cfg["timeout"],
-                )
+                if cached_cards is not None:
+                    cards = cached_cards
+                else:
+                    live_searches += 1
+                    # The lambda reads `driver` at call time, so a rebuilt driver is used on retry
+                    cards = policy.call(
+                        lambda: find_group_urls(
+                            driver,
+                            kw,
+                            max_scrolls=search_cfg["max_scrolls"],
+                            delay_min=search_cfg["delay_min"],
+                            delay_max=search_cfg["delay_max"],
+                            timeout=search_cfg["timeout"],
+                            return_cards=True,
+                        ),
+                        label=f"search '{kw}'",
+                        recover={DEAD_SESSION: _rebuild_driver, RESTRICTED_PAGE: _relogin},
+                        # find_group_urls already retried the other classes
+                        no_retry=[c for c in ERROR_CLASSES if c not in (DEAD_SESSION, RESTRICTED_PAGE)],
+                    )
+                    cache.put(kw, cards)
             except Exception as e:
-                # Session died during search - recover
-                logging.error(f"Search failed for '{kw}': {e}")
-                try:
-                    driver.quit()
-                except:
-                    pass
-                # Recreate driver
-                driver = get_driver_with_config()
-                if email and password and validate_credentials(email, password):
-                    logging.info("Attempting re-login with fresh driver...")
-                    login_to_facebook(driver, email, password)
+                # Retries for this error class are used up - move on to the next keyword
+                # (a failed search is neither cached nor recorded as a zero-yield search,
+                # but it still uses up today's budget and counts toward the cooldown)
+                logging.error(f"Search failed for '{kw}' ({classify(e)}): {e}")
+                if cached_cards is None:
+                    scheduler.record_failed(spec)
+                    _cooldown_if_due()
                 continue
 
-            if search_cfg["max_results"] and len(urls) > search_cfg["max_results"]:
-                urls = urls[: search_cfg["max_results"]]
+            if search_cfg["max_results"] and len(cards) > search_cfg["max_results"]:
+                cards = cards[: search_cfg["max_results"]]
+            urls = [card["group_url"] for card in cards]
+
+            # Every keyword->group hit is recorded, including groups already seen this run
+            # (cached hits were recorded when the search actually ran)
+            if db is not None and urls and cached_cards is None:
+                db.record_keyword_hits(kw, urls, captured_at=ts_now, team=spec.team, template=spec.template)
 
-            for u in urls:
+            keyword_start = len(records)
+            new_for_keyword = 0
+            for card in cards:
+                u = card["group_url"]
                 if u in all_urls:
                     continue
+                if all_urls.seen_in_earlier_run(u):
+                    previously_seen += 1
+                else:
+                    new_for_keyword += 1
                 all_urls.add(u)
-
-                record = {
-                    "keyword": kw,
-                    "group_url": u,
-                    "captured_at": ts_now,
-                }
-
-                # Enrich with group details using existing scraper (Phase 1 logic)
-                if search_cfg.get("enable_enrichment", True):
-                    try:
-                        details = scrape_group_data(driver, u) or {}
-                        # Map relevant fields into record
-                        if details:
-                            if details.get("group_name"):
-                                record["group_name"] = details.get("group_name")
-                            if details.get("member_count") is not None:
-                                record["member_count"] = details.get("member_count")
-                            if details.get("description"):
-                                record["description"] = details.get("description")
-                            if details.get("admin_names"):
-                                record["admin_names"] = details.get("admin_names")
-                            if details.get("admin_profile_urls"):
-                                record["admin_profile_urls"] = details.get("admin_profile_urls")
-                            if details.get("member_names"):
-                                record["member_names"] = details.get("member_names")
-                            if details.get("member_profile_urls"):
-                                record["member_profile_urls"] = details.get("member_profile_urls")
-                    except Exception as e:
-                        logging.warning(f"Could not enrich details for {u}: {e}")
+                found_urls.append(u)
+
+                record = GroupRecord(keyword=kw, group_url=u, captured_at=ts_now, source="phase2")
+                record.fill_from(card, CARD_FIELDS)
+
+                relevant = True
+                if scorer is not None:
+                    score = scorer.score(card.get("group_name", ""), kw, spec.team)
+                    if score is not None:
+                        record["relevance"] = round(score)
+                        relevant = score >= search_cfg["relevance_threshold"]
+                        if not relevant:
+                            skipped_irrelevant += 1
+                            logging.info(f"Not enriching {u}: relevance {score:.0f} for '{card.get('group_name', '')}'")
+
+                # Enrich the fields the card could not provide using existing scraper (Phase 1 logic)
+                missing = [f for f in search_cfg["enrich_fields"] if f not in record]
+                if relevant and search_cfg.get("enable_enrichment", True) and not enrichment_stopped:
+                    if not missing:
+                        enrichment_avoided += 1
+                    else:
+                        details = None
+                        session_died = False
+                        try:
+                            details = scrape_group_data(driver, u, fields=missing)
+                            # Map relevant fields into record
+                            if details:
+                                record.fill_from(details, missing)
+                                if details.get("restricted"):
+                                    record["restricted"] = True
+                                if details.get("timed_out_steps"):
+                                    record["timed_out_steps"] = details["timed_out_steps"]
+                                    enrichment_timeouts += 1
+                        except Exception as e:
+                            # Only a dead browser session is raised; it needs a new driver
+                            logging.warning(f"Could not enrich details for {u} ({classify(e)}): {e}")
+                            session_died = classify(e) == DEAD_SESSION
+                            if session_died:
+                                try:
+                                    _rebuild_driver(e)
+                                except Exception as rebuild_error:
+                                    logging.error(f"Could not start a new driver: {rebuild_error}")
+                        # A dead browser says nothing about the page layout
+                        if not session_died:
+                            try:
+                                breaker.observe(details, fields=missing)
+                            except LayoutDriftError as e:
+                                logging.error(f"Stopping enrichment for the rest of the run: {e}")
+                                enrichment_stopped = True
 
                 records.append(record)
 
-            # Cooldown between batches
-            if idx % batch_size == 0:
-                keepalive = search_cfg.get("keepalive_interval", 0)
-                if keepalive > 0:
-                    logging.info("Cooling down for %s seconds (with keepalive every %ss)...", cooldown_between_batches, keepalive)
-                    elapsed = 0
-                    while elapsed < cooldown_between_batches:
-                        time.sleep(min(keepalive, cooldown_between_batches - elapsed))
-                        elapsed += keepalive
-                        if elapsed < cooldown_between_batches:
-                            try:
-                                driver.get("https://www.facebook.com")
-                                time.sleep(1)
-                            except:
-                                pass
-                else:
-                    logging.info("Cooling down for %s seconds to avoid detection...", cooldown_between_batches)
-                    time.sleep(cooldown_between_batches)
+            # One batched upsert per keyword
+            if db is not None:
+                db.upsert_records(records[keyword_start:], source="phase2", with_hits=False)
+            if cached_cards is not None:
+                continue
+            scheduler.record(spec, found=len(urls), new=new_for_keyword)
+
+            # Cooldown between batches of searches
+            _cooldown_if_due()
 
         # Save and append
-        _save_search_results(records, output_dir="output")
-        _append_urls(sorted(all_urls), dest="extracted_urls.txt")
+        if search_cfg["output_format"] in ("csv", "both"):
+            _save_search_results(records, output_dir="output")
+        if search_cfg["output_format"] in ("parquet", "both"):
+            write_parquet_batch(records, search_cfg["parquet_dir"], source="phase2")
+        _append_urls(sorted(found_urls), dest="extracted_urls.txt")
+        if bloom is not None:
+            try:
+                bloom.save(search_cfg["seen_bloom_file"])
+            except Exception as e:
+                logging.warning(f"Could not save seen-groups filter: {e}")
 
         print("\n" + "=" * 60)
         print("✅ PHASE 2 SEARCH COMPLETE!")
         print("=" * 60)
-        print(f"🔎 Keywords processed: {len(keywords)}")
+        print(f"🔎 Keywords processed: {len(keywords)} (of {total_keywords})")
+        print(f"💾 Search cache: {cache.hits}/{cache.lookups} hits ({cache.hit_rate:.0%}), "
+              f"{cache.hits} browser searches avoided")
         print(f"🔗 Unique group URLs found: {len(all_urls)}")
+        if scorer is not None:
+            print(f"🎯 Not enriched (low relevance): {skipped_irrelevant}")
+        if search_cfg.get("enable_enrichment", True):
+            print(f"🪪 Enrichment visits avoided (card had every field): {enrichment_avoided}")
+        if enrichment_timeouts:
+            print(f"⏱️  Enrichments cut short by time budgets: {enrichment_timeouts}")
+        for line in policy.summary_lines():
+            print(f"🔁 Retries - {line}")
+        if session.expect_login or session.relogins:
+            print(f"🩺 Session: {session.summary()}")
+        if enrichment_stopped:
+            print("🛑 Enrichment stopped early: extraction kept failing (layout drift?), see extraction.log")
+        if bloom is not None:
+            print(f"🆕 Not seen in earlier runs: {len(all_urls) - previously_seen}")
         return True
 
     except Exception as e:
@@ -306,6 +513,13 @@ def run_phase2_search() -> bool:
         print(f"\n❌ Error during Phase 2: {e}")
         return False
     finally:
+        if scheduler is not None:
+            scheduler.save()
+        if cache is not None:
+            cache.save()
+        get_strategy_stats().save()
+        if db is not None:
+            db.close()
         if driver is not None:
             print("\n🧹 Cleaning up...")
             try:
@@ -316,6 +530,13 @@ def run_phase2_search() -> bool:
 
 
 if __name__ == "__main__":
-    run_phase2_search()
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Phase 2: search Facebook groups by keyword')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Ignore cached search results and search every keyword again')
+    args = parser.parse_args()
+
+    run_phase2_search(refresh=args.refresh)
 
 
@@ -0,0 +1,229 @@
+"""
+Query Extracted Group Data
+Facebook Group Data Extractor - Indexed queries over the results database
+
+Purpose:
+- Answer questions like "all public groups with more than 5k members found via
+  any Cowboys keyword in the last 30 days" without loading CSVs into pandas
+- Stream matching rows out as CSV or JSONL
+
+Key Features:
+- Filters: member count range, privacy, keyword / team, date range, text match
+- Every filter maps onto an index of results_db.py (member_count, privacy,
+  keyword_hits, extraction date); text match uses FTS5 when available
+- Latest group state by default, full snapshot history with --history
+- Rows are written as they are read, so memory stays flat on large results
+
+Usage:
+    python query.py --privacy public --min-members 5000 --keyword cowboys --days 30
+    python query.py --team "Dallas Cowboys" --format jsonl --output output/cowboys.jsonl
+    python query.py --text "season tickets" --sort members --limit 50
+    python query.py --history --since 2025-10-01 --until 2025-10-31
+"""
+
+from __future__ import annotations
+
+# Standard library imports
+import os          # File existence checks
+import sys         # stdout / stderr streams
+import csv         # CSV output
+import json        # JSONL output
+import argparse    # Command-line arguments
+from datetime import datetime, timedelta  # Date range handling
+from configparser import ConfigParser  # Default database path
+from typing import List, Optional, Tuple  # Type hints
+
+# Local module imports
+from results_db import ResultsDB  # Shared results database
+
+
+# Output columns per mode
+GROUP_COLUMNS = [
+    "group_url", "group_name", "member_count", "privacy", "description",
+    "admin_names", "admin_profile_urls", "member_names", "member_profile_urls",
+    "first_seen", "last_seen", "last_source",
+]
+SNAPSHOT_COLUMNS = [
+    "group_url", "extraction_date", "source", "keyword", "group_name", "member_count",
+    "privacy", "description", "admin_names", "admin_profile_urls",
+    "member_names", "member_profile_urls",
+]
+
+SORT_COLUMNS = {
+    "members": "member_count DESC",
+    "date": "{date} DESC",
+    "name": "group_name COLLATE NOCASE",
+}
+
+
+def _day_start(value: str) -> str:
+    return datetime.strptime(value, "%Y-%m-%d").strftime("%Y-%m-%d 00:00:00")
+
+
+def _day_after(value: str) -> str:
+    return (datetime.strptime(value, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d 00:00:00")
+
+
+def _fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query: every word must match (prefix match on the last)."""
+    words = [w.replace('"', '""') for w in text.split()]
+    if not words:
+        return '""'
+    terms = [f'"{w}"' for w in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def build_query(args, use_fts: bool) -> Tuple[str, List]:
+    """Build the SQL statement and parameters for the parsed arguments."""
+    history = args.history
+    table = "group_snapshots AS g" if history else "groups AS g"
+    date_col = "g.extraction_date" if history else "g.last_seen"
+    columns = SNAPSHOT_COLUMNS if history else GROUP_COLUMNS
+
+    joins: List[str] = []
+    where: List[str] = []
+    params: List = []
+
+    if args.min_members is not None:
+        where.append("g.member_count >= ?")
+        params.append(args.min_members)
+    if args.max_members is not None:
+        where.append("g.member_count <= ?")
+        params.append(args.max_members)
+    if args.privacy:
+        where.append("g.privacy = ?")
+        params.append(args.privacy.strip().capitalize())
+
+    # Date range: with a keyword/team filter it applies to when the hit was captured
+    keyword_filter = bool(args.keyword or args.team)
+    if keyword_filter:
+        hit_where = []
+        if args.keyword:
+            hit_where.append("k.keyword LIKE ?")
+            params.append(f"%{args.keyword}%")
+        if args.team:
+            hit_where.append("k.team = ? COLLATE NOCASE")
+            params.append(args.team)
+        if args.since and not history:
+            hit_where.append("h.last_captured >= ?")
+            params.append(args.since)
+        if args.until and not history:
+            hit_where.append("h.first_captured < ?")
+            params.append(args.until)
+        where.append(
+            "g.group_key IN (SELECT h.group_key FROM keyword_hits AS h "
+            "JOIN keywords AS k ON k.id = h.keyword_id WHERE " + " AND ".join(hit_where) + ")"
+        )
+    if args.since and (history or not keyword_filter):
+        where.append(f"{date_col} >= ?")
+        params.append(args.since)
+    if args.until and (history or not keyword_filter):
+        where.append(f"{date_col} < ?")
+        params.append(args.until)
+
+    if args.text:
+        if use_fts and not history:
+            joins.append("JOIN groups_fts AS f ON f.rowid = g.rowid")
+            where.append("groups_fts MATCH ?")
+            params.append(_fts_query(args.text))
+        else:
+            where.append("(g.group_name LIKE ? OR g.description LIKE ?)")
+            params.extend([f"%{args.text}%"] * 2)
+
+    sql = f"SELECT {', '.join('g.' + c for c in columns)} FROM {table}"
+    if joins:
+        sql += " " + " ".join(joins)
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    if args.sort:
+        sql += " ORDER BY " + "g." + SORT_COLUMNS[args.sort].format(date=date_col.split(".", 1)[1])
+    if args.limit:
+        sql += " LIMIT ?"
+        params.append(args.limit)
+    return sql, params
+
+
+def stream_results(cursor, columns: List[str], fmt: str, out) -> int:
+    """Write rows from the cursor to out as CSV or JSONL. Returns the row count."""
+    count = 0
+    if fmt == "jsonl":
+        for row in cursor:
+            out.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n")
+            count += 1
+    else:
+        writer = csv.writer(out)
+        writer.writerow(columns)
+        for row in cursor:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def _default_db_path() -> str:
+    cfg = ConfigParser()
+    cfg.read("config.ini")
+    return cfg.get("database", "path", fallback="output/results.db")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function to handle command-line arguments"""
+    parser = argparse.ArgumentParser(
+        description='Query extracted group data in the results database',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python query.py --privacy public --min-members 5000 --keyword cowboys --days 30
+  python query.py --text "season tickets" --format jsonl --output output/tickets.jsonl
+  python query.py --history --since 2025-10-01 --until 2025-10-31
+        """
+    )
+    parser.add_argument('--db', default=None, help='Results database (default: [database] path in config.ini)')
+    parser.add_argument('--min-members', type=int, default=None, help='Minimum member count')
+    parser.add_argument('--max-members', type=int, default=None, help='Maximum member count')
+    parser.add_argument('--privacy', choices=['public', 'private'], type=str.lower, default=None, help='Group privacy')
+    parser.add_argument('--keyword', default=None, help='Found via a keyword containing this text')
+    parser.add_argument('--team', default=None, help='Found via a keyword generated for this team')
+    parser.add_argument('--since', default=None, metavar='YYYY-MM-DD', help='First day to include')
+    parser.add_argument('--until', default=None, metavar='YYYY-MM-DD', help='Last day to include')
+    parser.add_argument('--days', type=int, default=None, help='Only the last N days (overrides --since)')
+    parser.add_argument('--text', default=None, help='Match words in group name or description')
+    parser.add_argument('--no-fts', action='store_true', help='Use LIKE matching even if FTS5 is available')
+    parser.add_argument('--history', action='store_true', help='Query every snapshot instead of the latest group state')
+    parser.add_argument('--sort', choices=sorted(SORT_COLUMNS), default=None, help='Sort order (default: unsorted, fastest)')
+    parser.add_argument('--limit', type=int, default=None, help='Maximum number of rows')
+    parser.add_argument('--format', choices=['csv', 'jsonl'], default='csv', help='Output format (default: csv)')
+    parser.add_argument('--output', default=None, help='Output file (default: stdout)')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.days is not None:
+            args.since = (datetime.now() - timedelta(days=args.days)).strftime("%Y-%m-%d")
+        args.since = _day_start(args.since) if args.since else None
+        args.until = _day_after(args.until) if args.until else None
+    except ValueError as e:
+        parser.error(f"Invalid date: {e}")
+
+    db_path = args.db or _default_db_path()
+    if not os.path.exists(db_path):
+        print(f"❌ Results database not found: {db_path}", file=sys.stderr)
+        return 1
+
+    with ResultsDB(db_path) as db:
+        use_fts = bool(args.text) and not args.no_fts and not args.history and db.ensure_fts()
+        sql, params = build_query(args, use_fts)
+        columns = SNAPSHOT_COLUMNS if args.history else GROUP_COLUMNS
+        cursor = db.conn.execute(sql, params)
+
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8', newline='') as f:
+                count = stream_results(cursor, columns, args.format, f)
+            print(f"✅ {count} row(s) written to {args.output}", file=sys.stderr)
+        else:
+            count = stream_results(cursor, columns, args.format, sys.stdout)
+            print(f"✅ {count} row(s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
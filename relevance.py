@@ -0,0 +1,146 @@
+"""
+Search Result Relevance Triage
+Facebook Group Data Extractor - Phase 2 pre-enrichment filter
+
+Purpose:
+- Score each search result by how well its card title matches the team the
+  keyword was generated for
+- Let phase 2 skip enrichment (3+ page visits) for groups that only matched
+  the search loosely
+
+Key Features:
+- Fuzzy matching with rapidfuzz when installed, difflib fallback otherwise
+- Team match: full team name, or its last word ("Cowboys") at a small discount
+- Competing teams: a title that clearly names another team from the keyword
+  source (e.g. "Dallas Mavericks" for a Cowboys search) is scored down
+- Inverted token index over the team list, so only teams sharing a word with
+  the title are compared
+- Results without a title are never skipped (score None)
+
+Usage:
+    scorer = RelevanceScorer(team_names)
+    score = scorer.score("Dallas Cowboys Season Tickets", "Dallas Cowboys Tickets", "Dallas Cowboys")
+    if score is not None and score < threshold:
+        ...  # skip enrichment
+"""
+
+from __future__ import annotations
+
+# Standard library imports
+import re          # Title normalization
+import difflib     # Fallback fuzzy matcher
+from typing import Dict, Iterable, List, Optional, Set  # Type hints
+
+# Local module imports
+from input_processor import normalize_keyword  # NFKC + casefold normalization
+
+# Optional fast matcher
+try:
+    from rapidfuzz import fuzz as _rf_fuzz  # type: ignore
+except ImportError:
+    _rf_fuzz = None
+
+
+# Words too common in team names or titles to select competing teams
+_STOPWORDS = frozenset({"the", "of", "and", "fc", "sc", "club", "team", "city", "new", "san", "los", "las", "st"})
+
+# Weight of a match on the team's last word alone
+NICKNAME_WEIGHT = 0.9
+
+# A competing team that scores this much higher than the searched team halves the score
+COMPETITOR_MARGIN = 15
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_NON_WORD.sub(" ", normalize_keyword(text or "")).split())
+
+
+def _partial_ratio_difflib(short: str, long: str) -> float:
+    # Best ratio of the shorter string against equally long windows of the longer one
+    matcher = difflib.SequenceMatcher(None, short, long, autojunk=False)
+    best = 0.0
+    for block in matcher.get_matching_blocks():
+        start = max(0, block.b - block.a)
+        window = long[start:start + len(short)]
+        ratio = difflib.SequenceMatcher(None, short, window, autojunk=False).ratio()
+        if ratio > best:
+            best = ratio
+            if best == 1.0:
+                break
+    return best * 100
+
+
+def partial_ratio(a: str, b: str) -> float:
+    """0-100 similarity of the shorter string to its best-matching part of the longer one."""
+    if not a or not b:
+        return 0.0
+    if _rf_fuzz is not None:
+        return float(_rf_fuzz.partial_ratio(a, b))
+    short, long = (a, b) if len(a) <= len(b) else (b, a)
+    if short in long:
+        return 100.0
+    return _partial_ratio_difflib(short, long)
+
+
+class RelevanceScorer:
+    """Scores search result titles against the team of the searched keyword."""
+
+    def __init__(self, teams: Iterable[str] = ()):
+        self.teams: List[str] = []
+        self._index: Dict[str, Set[int]] = {}
+        seen: Set[str] = set()
+        for team in teams:
+            norm = _normalize(team)
+            if not norm or norm in seen:
+                continue
+            seen.add(norm)
+            team_id = len(self.teams)
+            self.teams.append(norm)
+            for word in norm.split():
+                if len(word) >= 3 and word not in _STOPWORDS:
+                    self._index.setdefault(word, set()).add(team_id)
+
+    def _team_score(self, team: str, title: str) -> float:
+        score = partial_ratio(team, title)
+        words = team.split()
+        if score < 100 and len(words) > 1 and len(words[-1]) >= 4:
+            score = max(score, NICKNAME_WEIGHT * partial_ratio(words[-1], title))
+        return score
+
+    def score(self, title: str, keyword: str, team: str = "") -> Optional[float]:
+        """
+        Relevance of a result title for a keyword search (0-100).
+
+        Args:
+            title: Search card title / anchor text of the result
+            keyword: The search keyword
+            team: Team the keyword was generated for (falls back to the keyword)
+
+        Returns:
+            Score, or None if the title is empty (relevance unknown)
+        """
+        title = _normalize(title)
+        if not title:
+            return None
+        target = _normalize(team) or _normalize(keyword)
+        score = self._team_score(target, title)
+        if score >= 100 - COMPETITOR_MARGIN:
+            return score
+
+        # Does the title name another known team much better than the searched one?
+        candidates: Set[int] = set()
+        for word in title.split():
+            candidates |= self._index.get(word, set())
+        for team_id in candidates:
+            other = self.teams[team_id]
+            if other != target and self._team_score(other, title) >= score + COMPETITOR_MARGIN:
+                return score / 2
+        return score
+
+
+__all__ = [
+    "RelevanceScorer",
+    "partial_ratio",
+]
@@ -0,0 +1,381 @@
+"""
+Shared Results Database (SQLite)
+Facebook Group Data Extractor - One store for every phase
+
+Purpose:
+- Persist results from phase 1, phase 2, test_single_group and merge_csv in a
+  single SQLite database instead of per-script CSV flavours
+- Make "latest state of group X" a single indexed lookup, with no merge pass
+
+Tables:
+- groups:          one row per canonical group key with the latest known state
+- group_snapshots: one row per extraction of a group (history)
+- keywords:        every search keyword (with optional team/template metadata)
+- keyword_hits:    keyword -> group hits from phase 2 searches
+
+Key Features:
+- WAL journal mode so readers are never blocked by a running scraper
+- Batched upserts (executemany inside one transaction per batch)
+- Newer non-empty values win; scraper placeholders ('Unknown', 0 members,
+  'No description available') never overwrite real data
+- Indexes on canonical group key, keyword and extraction date
+
+Usage:
+    from results_db import ResultsDB
+    with ResultsDB("output/results.db") as db:
+        db.upsert_records(records, source="phase2")
+        latest = db.latest_group("https://www.facebook.com/groups/123")
+"""
+
+from __future__ import annotations
+
+# Standard library imports
+import os          # File and directory operations
+import sqlite3     # Embedded database
+import logging     # Logging write errors
+from datetime import datetime  # Default timestamps
+from configparser import ConfigParser  # Configuration file reading
+from typing import Dict, Iterable, List, Optional  # Type hints
+
+# Local module imports
+from seen_set import group_key  # Canonical group key
+
+
+# Text fields copied from records into groups/group_snapshots
+GROUP_FIELDS = [
+    "group_name",
+    "description",
+    "privacy",
+    "admin_names",
+    "admin_profile_urls",
+    "member_names",
+    "member_profile_urls",
+]
+
+# Scraper defaults that mean "not found" and must not overwrite real values
+_PLACEHOLDERS = {
+    "group_name": {"Unknown"},
+    "description": {"No description available"},
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS groups (
+    group_key TEXT PRIMARY KEY,
+    group_url TEXT NOT NULL,
+    group_name TEXT,
+    member_count INTEGER,
+    description TEXT,
+    privacy TEXT,
+    admin_names TEXT,
+    admin_profile_urls TEXT,
+    member_names TEXT,
+    member_profile_urls TEXT,
+    first_seen TEXT,
+    last_seen TEXT,
+    last_source TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_groups_last_seen ON groups(last_seen);
+CREATE INDEX IF NOT EXISTS idx_groups_member_count ON groups(member_count);
+CREATE INDEX IF NOT EXISTS idx_groups_privacy_members ON groups(privacy, member_count);
+
+CREATE TABLE IF NOT EXISTS group_snapshots (
+    id INTEGER PRIMARY KEY,
+    group_key TEXT NOT NULL,
+    group_url TEXT NOT NULL,
+    extraction_date TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT '',
+    keyword TEXT,
+    group_name TEXT,
+    member_count INTEGER,
+    description TEXT,
+    privacy TEXT,
+    admin_names TEXT,
+    admin_profile_urls TEXT,
+    member_names TEXT,
+    member_profile_urls TEXT,
+    UNIQUE (group_key, extraction_date, source)
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_date ON group_snapshots(extraction_date);
+CREATE INDEX IF NOT EXISTS idx_snapshots_keyword ON group_snapshots(keyword);
+
+CREATE TABLE IF NOT EXISTS keywords (
+    id INTEGER PRIMARY KEY,
+    keyword TEXT NOT NULL UNIQUE,
+    team TEXT,
+    template TEXT,
+    first_searched TEXT,
+    last_searched TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_keywords_team ON keywords(team);
+CREATE INDEX IF NOT EXISTS idx_keywords_template ON keywords(template);
+
+CREATE TABLE IF NOT EXISTS keyword_hits (
+    keyword_id INTEGER NOT NULL REFERENCES keywords(id),
+    group_key TEXT NOT NULL,
+    first_captured TEXT,
+    last_captured TEXT,
+    hit_count INTEGER NOT NULL DEFAULT 1,  -- distinct capture times (re-imports do not inflate it)
+    PRIMARY KEY (keyword_id, group_key)
+);
+CREATE INDEX IF NOT EXISTS idx_hits_group ON keyword_hits(group_key);
+CREATE INDEX IF NOT EXISTS idx_hits_captured ON keyword_hits(last_captured);
+"""
+
+# Newer, non-empty values replace older ones; older rows only fill gaps
+_UPSERT_GROUP = """
+INSERT INTO groups (group_key, group_url, group_name, member_count, description, privacy,
+                    admin_names, admin_profile_urls, member_names, member_profile_urls,
+                    first_seen, last_seen, last_source)
+VALUES (:group_key, :group_url, :group_name, :member_count, :description, :privacy,
+        :admin_names, :admin_profile_urls, :member_names, :member_profile_urls,
+        :seen_at, :seen_at, :source)
+ON CONFLICT(group_key) DO UPDATE SET
+{updates},
+    first_seen = MIN(groups.first_seen, excluded.first_seen),
+    last_seen = MAX(groups.last_seen, excluded.last_seen),
+    last_source = CASE WHEN excluded.last_seen >= groups.last_seen THEN excluded.last_source ELSE groups.last_source END
+""".format(updates=",\n".join(
+    f"    {col} = CASE WHEN excluded.{col} IS NOT NULL AND (groups.{col} IS NULL OR excluded.last_seen >= groups.last_seen) "
+    f"THEN excluded.{col} ELSE groups.{col} END"
+    for col in ["group_url", "member_count"] + GROUP_FIELDS
+))
+
+_INSERT_SNAPSHOT = """
+INSERT OR IGNORE INTO group_snapshots (group_key, group_url, extraction_date, source, keyword, group_name,
+                                       member_count, description, privacy, admin_names, admin_profile_urls,
+                                       member_names, member_profile_urls)
+VALUES (:group_key, :group_url, :seen_at, :source, :keyword, :group_name,
+        :member_count, :description, :privacy, :admin_names, :admin_profile_urls,
+        :member_names, :member_profile_urls)
+"""
+
+# Optional full-text index over group names and descriptions (kept in sync by triggers)
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE groups_fts USING fts5(
+    group_name, description, content='groups', content_rowid='rowid'
+);
+CREATE TRIGGER groups_fts_insert AFTER INSERT ON groups BEGIN
+    INSERT INTO groups_fts(rowid, group_name, description) VALUES (new.rowid, new.group_name, new.description);
+END;
+CREATE TRIGGER groups_fts_delete AFTER DELETE ON groups BEGIN
+    INSERT INTO groups_fts(groups_fts, rowid, group_name, description)
+    VALUES ('delete', old.rowid, old.group_name, old.description);
+END;
+CREATE TRIGGER groups_fts_update AFTER UPDATE OF group_name, description ON groups BEGIN
+    INSERT INTO groups_fts(groups_fts, rowid, group_name, description)
+    VALUES ('delete', old.rowid, old.group_name, old.description);
+    INSERT INTO groups_fts(rowid, group_name, description) VALUES (new.rowid, new.group_name, new.description);
+END;
+INSERT INTO groups_fts(groups_fts) VALUES ('rebuild');
+"""
+
+_UPSERT_HIT = """
+INSERT INTO keyword_hits (keyword_id, group_key, first_captured, last_captured, hit_count)
+VALUES (?, ?, ?, ?, 1)
+ON CONFLICT(keyword_id, group_key) DO UPDATE SET
+    first_captured = MIN(keyword_hits.first_captured, excluded.first_captured),
+    last_captured = MAX(keyword_hits.last_captured, excluded.last_captured),
+    hit_count = keyword_hits.hit_count + (excluded.last_captured > keyword_hits.last_captured)
+"""
+
+
+def db_key(url: str) -> Optional[str]:
+    """Canonical group key as stored in the database (numeric ID or vanity name)."""
+    key = group_key(url)
+    return None if key is None else str(key)
+
+
+def _now() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _to_int(value) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, int):
+        return value
+    try:
+        return int(float(str(value).replace(",", "").strip()))
+    except (TypeError, ValueError):
+        return None
+
+
+def _clean(field: str, value) -> Optional[str]:
+    if value is None:
+        return None
+    value = value if isinstance(value, str) else str(value)
+    value = value.strip()
+    if not value or value in _PLACEHOLDERS.get(field, ()):
+        return None
+    return value
+
+
+class ResultsDB:
+    """SQLite results store shared by all entry points."""
+
+    def __init__(self, path: str = "output/results.db"):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    def __enter__(self) -> "ResultsDB":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+
+    def _keyword_id(self, keyword: str, team: Optional[str] = None, template: Optional[str] = None,
+                    searched_at: Optional[str] = None) -> int:
+        searched_at = searched_at or _now()
+        self.conn.execute(
+            """INSERT INTO keywords (keyword, team, template, first_searched, last_searched)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(keyword) DO UPDATE SET
+                   team = COALESCE(excluded.team, keywords.team),
+                   template = COALESCE(excluded.template, keywords.template),
+                   last_searched = MAX(keywords.last_searched, excluded.last_searched)""",
+            (keyword, team, template, searched_at, searched_at),
+        )
+        row = self.conn.execute("SELECT id FROM keywords WHERE keyword = ?", (keyword,)).fetchone()
+        return int(row["id"])
+
+    def record_keyword_hits(self, keyword: str, urls: Iterable[str], captured_at: Optional[str] = None,
+                            team: Optional[str] = None, template: Optional[str] = None) -> int:
+        """
+        Record that a keyword search returned the given group URLs.
+
+        Returns:
+            Number of hits written
+        """
+        captured_at = captured_at or _now()
+        with self.conn:
+            keyword_id = self._keyword_id(keyword, team, template, captured_at)
+            rows = []
+            for url in urls:
+                key = db_key(url)
+                if key is not None:
+                    rows.append((keyword_id, key, captured_at, captured_at))
+            self.conn.executemany(_UPSERT_HIT, rows)
+        return len(rows)
+
+    def upsert_records(self, records: Iterable[Dict], source: str = "", with_hits: bool = True) -> int:
+        """
+        Write a batch of group records (one transaction).
+
+        Each record becomes a snapshot row and updates the latest group state.
+        Records carrying a 'keyword' (phase 2) also produce a keyword hit unless
+        with_hits is False (hits already written by record_keyword_hits()).
+
+        Returns:
+            Number of records written
+        """
+        group_rows: List[Dict] = []
+        hits: Dict[str, List[tuple]] = {}
+        for record in records:
+            if not record:
+                continue
+            url = (record.get("group_url") or "").strip()
+            key = db_key(url)
+            if key is None:
+                continue
+            seen_at = _clean("extraction_date", record.get("extraction_date")) or \
+                _clean("captured_at", record.get("captured_at")) or _now()
+            member_count = _to_int(record.get("member_count"))
+            row = {
+                "group_key": key,
+                "group_url": url.split("?", 1)[0].split("#", 1)[0].rstrip("/"),
+                "member_count": member_count if member_count else None,
+                "seen_at": seen_at,
+                "source": source or _clean("source", record.get("source")) or "",
+                "keyword": _clean("keyword", record.get("keyword")),
+            }
+            for field in GROUP_FIELDS:
+                row[field] = _clean(field, record.get(field))
+            group_rows.append(row)
+            if with_hits and row["keyword"]:
+                captured = _clean("captured_at", record.get("captured_at")) or seen_at
+                hits.setdefault(row["keyword"], []).append((key, captured))
+
+        if not group_rows:
+            return 0
+
+        try:
+            with self.conn:
+                self.conn.executemany(_UPSERT_GROUP, group_rows)
+                self.conn.executemany(_INSERT_SNAPSHOT, group_rows)
+                for keyword, pairs in hits.items():
+                    keyword_id = self._keyword_id(keyword, searched_at=min(c for _, c in pairs))
+                    self.conn.executemany(_UPSERT_HIT, [(keyword_id, k, c, c) for k, c in pairs])
+        except sqlite3.Error as e:
+            logging.error(f"Could not write {len(group_rows)} records to {self.path}: {e}")
+            return 0
+        return len(group_rows)
+
+    def has_fts(self) -> bool:
+        """True if the full-text index over group names/descriptions exists."""
+        row = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'groups_fts'"
+        ).fetchone()
+        return row is not None
+
+    def ensure_fts(self) -> bool:
+        """
+        Create the FTS5 index over group names/descriptions if it does not exist.
+        Returns False if this SQLite build has no FTS5 support.
+        """
+        if self.has_fts():
+            return True
+        try:
+            self.conn.executescript("BEGIN;" + _FTS_SCHEMA + "COMMIT;")
+            return True
+        except sqlite3.OperationalError as e:
+            if self.conn.in_transaction:
+                self.conn.rollback()
+            logging.warning(f"Full-text search unavailable ({e}); falling back to LIKE matching")
+            return False
+
+    def latest_group(self, url: str) -> Optional[Dict]:
+        """Return the latest known state of a group, or None if unknown."""
+        key = db_key(url)
+        if key is None:
+            return None
+        row = self.conn.execute("SELECT * FROM groups WHERE group_key = ?", (key,)).fetchone()
+        return dict(row) if row else None
+
+
+def open_results_db(cfg: Optional[ConfigParser] = None) -> Optional[ResultsDB]:
+    """
+    Open the results database configured in [database] (enabled, path).
+    Returns None if it is disabled or cannot be opened.
+    """
+    if cfg is None:
+        cfg = ConfigParser()
+        cfg.read("config.ini")
+    if not cfg.getboolean("database", "enabled", fallback=True):
+        return None
+    path = cfg.get("database", "path", fallback="output/results.db")
+    try:
+        return ResultsDB(path)
+    except Exception as e:
+        logging.warning(f"Could not open results database {path}: {e}")
+        return None
+
+
+__all__ = [
+    "ResultsDB",
+    "open_results_db",
+    "db_key",
+]
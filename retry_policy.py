@@ -0,0 +1,229 @@
+"""
+Classified Retry Policy
+Facebook Group Data Extractor - Shared retry layer for navigation and extraction
+
+Purpose:
+- Handle failures the same way everywhere (group scraping, searches, phase 2)
+  instead of ad-hoc retry loops, recursion and blanket driver rebuilds
+- Spend expensive recovery (new WebDriver + login) only on errors that need it
+
+Key Features:
+- classify() sorts exceptions into classes:
+  - transient_network: page load timeouts, net::ERR_*, connection resets
+  - stale_element: element went stale between lookup and use
+  - dead_session: invalid session id, closed window, unreachable browser
+  - restricted_page: redirected to a login/checkpoint page
+  - layout_miss: an element the code relies on is not on the page
+  - other: anything else
+- Per class: retries per call, exponential backoff (first delay, cap) and a
+  retry budget for the whole run ([retry] in config.ini)
+- Optional recovery hook per class (e.g. rebuild the driver on dead_session,
+  log in again on restricted_page), run before the retry
+- Per call, classes can be passed straight to the caller (no_retry) when an
+  outer call owns their recovery
+- Retry / give-up counts per class for the run summary
+
+Usage:
+    policy = get_retry_policy()
+    cards = policy.call(lambda: find_group_urls(driver, kw), label=f"search '{kw}'",
+                        recover={DEAD_SESSION: rebuild_driver})
+    for line in policy.summary_lines():
+        print(line)
+"""
+
+from __future__ import annotations
+
+# Standard library imports
+import time        # Backoff delays and deadlines
+import socket      # Network timeout exception type
+import logging     # Logging retries
+from configparser import ConfigParser  # Per-class retry settings
+from typing import Callable, Collection, Dict, List, Mapping, NamedTuple, Optional, TypeVar  # Type hints
+
+
+TRANSIENT_NETWORK = "transient_network"
+STALE_ELEMENT = "stale_element"
+DEAD_SESSION = "dead_session"
+RESTRICTED_PAGE = "restricted_page"
+LAYOUT_MISS = "layout_miss"
+OTHER = "other"
+
+ERROR_CLASSES = (TRANSIENT_NETWORK, STALE_ELEMENT, DEAD_SESSION, RESTRICTED_PAGE, LAYOUT_MISS, OTHER)
+
+T = TypeVar("T")
+
+
+class RestrictedPageError(RuntimeError):
+    """The browser was redirected to a login, checkpoint or registration page."""
+
+
+class RetryRule(NamedTuple):
+    """Retry settings of one error class."""
+    retries: int          # retries per call
+    delay: float          # first backoff delay (seconds), doubled per retry
+    max_delay: float      # backoff cap (seconds)
+    run_budget: int       # retries allowed for the whole run
+
+
+DEFAULT_RULES: Dict[str, RetryRule] = {
+    TRANSIENT_NETWORK: RetryRule(3, 2.0, 30.0, 50),
+    STALE_ELEMENT: RetryRule(2, 0.5, 2.0, 200),
+    DEAD_SESSION: RetryRule(1, 5.0, 5.0, 5),
+    RESTRICTED_PAGE: RetryRule(1, 5.0, 5.0, 3),
+    LAYOUT_MISS: RetryRule(0, 0.0, 0.0, 0),
+    OTHER: RetryRule(1, 2.0, 10.0, 20),
+}
+
+# Lower-cased message fragments, checked in this order
+_DEAD_SESSION_MESSAGES = ("invalid session id", "no such window", "target window already closed",
+                          "chrome not reachable", "session deleted", "disconnected: not connected to devtools",
+                          "no such session")
+_NETWORK_MESSAGES = ("net::err_", "err_connection", "err_internet_disconnected", "err_name_not_resolved",
+                     "err_timed_out", "timed out receiving message from renderer", "connection refused",
+                     "connection reset", "max retries exceeded")
+
+
+def is_login_redirect(url: Optional[str]) -> bool:
+    """
+    Check whether the browser was redirected to a login, checkpoint or registration page
+
+    Only the URL is checked - page text can contain "log in" even when logged in.
+    """
+    url = (url or "").lower()
+    return ("facebook.com/login" in url or
+            "facebook.com/checkpoint" in url or
+            "facebook.com/reg" in url)
+
+
+def classify(exc: BaseException) -> str:
+    """Error class of an exception (one of ERROR_CLASSES)."""
+    if isinstance(exc, RestrictedPageError):
+        return RESTRICTED_PAGE
+    names = {cls.__name__ for cls in type(exc).__mro__}
+    message = str(exc).lower()
+
+    if names & {"InvalidSessionIdException", "NoSuchWindowException"} or \
+            any(m in message for m in _DEAD_SESSION_MESSAGES):
+        return DEAD_SESSION
+    if "StaleElementReferenceException" in names:
+        return STALE_ELEMENT
+    if names & {"NoSuchElementException", "InvalidSelectorException"}:
+        return LAYOUT_MISS
+    # Selenium's TimeoutException (page load / wait for the body) is treated as network trouble
+    if names & {"TimeoutException", "ConnectionError", "ProtocolError", "MaxRetryError"} or \
+            isinstance(exc, (socket.timeout, ConnectionError)) or any(m in message for m in _NETWORK_MESSAGES):
+        return TRANSIENT_NETWORK
+    return OTHER
+
+
+class RetryPolicy:
+    """Retries calls according to the class of the error they raise."""
+
+    def __init__(self, rules: Optional[Mapping[str, RetryRule]] = None):
+        self.rules: Dict[str, RetryRule] = dict(DEFAULT_RULES)
+        self.rules.update(rules or {})
+        self.errors: Dict[str, int] = {c: 0 for c in ERROR_CLASSES}
+        self.retries: Dict[str, int] = {c: 0 for c in ERROR_CLASSES}
+        self.gave_up: Dict[str, int] = {c: 0 for c in ERROR_CLASSES}
+
+    @classmethod
+    def from_config(cls, cfg: ConfigParser) -> "RetryPolicy":
+        """[retry] <class> = retries, first delay, max delay, run budget"""
+        rules = {}
+        for name in ERROR_CLASSES:
+            value = cfg.get("retry", name, fallback="").strip()
+            if not value:
+                continue
+            try:
+                retries, delay, max_delay, budget = [v.strip() for v in value.split(",")]
+                rules[name] = RetryRule(int(retries), float(delay), float(max_delay), int(budget))
+            except ValueError:
+                logging.warning(f"Ignoring invalid [retry] {name} = {value!r} "
+                                f"(expected: retries, first delay, max delay, run budget)")
+        return cls(rules)
+
+    def call(self, func: Callable[[], T], label: str = "", deadline: Optional[float] = None,
+             recover: Optional[Mapping[str, Callable[[BaseException], None]]] = None,
+             no_retry: Collection[str] = ()) -> T:
+        """
+        Call func() and retry it according to the class of the error it raises.
+
+        Args:
+            func: Callable without arguments (use a lambda/closure)
+            label: What is being done, for log messages
+            deadline: time.monotonic() value after which no retry is started
+            recover: Optional hook per error class, called with the error before retrying
+                     (an exception raised by the hook ends the retries)
+            no_retry: Error classes raised at once without retrying or counting them,
+                      for an outer call that recovers from them (and counts them)
+
+        Raises:
+            The last error when its class has no retries left (per call or per run)
+        """
+        attempts: Dict[str, int] = {}
+        while True:
+            try:
+                return func()
+            except Exception as e:
+                error_class = classify(e)
+                if error_class in no_retry:
+                    raise
+                self.errors[error_class] += 1
+                rule = self.rules[error_class]
+                attempt = attempts.get(error_class, 0)
+                delay = min(rule.max_delay, rule.delay * (2 ** attempt))
+                if attempt >= rule.retries or self.retries[error_class] >= rule.run_budget or \
+                        (deadline is not None and time.monotonic() + delay >= deadline):
+                    self.gave_up[error_class] += 1
+                    raise
+                attempts[error_class] = attempt + 1
+                self.retries[error_class] += 1
+                reason = (str(e).strip().splitlines() or [type(e).__name__])[0]
+                logging.warning(f"Retrying {label or 'call'} in {delay:.1f}s after {error_class} "
+                                f"(attempt {attempt + 1}/{rule.retries}): {reason}")
+                time.sleep(delay)
+                if recover and error_class in recover:
+                    recover[error_class](e)
+
+    def summary_lines(self) -> List[str]:
+        """Per-class error, retry and give-up counts (classes without errors are left out)."""
+        lines = []
+        for name in ERROR_CLASSES:
+            if self.errors[name]:
+                lines.append(f"{name}: {self.errors[name]} errors, {self.retries[name]} retries, "
+                             f"{self.gave_up[name]} gave up")
+        return lines
+
+    def as_dict(self) -> Dict[str, Dict[str, int]]:
+        return {name: {"errors": self.errors[name], "retries": self.retries[name], "gave_up": self.gave_up[name]}
+                for name in ERROR_CLASSES}
+
+
+_shared: Optional[RetryPolicy] = None
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Process-wide policy configured from config.ini (created on first use)."""
+    global _shared
+    if _shared is None:
+        cfg = ConfigParser()
+        cfg.read("config.ini")
+        _shared = RetryPolicy.from_config(cfg)
+    return _shared
+
+
+__all__ = [
+    "TRANSIENT_NETWORK",
+    "STALE_ELEMENT",
+    "DEAD_SESSION",
+    "RESTRICTED_PAGE",
+    "LAYOUT_MISS",
+    "OTHER",
+    "ERROR_CLASSES",
+    "RestrictedPageError",
+    "RetryRule",
+    "RetryPolicy",
+    "classify",
+    "get_retry_policy",
+    "is_login_redirect",
+]
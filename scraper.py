@@ -9,12 +9,17 @@ Purpose:
 - Support both logged-in and public-only extraction modes
 
 Key Features:
-- Multiple selector strategies for each field (fault-tolerant)
+- Multiple selector strategies for each field (fault-tolerant), tried in
+  order of observed hit rate
 - Regex-based text parsing for structured data extraction
-- Session recovery and retry logic
+- Classified retries with backoff (retry_policy.py) and session recovery
+- Passive session checks (auth cookies, login redirects) instead of homepage visits
 - Admin information extraction from /members/admins page
 - Member information extraction from /members page
 - Graceful degradation when elements are not found
+- Per-group deadline and per-step time budgets; steps that run out of
+  time keep partial results and are listed in 'timed_out_steps'
+- Circuit breaker stops a multi-group run early when extraction keeps failing
 
 Data Extracted:
 1. Group Name: The official title of the Facebook group
@@ -31,6 +36,7 @@ Data Extracted:
 # Standard library imports
 import time          # For adding delays between page interactions
 import re            # For regex pattern matching (member counts, parsing)
+import configparser  # For reading time budgets from config.ini
 from datetime import datetime  # For timestamping when data was extracted
 
 # Selenium WebDriver imports
@@ -40,6 +46,15 @@ from selenium.webdriver.support import expected_conditions as EC  # Expected con
 from selenium.common.exceptions import TimeoutException, NoSuchElementException  # Common exceptions
 from selenium.webdriver.common.keys import Keys  # For keyboard input (Enter key to send message)
 
+# Local module imports
+from group_record import GroupRecord  # Compact dict-compatible record type
+from about_parser import analyze_about_text, MEMBER_COUNT_SOURCES  # Single-pass /about text analysis
+from strategy_stats import get_strategy_stats  # Adaptive selector/pattern ordering
+from circuit_breaker import CircuitBreaker, LayoutDriftError  # Stop early on layout drift
+from retry_policy import (get_retry_policy, classify, is_login_redirect,  # Classified retries
+                          RestrictedPageError, DEAD_SESSION)
+from session_health import SessionMonitor  # Passive login state checks
+
 
 def _send_message_to_profile(driver, message_text="Hi"):
     """
@@ -401,248 +416,327 @@ def _click_and_get_profile_url(driver, name, current_page_url, send_message=Fals
         return ''
 
 
-def scrape_group_data(driver, group_url):
-    """
-    Extract comprehensive data from a single Facebook group page
+class _StepBudget:
+    """Per-group deadline plus a time budget for the current step (seconds, 0 = no limit)."""
     
-    This is the core scraping function that navigates to a group URL and extracts
-    all available information. It uses multiple selector strategies and regex patterns
-    to handle variations in Facebook's page structure.
+    def __init__(self, budgets):
+        self.budgets = budgets
+        total = budgets.get('group', 0)
+        self.group_end = time.monotonic() + total if total > 0 else float('inf')
+        self.step = None
+        self.step_end = float('inf')
+        self.timed_out_steps = []
     
-    Extraction Strategy:
-    1. Navigate to group URL and wait for page load
-    2. Detect if access is restricted (login required page)
-    3. Extract group name using multiple CSS selectors
-    4. Navigate to /about page for description, exact member count, and privacy
-    5. Navigate to /members page
-    6. Click "See All" for admins and extract from /members/admins page
-    7. Extract first 5 members from "New to the group" section
-    8. Return structured data dictionary
+    def start(self, step):
+        """Begin a step. Returns False (step marked timed out) if the group deadline has passed."""
+        self.step = step
+        limit = self.budgets.get(step, 0)
+        self.step_end = time.monotonic() + limit if limit > 0 else float('inf')
+        return not self.expired()
+    
+    def remaining(self):
+        return min(self.group_end, self.step_end) - time.monotonic()
+    
+    def expired(self):
+        """True once the step or group budget is used up (the step is recorded once)."""
+        if self.remaining() > 0:
+            return False
+        if self.step and self.step not in self.timed_out_steps:
+            print(f"   ⏱️  Time budget used up during '{self.step}' - keeping partial results")
+        self.mark_timed_out()
+        return True
+    
+    def mark_timed_out(self):
+        """Record the current step as cut short (also used when its page never loaded)."""
+        if self.step and self.step not in self.timed_out_steps:
+            self.timed_out_steps.append(self.step)
+    
+    def wait(self, seconds):
+        """WebDriverWait timeout capped by the remaining budget."""
+        return max(1, min(seconds, self.remaining()))
+    
+    def sleep(self, seconds):
+        """time.sleep() capped by the remaining budget."""
+        time.sleep(max(0, min(seconds, self.remaining())))
+
+
+_step_budgets = None
+
+
+def load_step_budgets(config=None):
+    """
+    Read the per-group and per-step time budgets from the [scraping] section
     
     Args:
-        driver (webdriver.Chrome): Active Selenium WebDriver instance with session
-        group_url (str): Facebook group URL to scrape (e.g., "https://www.facebook.com/groups/123")
+        config (ConfigParser, optional): Parsed configuration (default: config.ini, read once)
     
     Returns:
-        dict: Group data dictionary with keys:
-              - 'group_name': String name of the group
-              - 'group_url': Original URL
-              - 'member_count': Integer count of members
-              - 'description': String description text
-              - 'privacy': String (Public/Private)
-              - 'admin_names': Semicolon-separated admin names
-              - 'admin_profile_urls': Semicolon-separated profile URLs
-              - 'member_names': Semicolon-separated member names (first 5)
-              - 'member_profile_urls': Semicolon-separated profile URLs
-              - 'extraction_date': Timestamp of extraction
-              Returns None if extraction fails completely
+        dict: Seconds per budget ('group', 'group_page', 'about', 'members'), 0 = no limit
     """
-    print(f"📊 Scraping group: {group_url}")
+    global _step_budgets
+    if config is None and _step_budgets is not None:
+        return _step_budgets
+    if config is None:
+        config = configparser.ConfigParser()
+        config.read('config.ini')
+    budgets = {
+        'group': float(config.get('scraping', 'group_deadline_seconds', fallback='0')),
+        'group_page': float(config.get('scraping', 'group_page_seconds', fallback='0')),
+        'about': float(config.get('scraping', 'about_page_seconds', fallback='0')),
+        'members': float(config.get('scraping', 'members_page_seconds', fallback='0')),
+    }
+    if _step_budgets is None:
+        _step_budgets = budgets
+    return budgets
+
+
+# Fields filled by each page visit of scrape_group_data()
+MAIN_PAGE_FIELDS = ('group_name',)
+ABOUT_PAGE_FIELDS = ('description', 'member_count', 'privacy')
+MEMBERS_PAGE_FIELDS = ('admin_names', 'admin_profile_urls', 'member_names', 'member_profile_urls')
+
+# Group name selectors, most reliable first; scrape_group_data() tries them by recent
+# hit rate with this order breaking ties, a selector that keeps missing last (strategy_stats.py)
+NAME_SELECTORS = (
+    "h1",                          # Most common: group name is usually in h1 tag
+    "[data-testid='group-name']",  # Facebook's official test ID for group name
+    "h1[class*='group']",          # Alternative: h1 with class containing "group"
+    "[role='main'] h1",            # Main content area heading
+    "h2",                          # Fallback: sometimes it's an h2 tag
+)
+
+
+def _scrape_group_page(driver, group_url, group_data, budget, stats):
+    """Group page visit of scrape_group_data(): access restrictions and group name."""
+    # ========== STEP 1: NAVIGATE TO GROUP PAGE ==========
+    budget.start('group_page')
+    # Navigate the browser to the Facebook group page
+    driver.get(group_url)
+    # Wait 3 seconds for initial page load and JavaScript execution
+    budget.sleep(3)
     
-    try:
-        # ========== STEP 1: NAVIGATE TO GROUP PAGE ==========
-        # Navigate the browser to the Facebook group page
-        driver.get(group_url)
-        # Wait 3 seconds for initial page load and JavaScript execution
-        time.sleep(3)
+    # Wait for page body element to be present in DOM (confirms page loaded)
+    WebDriverWait(driver, budget.wait(10)).until(
+        EC.presence_of_element_located((By.TAG_NAME, "body"))
+    )
+    
+    # ========== STEP 3: DETECT ACCESS RESTRICTIONS ==========
+    # Check if we've been redirected to a login/restricted page
+    # Facebook shows these pages when group is private or session expired
+    
+    # Only check the URL - this is the most reliable indicator
+    # Don't check page text as it can have "log in" text even when logged in
+    current_url = driver.current_url
+    print(f"   📍 Current URL: {current_url[:100]}...")  # Debug: show what URL we're on
+    is_login_page = is_login_redirect(current_url)
+    
+    # If we detected a login page URL, read what the title shows and stop here:
+    # the /about and /members pages redirect to the same wall
+    if is_login_page:
+        print("   ⚠️  Login page detected - reading the page title only")
         
-        # Wait for page body element to be present in DOM (confirms page loaded)
-        WebDriverWait(driver, 10).until(
+        # Try to get the group name from page title as a fallback
+        try:
+            # Facebook sometimes includes group name in page title even on login page
+            title = driver.title
+            if title and 'facebook' not in title.lower() and 'log in' not in title.lower():
+                group_data['group_name'] = title
+                print(f"   ✅ Found group name from title: {title}")
+        except:
+            pass
+        
+        group_data['restricted'] = True
+        print("   ⏭️  Access restricted - skipping /about and /members pages")
+        return
+    else:
+        print(f"   ✅ On group page - proceeding with full extraction")
+    
+    # ========== STEP 4: EXTRACT GROUP NAME ==========
+    # Try multiple CSS selectors because Facebook's HTML structure can vary
+    # We use a fallback strategy: best recent hit rate first (one that keeps missing goes last)
+    name_tried = []
+    name_winner = None
+    
+    # Iterate through selectors until we find one that works
+    for selector in stats.order('group_name', NAME_SELECTORS):
+        if budget.expired():
+            break
+        name_tried.append(selector)
+        try:
+            # Try to locate element using this selector
+            name_element = driver.find_element(By.CSS_SELECTOR, selector)
+            # Verify element exists and has non-empty text content
+            if name_element and name_element.text.strip():
+                # Successfully found group name
+                group_data['group_name'] = name_element.text.strip()
+                print(f"   ✅ Found group name: {group_data['group_name']}")
+                name_winner = selector
+                # Break loop since we found the name
+                break
+        except NoSuchElementException:
+            # Selector didn't match anything on this page - try next selector
+            continue
+    stats.record_attempts('group_name', name_tried, name_winner)
+
+
+def _scrape_about_page(driver, group_url, group_data, budget, stats):
+    """/about page visit of scrape_group_data(): description, member count and privacy."""
+    # Extract description, exact member count, and privacy settings from /about page
+    about_url = group_url.rstrip('/') + '/about'
+    print(f"   📄 Navigating to /about page...")
+    try:
+        driver.get(about_url)
+        budget.sleep(3)  # Wait for page to load
+        WebDriverWait(driver, budget.wait(10)).until(
             EC.presence_of_element_located((By.TAG_NAME, "body"))
         )
+        if is_login_redirect(driver.current_url):
+            raise RestrictedPageError(driver.current_url)
         
-        # ========== STEP 2: INITIALIZE DATA STRUCTURE ==========
-        # Create a dictionary with default values for all fields
-        # These defaults will be overwritten if data is successfully extracted
-        group_data = {
-            'group_name': 'Unknown',              # Default: will be overwritten if found
-            'group_url': group_url,               # Always set to the provided URL
-            'member_count': 0,                    # Default: will be overwritten if found
-            'description': 'No description available',  # Default: will be overwritten if found
-            'privacy': '',                        # Default: empty string (Public/Private)
-            'admin_names': '',                    # Default: empty string if admins not visible
-            'admin_profile_urls': '',             # Default: empty string if URLs not found
-            'member_names': '',                   # Default: empty string if members not visible
-            'member_profile_urls': '',            # Default: empty string if URLs not found
-            'extraction_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S")  # Current timestamp
-        }
+        # Get page text and analyze it in one pass (description, member count, privacy)
+        page_text = driver.find_element(By.TAG_NAME, "body").text
+        about = analyze_about_text(page_text)
+        # Fixed precedence: patterns ranked before the one that matched found nothing
+        source = about['member_count_source']
+        stats.record_attempts('member_count',
+                              MEMBER_COUNT_SOURCES[:MEMBER_COUNT_SOURCES.index(source) + 1]
+                              if source else MEMBER_COUNT_SOURCES,
+                              source)
         
-        # ========== STEP 3: DETECT ACCESS RESTRICTIONS ==========
-        # Check if we've been redirected to a login/restricted page
-        # Facebook shows these pages when group is private or session expired
-        
-        # Only check the URL - this is the most reliable indicator
-        # Don't check page text as it can have "log in" text even when logged in
-        current_url = driver.current_url
-        print(f"   📍 Current URL: {current_url[:100]}...")  # Debug: show what URL we're on
-        current_url_lower = current_url.lower()
-        is_login_page = (
-            'facebook.com/login' in current_url_lower or
-            'facebook.com/checkpoint' in current_url_lower or
-            'facebook.com/reg' in current_url_lower
-        )
-        
-        # If we detected a login page URL, warn but continue trying to extract data
-        # (Some public groups might still show basic info even when redirected)
-        if is_login_page:
-            print("   ⚠️  Login page detected - will attempt to extract available data")
-            
-            # Try to get the group name from page title as a fallback
+        # ========== EXTRACT DESCRIPTION FROM "ABOUT THIS GROUP" SECTION ==========
+        try:
+            # Look for "About this group" heading
+            about_heading = None
             try:
-                # Facebook sometimes includes group name in page title even on login page
-                title = driver.title
-                if title and 'facebook' not in title.lower() and 'log in' not in title.lower():
-                    group_data['group_name'] = title
-                    print(f"   ✅ Found group name from title: {title}")
+                about_heading = driver.find_element(By.XPATH, 
+                    "//*[contains(text(), 'About this group') or contains(text(), 'About this Group')]")
             except:
                 pass
-        else:
-            print(f"   ✅ On group page - proceeding with full extraction")
-        
-        # ========== STEP 4: EXTRACT GROUP NAME ==========
-        # Try multiple CSS selectors because Facebook's HTML structure can vary
-        # We use a fallback strategy: try the most common selector first, then alternatives
-        name_selectors = [
-            "h1",                       # Most common: group name is usually in h1 tag
-            "[data-testid='group-name']",  # Facebook's official test ID for group name
-            "h1[class*='group']",       # Alternative: h1 with class containing "group"
-            "[role='main'] h1",         # Main content area heading
-            "h2"                        # Fallback: sometimes it's an h2 tag
-        ]
-        
-        # Iterate through selectors until we find one that works
-        for selector in name_selectors:
-            try:
-                # Try to locate element using this selector
-                name_element = driver.find_element(By.CSS_SELECTOR, selector)
-                # Verify element exists and has non-empty text content
-                if name_element and name_element.text.strip():
-                    # Successfully found group name
-                    group_data['group_name'] = name_element.text.strip()
-                    print(f"   ✅ Found group name: {group_data['group_name']}")
-                    # Break loop since we found the name
-                    break
-            except NoSuchElementException:
-                # Selector didn't match anything on this page - try next selector
-                continue
-        
-        # ========== STEP 5: NAVIGATE TO /ABOUT PAGE FOR DETAILED DATA ==========
-        # Extract description, exact member count, and privacy settings from /about page
-        about_url = group_url.rstrip('/') + '/about'
-        print(f"   📄 Navigating to /about page...")
-        try:
-            driver.get(about_url)
-            time.sleep(3)  # Wait for page to load
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
             
-            # Get page text for parsing
-            page_text = driver.find_element(By.TAG_NAME, "body").text
-            
-            # ========== EXTRACT DESCRIPTION FROM "ABOUT THIS GROUP" SECTION ==========
-            try:
-                # Look for "About this group" heading
-                about_heading = None
+            if about_heading:
+                # Find the description text after the heading
+                # Try multiple approaches
+                description_found = False
+                
+                # Method 1: Look for span or div with dir='auto' after the heading
                 try:
-                    about_heading = driver.find_element(By.XPATH, 
-                        "//*[contains(text(), 'About this group') or contains(text(), 'About this Group')]")
+                    parent = about_heading.find_element(By.XPATH, "./ancestor::div[position()<10]")
+                    desc_elements = parent.find_elements(By.XPATH, 
+                        ".//span[@dir='auto'] | .//div[@dir='auto'] | .//p[@dir='auto']")
+                    for elem in desc_elements:
+                        if budget.expired():
+                            break
+                        text = elem.text.strip()
+                        if text and len(text) > 20:
+                            # Filter out junk
+                            if 'see more' not in text.lower() and 'facebook' not in text.lower():
+                                group_data['description'] = text[:500]
+                                print(f"   ✅ Found description from /about page: {group_data['description'][:100]}...")
+                                description_found = True
+                                break
                 except:
                     pass
                 
-                if about_heading:
-                    # Find the description text after the heading
-                    # Try multiple approaches
-                    description_found = False
-                    
-                    # Method 1: Look for span or div with dir='auto' after the heading
-                    try:
-                        parent = about_heading.find_element(By.XPATH, "./ancestor::div[position()<10]")
-                        desc_elements = parent.find_elements(By.XPATH, 
-                            ".//span[@dir='auto'] | .//div[@dir='auto'] | .//p[@dir='auto']")
-                        for elem in desc_elements:
-                            text = elem.text.strip()
-                            if text and len(text) > 20:
-                                # Filter out junk
-                                if 'see more' not in text.lower() and 'facebook' not in text.lower():
-                                    group_data['description'] = text[:500]
-                                    print(f"   ✅ Found description from /about page: {group_data['description'][:100]}...")
-                                    description_found = True
-                                    break
-                    except:
-                        pass
-                    
-                    # Method 2: Parse from page text
-                    if not description_found:
-                        lines = page_text.split('\n')
-                        found_about_heading = False
-                        for i, line in enumerate(lines):
-                            if 'about this group' in line.lower():
-                                found_about_heading = True
-                                # Look for description in next few lines
-                                for j in range(i+1, min(i+5, len(lines))):
-                                    desc_line = lines[j].strip()
-                                    if desc_line and len(desc_line) > 20:
-                                        # Filter out junk
-                                        skip_words = ['public', 'private', 'visible', 'anyone can see', 
-                                                     'see more', 'members', 'activity', 'created']
-                                        if not any(skip in desc_line.lower() for skip in skip_words):
-                                            group_data['description'] = desc_line[:500]
-                                            print(f"   ✅ Found description from /about page: {group_data['description'][:100]}...")
-                                            description_found = True
-                                            break
-                                break
-            except Exception as e:
-                print(f"   Note: Could not extract description from /about: {str(e)}")
-            
-            # ========== EXTRACT EXACT MEMBER COUNT FROM /ABOUT PAGE ==========
-            try:
-                # Look for "total members" or exact member count
-                # Pattern: "1,169 total members" or "1,167 members"
-                member_count_patterns = [
-                    r'(\d{1,3}(?:,\d{3})*)\s+total\s+members?',  # "1,169 total members"
-                    r'Members\s+·\s+(\d{1,3}(?:,\d{3})*)',        # "Members · 1,167"
-                    r'(\d{1,3}(?:,\d{3})*)\s+members?\s*$',        # "1,167 members" at end of line
-                ]
-                
-                for pattern in member_count_patterns:
-                    matches = re.findall(pattern, page_text, re.IGNORECASE)
-                    if matches:
-                        # Get the first match and remove commas
-                        count_str = matches[0].replace(',', '')
-                        try:
-                            count = int(count_str)
-                            if count > 0:
-                                group_data['member_count'] = count
-                                print(f"   ✅ Found exact member count from /about: {count:,}")
-                                break
-                        except:
-                            continue
-            except Exception as e:
-                print(f"   Note: Could not extract member count from /about: {str(e)}")
-            
-            # ========== EXTRACT PRIVACY SETTINGS ==========
-            try:
-                # Look for "Public" or "Private" text
-                if 'public' in page_text.lower() and 'public group' in page_text.lower():
-                    group_data['privacy'] = 'Public'
-                    print(f"   ✅ Group privacy: Public")
-                elif 'private' in page_text.lower() and 'private group' in page_text.lower():
-                    group_data['privacy'] = 'Private'
-                    print(f"   ✅ Group privacy: Private")
-            except Exception as e:
-                print(f"   Note: Could not extract privacy settings: {str(e)}")
-                
+                # Method 2: Line after the heading in the page text (from the analyzer)
+                if not description_found and about['description']:
+                    group_data['description'] = about['description']
+                    print(f"   ✅ Found description from /about page: {group_data['description'][:100]}...")
+                    description_found = True
         except Exception as e:
-            print(f"   ⚠️  Could not navigate to /about page: {str(e)}")
+            print(f"   Note: Could not extract description from /about: {str(e)}")
+        
+        # ========== EXTRACT EXACT MEMBER COUNT FROM /ABOUT PAGE ==========
+        # Best-ranked pattern wins ("1,169 total members", "Members · 1,167", "1,167 members")
+        if about['member_count']:
+            group_data['member_count'] = about['member_count']
+            print(f"   ✅ Found exact member count from /about: {about['member_count']:,}")
+        
+        # ========== EXTRACT PRIVACY SETTINGS ==========
+        # "Public group" / "Private group" text
+        if about['privacy']:
+            group_data['privacy'] = about['privacy']
+            print(f"   ✅ Group privacy: {about['privacy']}")
+    
+    except RestrictedPageError:
+        group_data['restricted'] = True
+        print("   ⚠️  /about redirected to a login page - access restricted")
+    except TimeoutException:
+        # The page never loaded, so its fields keep their defaults for a reason other than the layout
+        budget.mark_timed_out()
+        print("   ⚠️  /about page did not load in time")
+    except Exception as e:
+        print(f"   ⚠️  Could not navigate to /about page: {str(e)}")
+
+
+def _finish_group_record(group_data, budget):
+    """Record the steps cut short by their time budget and print the extraction summary."""
+    group_data['timed_out_steps'] = '; '.join(budget.timed_out_steps)
+    
+    # Print summary
+    print(f"   ✅ Successfully extracted data")
+    print(f"      Name: {group_data['group_name']}")
+    print(f"      Members: {group_data['member_count']:,}")
+    
+    return group_data
+
+
+def _scrape_group_data_once(driver, group_url, fields, budget):
+    """One extraction attempt of scrape_group_data(); errors propagate to the retry policy."""
+    print(f"📊 Scraping group: {group_url}")
+    
+    # Decide which pages need a visit for the requested fields
+    wanted = set(fields) if fields is not None else None
+    need_name = wanted is None or bool(wanted.intersection(MAIN_PAGE_FIELDS))
+    need_about = wanted is None or bool(wanted.intersection(ABOUT_PAGE_FIELDS))
+    need_members = wanted is None or bool(wanted.intersection(MEMBERS_PAGE_FIELDS))
+    stats = get_strategy_stats()
+    
+    try:
+        # ========== STEP 2: INITIALIZE DATA STRUCTURE ==========
+        # Create a record with default values for all fields
+        # These defaults will be overwritten if data is successfully extracted
+        group_data = GroupRecord(
+            group_name='Unknown',                 # Default: will be overwritten if found
+            group_url=group_url,                  # Always set to the provided URL
+            member_count=0,                       # Default: will be overwritten if found
+            description='No description available',  # Default: will be overwritten if found
+            privacy='',                           # Default: empty string (Public/Private)
+            admin_names='',                       # Default: empty string if admins not visible
+            admin_profile_urls='',                # Default: empty string if URLs not found
+            member_names='',                      # Default: empty string if members not visible
+            member_profile_urls='',               # Default: empty string if URLs not found
+            extraction_date=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),  # Current timestamp
+            restricted=False,                     # Set when redirected to a login/checkpoint page
+            timed_out_steps=''                    # Steps cut short by their time budget
+        )
+        
+        # ========== STEPS 1, 3, 4: GROUP PAGE (restrictions, group name) ==========
+        if need_name:
+            _scrape_group_page(driver, group_url, group_data, budget, stats)
+            # Login-walled groups keep what the page title shows and skip every sub-page
+            if group_data['restricted']:
+                return group_data
+        
+        # ========== STEP 5: NAVIGATE TO /ABOUT PAGE FOR DETAILED DATA ==========
+        # (skipped when the group's overall deadline has already passed)
+        if need_about and budget.start('about'):
+            _scrape_about_page(driver, group_url, group_data, budget, stats)
         
         # ========== STEP 6: NAVIGATE TO /MEMBERS PAGE FOR ADMIN AND MEMBER DATA ==========
+        # Login-walled groups and groups /about shows as Private list no members: skip the visit
+        skip_members = group_data['restricted'] or group_data['privacy'] == 'Private'
+        if need_members and skip_members:
+            reason = 'access restricted' if group_data['restricted'] else 'private group'
+            print(f"   ⏭️  Skipping /members page ({reason})")
+        if not need_members or skip_members or not budget.start('members'):
+            return _finish_group_record(group_data, budget)
+        
         members_url = group_url.rstrip('/') + '/members'
         print(f"   👥 Navigating to /members page...")
         try:
             driver.get(members_url)
-            time.sleep(3)  # Wait for page to load
-            WebDriverWait(driver, 10).until(
+            budget.sleep(3)  # Wait for page to load
+            WebDriverWait(driver, budget.wait(10)).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
             
@@ -659,13 +753,15 @@ def scrape_group_data(driver, group_url):
                 
                 clicked_see_all = False
                 for button in see_all_buttons:
+                    if budget.expired():
+                        break
                     try:
                         # Check if this button is in the admin section
                         parent_text = button.find_element(By.XPATH, "./ancestor::div[position()<10]").text
                         if 'admin' in parent_text.lower() or 'moderator' in parent_text.lower():
                             print(f"   🔍 Clicking 'See All' for admins...")
                             driver.execute_script("arguments[0].click();", button)  # Use JavaScript click for reliability
-                            time.sleep(5)  # Wait longer for page to load
+                            budget.sleep(5)  # Wait longer for page to load
                             clicked_see_all = True
                             break
                     except:
@@ -678,17 +774,19 @@ def scrape_group_data(driver, group_url):
                 print(f"   📍 Is on /admins page: {is_admins_page}")
                 
                 # Wait a bit more for page to fully load
-                time.sleep(3)
+                budget.sleep(3)
                 
                 # Scroll to load content if on /admins page
                 if is_admins_page:
                     print(f"   📜 Scrolling to load admin content...")
                     for i in range(3):
+                        if budget.expired():
+                            break
                         driver.execute_script("window.scrollBy(0, 500);")
-                        time.sleep(1)
+                        budget.sleep(1)
                     # Scroll back to top
                     driver.execute_script("window.scrollTo(0, 0);")
-                    time.sleep(2)
+                    budget.sleep(2)
                 
                 # Get page text for parsing
                 page_text = driver.find_element(By.TAG_NAME, "body").text
@@ -710,6 +808,8 @@ def scrape_group_data(driver, group_url):
                     
                     # Extract from regex matches first
                     for match in admin_matches:
+                        if budget.expired():
+                            break
                         name = match.strip()
                         if name and len(name) > 1:
                             # Skip UI elements
@@ -740,6 +840,8 @@ def scrape_group_data(driver, group_url):
                     if len(admin_names) == 0:
                         print(f"   🔄 Trying link-based extraction...")
                         for link in all_links:
+                            if budget.expired():
+                                break
                             try:
                                 name = link.text.strip()
                                 href = link.get_attribute('href') or ''
@@ -791,6 +893,8 @@ def scrape_group_data(driver, group_url):
                     # Not on /admins page - use the original logic to find admins
                     print(f"   🔍 Not on /admins page - using pattern matching...")
                     for link in all_links:
+                        if budget.expired():
+                            break
                         try:
                             name = link.text.strip()
                             href = link.get_attribute('href') or ''
@@ -864,8 +968,13 @@ def scrape_group_data(driver, group_url):
                     current_page_url = driver.current_url
                     
                     for i, admin_name in enumerate(admin_names, 1):
-                        print(f"   [{i}/{len(admin_names)}] Getting profile URL for: {admin_name}")
-                        profile_url = _click_and_get_profile_url(driver, admin_name, current_page_url)
+                        # Out of time: keep the hrefs found on the page instead of clicking
+                        if budget.expired():
+                            profile_url = ''
+                        else:
+                            print(f"   [{i}/{len(admin_names)}] Getting profile URL for: {admin_name}")
+                            profile_url = _click_and_get_profile_url(driver, admin_name, current_page_url)
+                            time.sleep(1)  # Small delay between clicks
                         if profile_url:
                             final_admin_profile_urls.append(profile_url)
                         else:
@@ -874,7 +983,6 @@ def scrape_group_data(driver, group_url):
                                 final_admin_profile_urls.append(admin_profile_urls[i-1])
                             else:
                                 final_admin_profile_urls.append('')
-                        time.sleep(1)  # Small delay between clicks
                     
                     group_data['admin_names'] = '; '.join(admin_names)
                     group_data['admin_profile_urls'] = '; '.join(final_admin_profile_urls)
@@ -888,11 +996,11 @@ def scrape_group_data(driver, group_url):
             # ========== EXTRACT FIRST 5 MEMBER NAMES FROM "NEW TO THE GROUP" SECTION ==========
             try:
                 # Navigate back to /members page if we went to /members/admins
-                if '/admins' in driver.current_url:
+                if '/admins' in driver.current_url and not budget.expired():
                     print(f"   🔄 Navigating back to /members page...")
                     driver.get(members_url)
-                    time.sleep(4)  # Wait for page to load
-                    WebDriverWait(driver, 10).until(
+                    budget.sleep(4)  # Wait for page to load
+                    WebDriverWait(driver, budget.wait(10)).until(
                         EC.presence_of_element_located((By.TAG_NAME, "body"))
                     )
                 
@@ -901,20 +1009,22 @@ def scrape_group_data(driver, group_url):
                 
                 # Find the "New to the group" heading
                 try:
-                    new_to_group_heading = WebDriverWait(driver, 10).until(
+                    new_to_group_heading = WebDriverWait(driver, budget.wait(10)).until(
                         EC.presence_of_element_located((By.XPATH,
                             "//*[contains(text(), 'New to the group') or contains(text(), 'New to the Group')]"))
                     )
                     
                     # Scroll to the heading
                     driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", new_to_group_heading)
-                    time.sleep(3)
+                    budget.sleep(3)
                     
                     # Scroll down multiple times to load more members
                     print(f"   📜 Scrolling to load members...")
                     for i in range(8):
+                        if budget.expired():
+                            break
                         driver.execute_script("window.scrollBy(0, 600);")
-                        time.sleep(1.5)
+                        budget.sleep(1.5)
                     
                     # Get fresh page text after scrolling
                     page_text_after_scroll = driver.find_element(By.TAG_NAME, "body").text
@@ -938,6 +1048,8 @@ def scrape_group_data(driver, group_url):
                     print(f"   📝 Found {len(joined_matches)} 'Name\nJoined' patterns")
                     
                     for link in all_links:
+                        if budget.expired():
+                            break
                         try:
                             name = link.text.strip()
                             href = link.get_attribute('href') or ''
@@ -1071,15 +1183,20 @@ def scrape_group_data(driver, group_url):
                     current_page_url = driver.current_url
                     
                     for i, member_name in enumerate(member_names, 1):
-                        print(f"   [{i}/{len(member_names)}] Getting profile URL for: {member_name}")
-                        # Send message to members (send_message=True)
-                        profile_url = _click_and_get_profile_url(
-                            driver, 
-                            member_name, 
-                            current_page_url,
-                            send_message=True,  # Enable messaging for members
-                            message_text="Hi"   # Message text
-                        )
+                        # Out of time: keep the hrefs found on the page instead of clicking
+                        if budget.expired():
+                            profile_url = ''
+                        else:
+                            print(f"   [{i}/{len(member_names)}] Getting profile URL for: {member_name}")
+                            # Send message to members (send_message=True)
+                            profile_url = _click_and_get_profile_url(
+                                driver, 
+                                member_name, 
+                                current_page_url,
+                                send_message=True,  # Enable messaging for members
+                                message_text="Hi"   # Message text
+                            )
+                            time.sleep(1)  # Small delay between clicks
                         if profile_url:
                             final_member_profile_urls.append(profile_url)
                         else:
@@ -1088,7 +1205,6 @@ def scrape_group_data(driver, group_url):
                                 final_member_profile_urls.append(member_profile_urls[i-1])
                             else:
                                 final_member_profile_urls.append('')
-                        time.sleep(1)  # Small delay between clicks
                     
                     group_data['member_names'] = '; '.join(member_names)
                     group_data['member_profile_urls'] = '; '.join(final_member_profile_urls)
@@ -1104,73 +1220,199 @@ def scrape_group_data(driver, group_url):
         except Exception as e:
             print(f"   ⚠️  Could not navigate to /members page: {str(e)}")
         
-        # Print summary
-        print(f"   ✅ Successfully extracted data")
-        print(f"      Name: {group_data['group_name']}")
-        print(f"      Members: {group_data['member_count']:,}")
+        return _finish_group_record(group_data, budget)
         
-        return group_data
         
     except Exception as e:
         print(f"   ❌ Error scraping {group_url}: {str(e)}")
-        # If session expired, try to refresh the page
-        if "invalid session id" in str(e).lower():
-            print("   🔄 Session expired, attempting to refresh...")
-            try:
-                driver.refresh()
-                time.sleep(2)
-                return scrape_group_data(driver, group_url)  # Retry once
-            except:
-                pass
+        raise
+
+
+def scrape_group_data(driver, group_url, fields=None, budgets=None):
+    """
+    Extract comprehensive data from a single Facebook group page
+    
+    This is the core scraping function that navigates to a group URL and extracts
+    all available information. It uses multiple selector strategies and regex patterns
+    to handle variations in Facebook's page structure.
+    
+    Extraction Strategy:
+    1. Navigate to group URL and wait for page load
+    2. Detect if access is restricted (login required page); restricted groups
+       keep what the page title shows and skip every sub-page
+    3. Extract group name using multiple CSS selectors (best recent hit rate first)
+    4. Navigate to /about page for description, exact member count, and privacy
+    5. Navigate to /members page (skipped for groups /about shows as Private)
+    6. Click "See All" for admins and extract from /members/admins page
+    7. Extract first 5 members from "New to the group" section
+    8. Return structured data dictionary
+    
+    Pages whose fields are not requested are not visited, so a caller that already
+    has the name, privacy and member count (e.g. from a search result card) can
+    skip the group page entirely.
+    
+    Args:
+        driver (webdriver.Chrome): Active Selenium WebDriver instance with session
+        group_url (str): Facebook group URL to scrape (e.g., "https://www.facebook.com/groups/123")
+        fields (iterable, optional): Fields to extract (default: all). Fields that are
+              not requested keep their default values.
+        budgets (dict, optional): Time budgets in seconds (0 = no limit) for the whole
+              group ('group') and per step ('group_page', 'about', 'members');
+              default: [scraping] settings in config.ini. A step that runs out of
+              time stops with what it has so far.
+    
+    Returns:
+        GroupRecord: Group data record (dict-compatible) with keys:
+              - 'group_name': String name of the group
+              - 'group_url': Original URL
+              - 'member_count': Integer count of members
+              - 'description': String description text
+              - 'privacy': String (Public/Private)
+              - 'admin_names': Semicolon-separated admin names
+              - 'admin_profile_urls': Semicolon-separated profile URLs
+              - 'member_names': Semicolon-separated member names (first 5)
+              - 'member_profile_urls': Semicolon-separated profile URLs
+              - 'extraction_date': Timestamp of extraction
+              - 'restricted': True if the group redirected to a login/checkpoint page
+              - 'timed_out_steps': Semicolon-separated steps cut short by their time budget
+                (or whose page did not load in time)
+              Returns None if extraction fails completely (after retries)
+    
+    Raises:
+        The error of a dead browser session (invalid session id, closed window);
+        only the caller can replace the driver
+    """
+    budget = _StepBudget(budgets if budgets is not None else load_step_budgets())
+    
+    # Failed attempts are retried per error class (network trouble, stale elements) as long
+    # as the group deadline allows; a dead session goes straight to the caller
+    try:
+        return get_retry_policy().call(
+            lambda: _scrape_group_data_once(driver, group_url, fields, budget),
+            label=f"group {group_url}",
+            deadline=budget.group_end,
+            no_retry=(DEAD_SESSION,),
+        )
+    except Exception as e:
+        if classify(e) == DEAD_SESSION:
+            raise
+        print(f"   ❌ Giving up on {group_url} ({classify(e)})")
+        return None
+
+
+def _restart_session(rebuild_driver, login_func, credentials, session):
+    """
+    Replace a dead WebDriver and log in again if the run was logged in
+    
+    Returns:
+        The new driver, or None if there is no rebuild function or it failed
+    """
+    if rebuild_driver is None:
         return None
+    print("🔄 Starting a new browser session...")
+    try:
+        driver = rebuild_driver()
+    except Exception as e:
+        print(f"❌ Could not start a new browser session: {str(e)}")
+        return None
+    if session.expect_login:
+        try:
+            email, password = credentials
+            login_success = login_func(driver, email, password)
+        except Exception as e:
+            print(f"⚠️  Could not re-login: {str(e)}")
+            login_success = False
+        session.relogged_in(login_success)
+        print("✅ Re-login successful" if login_success else "❌ Re-login failed - continuing with limited access")
+    return driver
 
 
-def scrape_multiple_groups(driver, group_urls, delay_between=3, login_func=None, credentials=None):
+def scrape_multiple_groups(driver, group_urls, delay_between=3, login_func=None, credentials=None,
+                           breaker=None, rebuild_driver=None):
     """
     Scrape data from multiple group URLs
     
+    The run stops early (returning what was extracted so far) when the circuit
+    breaker sees too many groups in a row come back without name/member count,
+    which usually means the page layout changed, or when the browser session
+    died and no new driver could be started.
+    
     Args:
         driver: Selenium WebDriver instance
         group_urls (list): List of Facebook group URLs
         delay_between (int): Delay in seconds between scrapes
         login_func: Function to re-login if session expires
         credentials: Login credentials (email, password)
+        breaker (CircuitBreaker, optional): Failure-rate watcher (default: from config.ini)
+        rebuild_driver: Function returning a new WebDriver when the session is dead
+              (the caller owns the driver; without it the run stops)
     
     Returns:
-        list: List of group data dictionaries
+        list: List of group data records (GroupRecord)
     """
     print(f"\n📊 Starting extraction from {len(group_urls)} groups...")
     print("=" * 60)
     
     results = []
+    if breaker is None:
+        breaker = CircuitBreaker.from_config()
+    # Only a run that logged in watches for a lost session
+    session = SessionMonitor(expect_login=bool(login_func and credentials))
     
     for i, url in enumerate(group_urls, 1):
         print(f"\n[{i}/{len(group_urls)}]")
         
-        # Check login status every 10 groups
-        if i % 10 == 1 and i > 1 and login_func and credentials:
-            print("🔍 Checking login status...")
-            try:
-                # Try to access Facebook home to check if still logged in
-                driver.get("https://www.facebook.com")
-                time.sleep(2)
-                page_text = driver.find_element(By.TAG_NAME, "body").text.lower()
-                if any(phrase in page_text for phrase in ['log in', 'sign up', 'create account']):
-                    print("⚠️  Session expired, attempting to re-login...")
+        # Check login status from auth cookies and the last page's URL (no page load)
+        if i > 1 and not session.healthy(driver):
+            if session.error is not None and classify(session.error) == DEAD_SESSION:
+                # The browser itself is gone: only a new driver (which logs in again) helps
+                print(f"⚠️  Browser session is dead ({session.reason})")
+                driver = _restart_session(rebuild_driver, login_func, credentials, session)
+                if driver is None:
+                    print(f"\n🛑 Stopping extraction after {i - 1}/{len(group_urls)} groups: no browser session")
+                    break
+            else:
+                print(f"⚠️  Session lost ({session.reason}), attempting to re-login...")
+                try:
                     email, password = credentials
                     login_success = login_func(driver, email, password)
-                    if login_success:
-                        print("✅ Re-login successful")
-                    else:
-                        print("❌ Re-login failed - continuing with limited access")
-            except Exception as e:
-                print(f"⚠️  Could not check login status: {str(e)}")
+                except Exception as e:
+                    print(f"⚠️  Could not re-login: {str(e)}")
+                    login_success = False
+                session.relogged_in(login_success)
+                if login_success:
+                    print("✅ Re-login successful")
+                else:
+                    print("❌ Re-login failed - continuing with limited access")
         
-        group_data = scrape_group_data(driver, url)
+        try:
+            group_data = scrape_group_data(driver, url)
+        except Exception as e:
+            # Only a dead browser session is raised: retry the group once with a new driver
+            print(f"⚠️  Browser session is dead ({type(e).__name__})")
+            driver = _restart_session(rebuild_driver, login_func, credentials, session)
+            if driver is None:
+                print(f"\n🛑 Stopping extraction after {i - 1}/{len(group_urls)} groups: no browser session")
+                break
+            try:
+                group_data = scrape_group_data(driver, url)
+            except Exception as e:
+                print(f"\n🛑 Stopping extraction after {i - 1}/{len(group_urls)} groups: "
+                      f"new browser session died too ({classify(e)})")
+                break
         
         if group_data:
             results.append(group_data)
         
+        # Stop burning timeouts on the rest of the list if extraction keeps failing
+        try:
+            breaker.observe(group_data)
+        except LayoutDriftError as e:
+            print(f"\n🛑 Stopping extraction after {i}/{len(group_urls)} groups: {e}")
+            for line in e.strategies:
+                print(f"   ❌ No longer matching: {line}")
+            break
+        
         # Add delay between extractions
         if i < len(group_urls):
             time.sleep(delay_between)
@@ -1178,6 +1420,15 @@ def scrape_multiple_groups(driver, group_urls, delay_between=3, login_func=None,
     print("\n" + "=" * 60)
     print(f"✅ Successfully extracted data from {len(results)}/{len(group_urls)} groups")
     
+    # Retries per error class (network, stale element, dead session, ...)
+    for line in get_retry_policy().summary_lines():
+        print(f"🔁 {line}")
+    if login_func and credentials:
+        print(f"🩺 {session.summary()}")
+    
+    # Persist selector/pattern hit rates for the next run
+    get_strategy_stats().save()
+    
     return results
 
 
@@ -1213,6 +1464,10 @@ def format_member_count_text(text):
     - "1.2K members"
     - "13.6K members"
     - "1.5M members"
+    - "1.234.567 members" (dot thousands separators)
+    
+    For whole columns use member_counts.parse_member_counts(), which applies
+    the same rules vectorized and also reports whether each count is exact.
     
     Args:
         text (str): Member count text
@@ -1227,27 +1482,29 @@ def format_member_count_text(text):
         # Remove extra whitespace and convert to lowercase
         text = text.strip().lower()
         
-        # Extract numbers with decimal support
-        number_match = re.search(r'([\d.,]+)\s*[km]?', text)
+        # Extract the number and a K/M suffix directly attached to it
+        # (the 'm' of "members" is not a suffix: it must end the word)
+        number_match = re.search(r'(\d[\d.,]*)\s*([km])?\b', text)
         if not number_match:
             return 0
         
+        suffix = number_match.group(2)
         number_str = number_match.group(1).replace(',', '')
+        # "1.234.567" without a suffix uses dots as thousands separators
+        if not suffix and re.fullmatch(r'\d{1,3}(?:\.\d{3})+', number_match.group(1)):
+            number_str = number_str.replace('.', '')
         number = float(number_str)
         
         # Handle "K" suffix (thousands) - e.g., "13.6K" -> 13600
-        if 'k' in text and 'km' not in text:  # 'km' for kilometers, 'k' for thousands
-            return int(number * 1000)
+        if suffix == 'k':
+            return int(round(number * 1000))
         
         # Handle "M" suffix (millions) - e.g., "1.5M" -> 1500000
-        if 'm' in text and 'member' in text:
-            return int(number * 1000000)
+        if suffix == 'm':
+            return int(round(number * 1000000))
         
         # Regular number without suffix
-        if re.search(r'\d+', text):
-            return int(number)
-        
-        return 0
+        return int(number)
         
     except (ValueError, AttributeError):
         return 0
@@ -12,14 +12,19 @@ Key Features:
 - Scrolling through search results to load more groups
 - URL normalization and validation
 - Automatic dismissal of login/cookie overlays
-- Retry logic for transient network failures
+- Classified retries with backoff for failed navigations (retry_policy.py);
+  dead sessions and login walls are raised to the caller at once, and
+  a search that cannot be opened raises instead of returning no results, so
+  callers do not cache or score an empty result
 - Strict filtering to exclude non-group URLs
+- Optional result cards: URL plus the name, privacy and approximate member
+  count shown on the search card, read in the same pass
 
 Workflow:
 1. Navigate to Facebook search URL with encoded keyword
 2. Scroll through results while collecting group URLs
 3. Normalize and validate each URL
-4. Return deduplicated list of valid group URLs
+4. Return deduplicated list of valid group URLs (or card dicts)
 """
 
 from __future__ import annotations
@@ -28,9 +33,10 @@ from __future__ import annotations
 import os              # OS-level operations
 import time            # Adding delays between actions
 import random          # Randomizing delays for human-like behavior
+import re              # Parsing search card text
 import logging         # Logging search progress and errors
 import urllib.parse    # URL encoding and parsing
-from typing import List, Set  # Type hints
+from typing import Any, Dict, List, Union  # Type hints
 
 # Selenium WebDriver imports
 from selenium.webdriver.common.by import By  # Locator strategies
@@ -38,6 +44,21 @@ from selenium.webdriver.support.ui import WebDriverWait  # Wait for elements
 from selenium.webdriver.support import expected_conditions as EC  # Expected conditions
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
 
+# Local module imports
+from scraper import format_member_count_text  # "13.6K members" -> 13600
+from retry_policy import (get_retry_policy, classify, is_login_redirect,  # Classified retries
+                          RestrictedPageError, DEAD_SESSION, RESTRICTED_PAGE)
+
+
+# Card meta line, e.g. "Public · 13.6K members · 10+ posts a day"
+_CARD_MEMBERS = re.compile(r"(\d[\d.,]*\s*[km]?)\s+members?\b", re.IGNORECASE)
+
+# Card containers tried from the group link outwards (nearest match wins)
+_CARD_XPATHS = (
+    "./ancestor::div[@role='article'][1]",
+    "./ancestor::div[position()<=8][contains(., 'member')][1]",
+)
+
 
 def _human_delay(delay_min: float, delay_max: float) -> None:
     """Sleep a random amount between min and max seconds."""
@@ -81,6 +102,35 @@ def _is_group_link(url: str) -> bool:
         return False
 
 
+def _parse_card_text(text: str) -> Dict[str, Any]:
+    """Privacy and approximate member count from a search result card's text."""
+    details: Dict[str, Any] = {}
+    for line in (text or "").splitlines():
+        match = _CARD_MEMBERS.search(line)
+        if not match:
+            continue
+        count = format_member_count_text(match.group(0))
+        if count > 0:
+            details["member_count"] = count
+        for part in line.split("·"):
+            words = part.strip().lower().split()
+            if words and words[0] in ("public", "private"):
+                details["privacy"] = words[0].capitalize()
+                break
+        break
+    return details
+
+
+def _card_details(anchor) -> Dict[str, Any]:
+    """Read the card around a group link (best-effort, {} if not found)."""
+    for xpath in _CARD_XPATHS:
+        try:
+            return _parse_card_text(anchor.find_element(By.XPATH, xpath).text)
+        except Exception:
+            continue
+    return {}
+
+
 def _dismiss_overlays(driver, timeout: int = 6) -> None:
     """Best-effort dismissal of cookie/login overlays that hide content."""
     try:
@@ -106,7 +156,8 @@ def _dismiss_overlays(driver, timeout: int = 6) -> None:
         pass
 
 
-def find_group_urls(driver, keyword: str, *, max_scrolls: int = 8, delay_min: float = 2.0, delay_max: float = 5.0, timeout: int = 12) -> List[str]:
+def find_group_urls(driver, keyword: str, *, max_scrolls: int = 8, delay_min: float = 2.0, delay_max: float = 5.0,
+                    timeout: int = 12, return_cards: bool = False) -> Union[List[str], List[Dict[str, Any]]]:
     """
     Execute a Facebook group search for the given keyword and collect public group links.
 
@@ -116,26 +167,35 @@ def find_group_urls(driver, keyword: str, *, max_scrolls: int = 8, delay_min: fl
         max_scrolls: Max number of scroll steps to attempt
         delay_min, delay_max: Human-like delay bounds between actions
         timeout: Seconds to wait for key elements
+        return_cards: Return card dicts instead of plain URLs: 'group_url' plus
+            'group_name', 'privacy' and 'member_count' when the card shows them
 
     Returns:
-        List of unique normalized group URLs.
+        List of unique normalized group URLs (or card dicts, sorted by URL).
+
+    Raises:
+        The last error when the search page could not be opened (after retries)
     """
     logging.info(f"Searching groups for keyword: {keyword}")
 
     encoded = urllib.parse.quote(keyword)
     search_url = f"https://www.facebook.com/search/groups/?q={encoded}"
 
-    # Open search URL with one retry on transient failures
-    for attempt in range(2):
-        try:
-            driver.get(search_url)
-            break
-        except Exception as e:
-            logging.error(f"Failed to open search URL (attempt {attempt+1}): {e}")
-            if attempt == 0:
-                time.sleep(3)
-                continue
-            return []
+    # Open search URL; failures are retried per error class (backoff for network trouble)
+    # and then raised - an empty list would look like a search without results.
+    def _open_search() -> None:
+        driver.get(search_url)
+        if is_login_redirect(driver.current_url):
+            raise RestrictedPageError(f"Search redirected to {driver.current_url}")
+
+    try:
+        # A dead session or a login wall goes straight to the caller, which can rebuild
+        # the driver / log in again before retrying
+        get_retry_policy().call(_open_search, label=f"search '{keyword}'",
+                                no_retry=(DEAD_SESSION, RESTRICTED_PAGE))
+    except Exception as e:
+        logging.error(f"Failed to open search URL ({classify(e)}): {e}")
+        raise
 
     try:
         WebDriverWait(driver, timeout).until(
@@ -147,7 +207,8 @@ def find_group_urls(driver, keyword: str, *, max_scrolls: int = 8, delay_min: fl
     # Try to clear overlays that can reduce visible results
     _dismiss_overlays(driver, timeout=4)
 
-    collected: Set[str] = set()
+    # URL -> card details (read from the first link to the URL that has text)
+    collected: Dict[str, Dict[str, Any]] = {}
     last_height = 0
 
     for i in range(max_scrolls):
@@ -166,7 +227,13 @@ def find_group_urls(driver, keyword: str, *, max_scrolls: int = 8, delay_min: fl
                     continue
                 normalized = _normalize_group_url(href)
                 if _is_group_link(normalized):
-                    collected.add(normalized)
+                    if return_cards and not collected.get(normalized):
+                        # Image links have no text; the title link's first line is the group name
+                        name = ((a.text or "").strip().splitlines() or [""])[0].strip()
+                        if name:
+                            collected[normalized] = dict(_card_details(a), group_name=name)
+                            continue
+                    collected.setdefault(normalized, {})
             except StaleElementReferenceException:
                 continue
             except Exception:
@@ -196,6 +263,8 @@ def find_group_urls(driver, keyword: str, *, max_scrolls: int = 8, delay_min: fl
 
     urls = sorted(collected)
     logging.info(f"Collected {len(urls)} group URLs for keyword '{keyword}'")
+    if return_cards:
+        return [dict(collected[u], group_url=u) for u in urls]
     return urls
 
 
@@ -0,0 +1,105 @@
+"""
+Keyword Search Result Cache
+Facebook Group Data Extractor - Phase 2 search cache
+
+Purpose:
+- Avoid repeating a find_group_urls() browser search for a keyword that was
+  searched recently; the cached result cards are used instead
+- Report how many searches the cache saved
+
+Key Features:
+- Persistent JSON cache: normalized keyword -> result cards (URL, name,
+  privacy, member count) + timestamp
+- Configurable TTL; expired entries are ignored and pruned on save
+- refresh=True ignores existing entries (results are still stored)
+- Hit/miss counters for the run summary
+
+Usage:
+    cache = SearchCache("output/search_cache.json", ttl_hours=168)
+    cards = cache.get(keyword)
+    if cards is None:
+        cards = find_group_urls(driver, keyword, return_cards=True)
+        cache.put(keyword, cards)
+    cache.save()
+"""
+
+from __future__ import annotations
+
+# Standard library imports
+import logging     # Logging save errors
+from datetime import datetime, timedelta  # Entry timestamps and TTL
+from typing import Any, Dict, List, Optional  # Type hints
+
+# Local module imports
+from json_store import load_json, save_json  # Cache persistence
+from input_processor import normalize_keyword  # Keyword dedup key
+
+
+# Bumped when the cache file layout changes (older files are ignored)
+CACHE_VERSION = 3
+
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class SearchCache:
+    """Persistent keyword -> search result cards cache with a TTL."""
+
+    def __init__(self, path: str = "output/search_cache.json", ttl_hours: float = 168, refresh: bool = False):
+        self.path = path
+        self.ttl = timedelta(hours=max(0.0, float(ttl_hours)))
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+
+        data = load_json(path, None) if path else None
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            data = {}
+        self.entries: Dict[str, dict] = data.get("entries", {})
+
+    def _cutoff(self) -> str:
+        return (datetime.now() - self.ttl).strftime(_TIME_FORMAT)
+
+    def is_fresh(self, keyword: str) -> bool:
+        """True if a non-expired entry exists (and refresh is off)."""
+        if self.refresh or not self.ttl:
+            return False
+        entry = self.entries.get(normalize_keyword(keyword))
+        return bool(entry) and entry.get("cached_at", "") >= self._cutoff()
+
+    def get(self, keyword: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached result cards for the keyword, or None on a miss (counted)."""
+        if self.is_fresh(keyword):
+            self.hits += 1
+            return [dict(card) for card in self.entries[normalize_keyword(keyword)].get("cards", [])]
+        self.misses += 1
+        return None
+
+    def put(self, keyword: str, cards: List[Dict[str, Any]]) -> None:
+        self.entries[normalize_keyword(keyword)] = {
+            "keyword": keyword,
+            "cards": [dict(card) for card in cards],
+            "cached_at": datetime.now().strftime(_TIME_FORMAT),
+        }
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        cutoff = self._cutoff()
+        self.entries = {k: e for k, e in self.entries.items() if e.get("cached_at", "") >= cutoff}
+        try:
+            save_json(self.path, {"version": CACHE_VERSION, "entries": self.entries})
+        except Exception as e:
+            logging.warning(f"Could not save search cache {self.path}: {e}")
+
+
+__all__ = [
+    "SearchCache",
+]
@@ -0,0 +1,323 @@
+"""
+Compact Seen-Set for Group URL Deduplication
+Facebook Group Data Extractor - Run-level dedup helper
+
+Purpose:
+- Track which groups a discovery run has already seen without keeping
+  every full URL string alive in a Python set
+- Provide a single canonical group key shared by dedup, merge and storage code
+
+Key Features:
+- Numeric group IDs stored as unsigned 64-bit integers in a sorted array('Q')
+  (8 bytes per group instead of ~100 bytes for a URL string in a set)
+- Vanity group names (e.g. /groups/cowboystickets) interned and kept in a set
+- Optional Bloom filter front, persisted to disk, for "seen in an earlier run"
+  checks at a fixed memory cost
+- Built-in benchmark: python seen_set.py --entries 10000000
+
+Workflow:
+1. Derive the canonical key from a group URL (numeric ID or vanity name)
+2. Check the exact in-run set; add the key if it is new
+3. Optionally consult/update the Bloom filter for cross-run history
+"""
+
+from __future__ import annotations
+
+# Standard library imports
+import os              # File operations for the persisted Bloom filter
+import sys             # String interning and object sizes for benchmarks
+import math            # Bloom filter sizing
+import hashlib         # Stable hashing for Bloom filter positions
+import bisect          # Binary search over the sorted ID array
+from array import array  # Compact unsigned 64-bit integer storage
+from typing import List, Optional, Union  # Type hints
+
+
+# Numeric IDs above this value cannot be stored in array('Q')
+_MAX_ID = (1 << 64) - 1
+
+
+def group_key(url: str) -> Optional[Union[int, str]]:
+    """
+    Return the canonical key for a Facebook group URL.
+
+    Numeric groups (/groups/1679801736170853) map to an int, vanity groups
+    (/groups/cowboystickets) map to the lowercased name. Digit tokens with a
+    leading zero (/groups/0123) stay strings, as in GroupRecord, so they never
+    collide with the numeric ID. Query strings, fragments,
+    trailing slashes and sub-pages (/about, /members) are ignored.
+    Returns None if the URL is not a group URL.
+    """
+    if not url:
+        return None
+    # Plain string scanning: urlsplit() dominates lookup cost on large runs
+    start = url.find("/groups/")
+    if start < 0:
+        start = url.lower().find("/groups/")
+        if start < 0:
+            return None
+    query = url.find("?")
+    if 0 <= query < start:
+        return None
+    start += len("/groups/")
+    end = len(url)
+    for sep in ("/", "?", "#"):
+        pos = url.find(sep, start)
+        if 0 <= pos < end:
+            end = pos
+    token = url[start:end].strip()
+    if not token:
+        return None
+    if token.isascii() and token.isdigit() and token[0] != "0":
+        value = int(token)
+        if value <= _MAX_ID:
+            return value
+    return token.lower()
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over bytes keys.
+
+    Sized from the expected number of entries and the target false-positive rate.
+    Membership answers are "definitely not seen" or "probably seen".
+    """
+
+    _MAGIC = b"FGBLOOM1"
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.01):
+        capacity = max(1, int(capacity))
+        error_rate = min(max(float(error_rate), 1e-9), 0.5)
+        num_bits = int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_bits = max(8, num_bits)
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, data: bytes) -> List[int]:
+        # Double hashing: k positions from one 128-bit digest
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        num_bits = self.num_bits
+        return [(h1 + i * h2) % num_bits for i in range(self.num_hashes)]
+
+    def add(self, data: bytes) -> bool:
+        """Add a key. Returns True if it was (probably) already present."""
+        present = True
+        bits = self.bits
+        for pos in self._positions(data):
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not bits[byte] & mask:
+                present = False
+                bits[byte] |= mask
+        if not present:
+            self.count += 1
+        return present
+
+    def __contains__(self, data: bytes) -> bool:
+        bits = self.bits
+        for pos in self._positions(data):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def save(self, path: str) -> None:
+        """Persist the filter atomically to the given path."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self._MAGIC)
+            f.write(self.num_bits.to_bytes(8, "little"))
+            f.write(self.num_hashes.to_bytes(4, "little"))
+            f.write(self.count.to_bytes(8, "little"))
+            f.write(self.bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BloomFilter":
+        """Load a filter previously written with save()."""
+        with open(path, "rb") as f:
+            if f.read(len(cls._MAGIC)) != cls._MAGIC:
+                raise ValueError(f"Not a Bloom filter file: {path}")
+            bloom = cls.__new__(cls)
+            bloom.num_bits = int.from_bytes(f.read(8), "little")
+            bloom.num_hashes = int.from_bytes(f.read(4), "little")
+            bloom.count = int.from_bytes(f.read(8), "little")
+            bloom.bits = bytearray(f.read())
+        if len(bloom.bits) != (bloom.num_bits + 7) // 8:
+            raise ValueError(f"Truncated Bloom filter file: {path}")
+        return bloom
+
+    @classmethod
+    def open(cls, path: str, capacity: int = 1_000_000, error_rate: float = 0.01) -> "BloomFilter":
+        """Load the filter at path, or create an empty one if missing/unreadable."""
+        if path and os.path.exists(path):
+            try:
+                return cls.load(path)
+            except Exception:
+                pass
+        return cls(capacity=capacity, error_rate=error_rate)
+
+    def memory_bytes(self) -> int:
+        return sys.getsizeof(self.bits)
+
+
+def _key_bytes(key: Union[int, str]) -> bytes:
+    if isinstance(key, int):
+        return b"i" + key.to_bytes(8, "little")
+    return b"v" + key.encode("utf-8")
+
+
+class GroupSeenSet:
+    """
+    Exact, memory-compact set of group keys for one run.
+
+    Numeric IDs are appended to a small pending set and periodically merged into
+    a sorted array('Q'); lookups check the pending set and then binary-search the
+    array. Vanity names are interned and kept in a regular set. An optional
+    BloomFilter records every key ever added so later runs can ask whether a
+    group was seen before.
+    """
+
+    def __init__(self, bloom: Optional[BloomFilter] = None, flush_threshold: int = 65536):
+        self._ids = array('Q')
+        self._pending: set = set()
+        self._vanity: set = set()
+        self._flush_threshold = max(1, int(flush_threshold))
+        self.bloom = bloom
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        old = self._ids
+        merged = array('Q')
+        prev = 0
+        for value in sorted(self._pending):
+            pos = bisect.bisect_left(old, value, prev)
+            merged.extend(old[prev:pos])
+            merged.append(value)
+            prev = pos
+        merged.extend(old[prev:])
+        self._ids = merged
+        self._pending.clear()
+
+    def _contains_key(self, key: Union[int, str]) -> bool:
+        if isinstance(key, int):
+            if key in self._pending:
+                return True
+            ids = self._ids
+            pos = bisect.bisect_left(ids, key)
+            return pos < len(ids) and ids[pos] == key
+        return key in self._vanity
+
+    def add(self, url: str) -> bool:
+        """
+        Add a group URL. Returns True if the group was new to this run,
+        False if it was already present or the URL is not a group URL.
+        """
+        key = group_key(url)
+        if key is None or self._contains_key(key):
+            return False
+        if isinstance(key, int):
+            self._pending.add(key)
+            # Grow the merge batch with the array so merging stays amortized O(n log n)
+            if len(self._pending) >= max(self._flush_threshold, len(self._ids) >> 3):
+                self._flush()
+        else:
+            self._vanity.add(sys.intern(key))
+        if self.bloom is not None:
+            self.bloom.add(_key_bytes(key))
+        return True
+
+    def __contains__(self, url: str) -> bool:
+        key = group_key(url)
+        return key is not None and self._contains_key(key)
+
+    def seen_in_earlier_run(self, url: str) -> bool:
+        """
+        Probabilistic cross-run check against the Bloom filter.
+        Must be called before add() for the same URL in this run.
+        """
+        if self.bloom is None:
+            return False
+        key = group_key(url)
+        return key is not None and _key_bytes(key) in self.bloom
+
+    def __len__(self) -> int:
+        return len(self._ids) + len(self._pending) + len(self._vanity)
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the exact structures (excluding the Bloom filter)."""
+        size = sys.getsizeof(self._ids) + sys.getsizeof(self._pending) + sys.getsizeof(self._vanity)
+        size += sum(sys.getsizeof(k) for k in self._pending)
+        size += sum(sys.getsizeof(k) for k in self._vanity)
+        return size
+
+
+def _run_benchmark(entries: int, lookups: int, with_baseline: bool) -> None:
+    """Compare memory and lookup speed of GroupSeenSet vs a set of URL strings."""
+    import random
+    import time
+
+    rng = random.Random(42)
+    base_id = 100_000_000_000_000
+
+    def make_url(i: int) -> str:
+        return f"https://www.facebook.com/groups/{base_id + i * 7919}"
+
+    print("=" * 60)
+    print(f"SEEN-SET BENCHMARK ({entries:,} entries, {lookups:,} lookups)")
+    print("=" * 60)
+
+    bloom = BloomFilter(capacity=entries, error_rate=0.01)
+    seen = GroupSeenSet(bloom=bloom)
+    start = time.perf_counter()
+    for i in range(entries):
+        seen.add(make_url(i))
+    seen._flush()
+    insert_s = time.perf_counter() - start
+
+    probe = [make_url(rng.randrange(entries * 2)) for _ in range(lookups)]
+    start = time.perf_counter()
+    hits = sum(1 for u in probe if u in seen)
+    lookup_s = time.perf_counter() - start
+
+    print(f"GroupSeenSet: {seen.memory_bytes() / 1e6:,.1f} MB exact + "
+          f"{bloom.memory_bytes() / 1e6:,.1f} MB Bloom, "
+          f"insert {insert_s:.1f}s, lookup {lookup_s / lookups * 1e6:.2f} us/op ({hits:,} hits)")
+
+    if with_baseline:
+        urls = set()
+        start = time.perf_counter()
+        for i in range(entries):
+            urls.add(make_url(i))
+        insert_s = time.perf_counter() - start
+        size = sys.getsizeof(urls) + sum(sys.getsizeof(u) for u in urls)
+        start = time.perf_counter()
+        hits = sum(1 for u in probe if u in urls)
+        lookup_s = time.perf_counter() - start
+        print(f"set[str]:     {size / 1e6:,.1f} MB, "
+              f"insert {insert_s:.1f}s, lookup {lookup_s / lookups * 1e6:.2f} us/op ({hits:,} hits)")
+    print("=" * 60)
+
+
+__all__ = [
+    "group_key",
+    "BloomFilter",
+    "GroupSeenSet",
+]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the compact group seen-set")
+    parser.add_argument('--entries', type=int, default=10_000_000, help='Number of groups to insert (default: 10M)')
+    parser.add_argument('--lookups', type=int, default=1_000_000, help='Number of membership lookups (default: 1M)')
+    parser.add_argument('--no-baseline', action='store_true', help='Skip the set-of-URL-strings comparison')
+    args = parser.parse_args()
+
+    _run_benchmark(args.entries, args.lookups, not args.no_baseline)
@@ -0,0 +1,104 @@
+"""
+Passive Session Health Monitoring
+Facebook Group Data Extractor - Detect a lost login without extra page loads
+
+Purpose:
+- Replace the periodic facebook.com homepage visits (every 5 searches in
+  phase 2, every 10 groups in phase 1) that only looked for "log in" text
+- Re-login only on real evidence that the session is gone
+
+Key Features:
+- Auth cookies: a logged-in session carries c_user and xs; driver.get_cookies()
+  reads them from the browser without navigating
+- Redirects: the URL the browser ended up on after the pages we visit anyway
+  (searches, group pages) is checked for login/checkpoint redirects
+- Cookies are only judged while the browser is on a facebook.com page
+  (get_cookies() only returns the current domain's cookies)
+- A browser whose current URL cannot be read counts as unhealthy; the error
+  is kept so the caller can classify it (a dead session needs a new driver)
+- Counters for the run summary: passive checks and re-logins
+
+Usage:
+    session = SessionMonitor(expect_login=login_success)
+    if not session.healthy(driver):
+        if session.error is not None and classify(session.error) == DEAD_SESSION:
+            driver = rebuild_driver()
+        login_to_facebook(driver, email, password)
+        session.relogged_in()
+"""
+
+from __future__ import annotations
+
+# Standard library imports
+import logging     # Logging lost sessions
+from typing import Optional  # Type hints
+
+# Local module imports
+from retry_policy import is_login_redirect  # Login/checkpoint URL check
+
+
+# Cookies Facebook sets for a logged-in session (user id and session secret)
+AUTH_COOKIES = ("c_user", "xs")
+
+
+class SessionMonitor:
+    """Judges the login session from cookies and the current URL, without navigating."""
+
+    def __init__(self, expect_login: bool = True):
+        self.expect_login = expect_login
+        self.reason: Optional[str] = None
+        self.error: Optional[BaseException] = None
+        self.checks = 0
+        self.relogins = 0
+
+    def healthy(self, driver) -> bool:
+        """
+        True unless there is evidence the session is gone (sets self.reason, and
+        self.error when the browser itself did not answer).
+
+        Sessions that were never logged in are always healthy (public-only mode).
+        """
+        self.reason = None
+        self.error = None
+        if not self.expect_login:
+            return True
+        self.checks += 1
+        try:
+            url = driver.current_url or ""
+        except Exception as e:
+            # Usually a dead session or a closed window
+            logging.debug(f"Session check could not read the current URL: {e}")
+            self.reason = f"current URL unreadable ({type(e).__name__})"
+            self.error = e
+            return False
+
+        if is_login_redirect(url):
+            self.reason = f"redirected to {url[:80]}"
+            return False
+        if "facebook.com" not in url.lower():
+            return True  # cookies of another domain (or about:blank) say nothing
+
+        try:
+            names = {cookie.get("name") for cookie in driver.get_cookies()}
+        except Exception as e:
+            logging.debug(f"Session check could not read cookies: {e}")
+            return True
+        missing = [name for name in AUTH_COOKIES if name not in names]
+        if missing:
+            self.reason = f"auth cookie(s) missing: {', '.join(missing)}"
+            return False
+        return True
+
+    def relogged_in(self, success: bool = True) -> None:
+        """Record a re-login attempt; a failed one switches to public-only mode."""
+        self.relogins += 1
+        self.expect_login = success
+
+    def summary(self) -> str:
+        return f"{self.checks} passive session checks (no page loads), {self.relogins} re-logins"
+
+
+__all__ = [
+    "AUTH_COOKIES",
+    "SessionMonitor",
+]
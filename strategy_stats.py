@@ -0,0 +1,244 @@
+"""
+Extraction Strategy Statistics
+Facebook Group Data Extractor - Selector and pattern hit rates
+
+Purpose:
+- Keep running hit rates for the alternative extraction strategies the
+  scraper tries (group name CSS selectors, member count patterns)
+- Stop spending a find_element round trip per page on a selector that no
+  longer matches anything
+- Make layout drift visible: a selector whose hit rate collapses shows up
+  in the exported statistics
+
+Key Features:
+- Recent hit rate from exponentially decayed counts (old runs fade out),
+  smoothed so unseen strategies start in the middle
+- Strategies ordered by recent hit rate, ties in the code's order (best
+  quality first); one that missed on each of its last N attempts is demoted
+  behind the others
+- Demotion is not permanent: every K calls the demoted strategies are tried
+  first, and a single hit brings one back
+- Persisted between runs in a small JSON file ([strategies] stats_file)
+- Lifetime tries/hits and last hit time kept for the CSV export / report
+
+Usage:
+    stats = get_strategy_stats()
+    for selector in stats.order("group_name", NAME_SELECTORS):
+        ...
+    stats.record_attempts("group_name", tried, winner)
+
+    python strategy_stats.py                            # hit rate report
+    python strategy_stats.py --export output/strategy_stats.csv
+"""
+
+from __future__ import annotations
+
+# Standard library imports
+import os          # File existence checks
+import sys         # Exit codes
+import csv         # CSV export
+import logging     # Logging save errors
+import argparse    # Command-line arguments
+from datetime import datetime  # Last hit timestamps
+from configparser import ConfigParser  # Stats file and tuning options
+from typing import Dict, Iterable, List, Optional, Sequence  # Type hints
+
+# Local module imports
+from json_store import load_json, save_json  # Stats persistence
+
+
+# Bumped when the stats file layout changes (older files are ignored)
+STATS_VERSION = 1
+
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+EXPORT_COLUMNS = ("kind", "strategy", "recent_hit_rate", "tries", "hits", "hit_rate",
+                  "misses_since_hit", "demoted", "last_hit")
+
+
+class StrategyStats:
+    """Per-strategy hit rates used to order alternative extraction strategies."""
+
+    def __init__(self, path: str = "output/strategy_stats.json", decay: float = 0.98,
+                 demote_after: int = 25, probe_every: int = 50, save_every: int = 50):
+        self.path = path
+        self.decay = min(1.0, max(0.0, float(decay)))
+        self.demote_after = int(demote_after)
+        self.probe_every = int(probe_every)
+        self.save_every = int(save_every)
+        self._unsaved = 0
+
+        data = load_json(path, None) if path else None
+        if not isinstance(data, dict) or data.get("version") != STATS_VERSION:
+            data = {}
+        # kind -> strategy -> {"w_tries", "w_hits", "tries", "hits", "since_hit", "last_hit"}
+        self.kinds: Dict[str, Dict[str, dict]] = data.get("kinds", {})
+        # kind -> order() calls, kept across runs so short runs still reach a probe
+        self.calls: Dict[str, int] = data.get("calls", {})
+
+    @classmethod
+    def from_config(cls, cfg: ConfigParser) -> "StrategyStats":
+        return cls(
+            path=cfg.get("strategies", "stats_file", fallback="output/strategy_stats.json").strip(),
+            decay=float(cfg.get("strategies", "decay", fallback="0.98")),
+            demote_after=int(cfg.get("strategies", "demote_after", fallback="25")),
+            probe_every=int(cfg.get("strategies", "probe_every", fallback="50")),
+        )
+
+    def _entry(self, kind: str, strategy: str) -> dict:
+        return self.kinds.setdefault(kind, {}).setdefault(strategy, {
+            "w_tries": 0.0, "w_hits": 0.0, "tries": 0, "hits": 0, "since_hit": 0, "last_hit": "",
+        })
+
+    def hit_rate(self, kind: str, strategy: str) -> float:
+        """Recent hit rate (decayed counts, +1/+2 smoothing: 0.5 for unseen strategies)."""
+        entry = self.kinds.get(kind, {}).get(strategy)
+        if not entry:
+            return 0.5
+        return (entry["w_hits"] + 1.0) / (entry["w_tries"] + 2.0)
+
+    def is_demoted(self, kind: str, strategy: str) -> bool:
+        entry = self.kinds.get(kind, {}).get(strategy)
+        return bool(entry) and self.demote_after > 0 and entry["since_hit"] >= self.demote_after
+
+    def order(self, kind: str, strategies: Sequence[str]) -> List[str]:
+        """
+        Strategies by recent hit rate, ties in the given (quality) order, demoted ones last.
+
+        Every probe_every calls per kind the demoted strategies go first instead,
+        so one that matches again is no longer demoted after its next hit.
+        """
+        position = {s: i for i, s in enumerate(strategies)}
+        calls = self.calls[kind] = self.calls.get(kind, 0) + 1
+        probe = self.probe_every > 0 and calls % self.probe_every == 0
+
+        def key(strategy: str):
+            demoted = self.is_demoted(kind, strategy)
+            return demoted != probe, -self.hit_rate(kind, strategy), position[strategy]
+
+        return sorted(strategies, key=key)
+
+    def record(self, kind: str, strategy: str, hit: bool) -> None:
+        entry = self._entry(kind, strategy)
+        entry["w_tries"] = entry["w_tries"] * self.decay + 1.0
+        entry["w_hits"] = entry["w_hits"] * self.decay + (1.0 if hit else 0.0)
+        entry["tries"] += 1
+        if hit:
+            entry["hits"] += 1
+            entry["since_hit"] = 0
+            entry["last_hit"] = datetime.now().strftime(_TIME_FORMAT)
+        else:
+            entry["since_hit"] += 1
+
+        self._unsaved += 1
+        if self.save_every and self._unsaved >= self.save_every:
+            self.save()
+
+    def record_attempts(self, kind: str, tried: Iterable[str], winner: Optional[str]) -> None:
+        """Record a miss for every strategy tried before the winner and a hit for the winner."""
+        for strategy in tried:
+            self.record(kind, strategy, strategy == winner)
+
+    def rows(self) -> List[dict]:
+        """One row per strategy for the report / CSV export."""
+        rows = []
+        for kind in sorted(self.kinds):
+            kind_rows = []
+            for strategy, entry in self.kinds[kind].items():
+                kind_rows.append({
+                    "kind": kind,
+                    "strategy": strategy,
+                    "recent_hit_rate": round(self.hit_rate(kind, strategy), 4),
+                    "tries": entry["tries"],
+                    "hits": entry["hits"],
+                    "hit_rate": round(entry["hits"] / entry["tries"], 4) if entry["tries"] else 0.0,
+                    "misses_since_hit": entry["since_hit"],
+                    "demoted": self.is_demoted(kind, strategy),
+                    "last_hit": entry["last_hit"],
+                })
+            rows.extend(sorted(kind_rows, key=lambda r: -r["recent_hit_rate"]))
+        return rows
+
+    def export(self, path: str) -> int:
+        """Write the statistics as CSV. Returns the number of rows."""
+        rows = self.rows()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=EXPORT_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+        return len(rows)
+
+    def save(self) -> None:
+        self._unsaved = 0
+        if not self.path:
+            return
+        try:
+            save_json(self.path, {"version": STATS_VERSION, "kinds": self.kinds, "calls": self.calls})
+        except Exception as e:
+            logging.warning(f"Could not save strategy stats {self.path}: {e}")
+
+
+_shared: Optional[StrategyStats] = None
+
+
+def get_strategy_stats() -> StrategyStats:
+    """Process-wide statistics configured from config.ini (created on first use)."""
+    global _shared
+    if _shared is None:
+        cfg = ConfigParser()
+        cfg.read("config.ini")
+        _shared = StrategyStats.from_config(cfg)
+    return _shared
+
+
+def _print_report(stats: StrategyStats) -> None:
+    print("=" * 60)
+    print("EXTRACTION STRATEGY HIT RATES")
+    print("=" * 60)
+    kind = None
+    for row in stats.rows():
+        if row["kind"] != kind:
+            kind = row["kind"]
+            print(f"\n{kind}:")
+        flag = "  ⚠️ demoted" if row["demoted"] else ""
+        print(f"  {row['recent_hit_rate']:5.0%} recent, {row['hits']}/{row['tries']} lifetime  "
+              f"{row['strategy']}  (last hit: {row['last_hit'] or 'never'}){flag}")
+    print("=" * 60)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function to handle command-line arguments"""
+    cfg = ConfigParser()
+    cfg.read("config.ini")
+
+    parser = argparse.ArgumentParser(description='Report extraction strategy hit rates')
+    parser.add_argument('--stats', default=cfg.get("strategies", "stats_file", fallback="output/strategy_stats.json"),
+                        help='Stats file (default: [strategies] stats_file in config.ini)')
+    parser.add_argument('--export', default=None, metavar='CSV', help='Also write the statistics as CSV')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.stats):
+        print(f"❌ Strategy stats not found: {args.stats}")
+        return 1
+
+    stats = StrategyStats(args.stats, decay=float(cfg.get("strategies", "decay", fallback="0.98")),
+                          demote_after=int(cfg.get("strategies", "demote_after", fallback="25")),
+                          probe_every=int(cfg.get("strategies", "probe_every", fallback="50")))
+    _print_report(stats)
+    if args.export:
+        count = stats.export(args.export)
+        print(f"💾 {count} strategies exported to {args.export}")
+    return 0
+
+
+__all__ = [
+    "StrategyStats",
+    "get_strategy_stats",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+"""
+Team / Sport Tagger
+Facebook Group Data Extractor - Map scraped groups back to teams
+
+Purpose:
+- Tag every group record with the team and sport it belongs to, based on
+  its group name (and description when the name names no team)
+- Replace per-team substring/regex loops (teams x rows) with a single
+  Aho-Corasick pass per text
+
+Key Features:
+- Team list from the same Resources files and [keywords] options that
+  input_processor uses for keyword generation (parse cache included)
+- Aliases from the [team_aliases] config section, plus automatic nicknames
+  (last word of the team name, e.g. "Cowboys") when [tagging] auto_nicknames is on;
+  a nickname only counts next to a ticket/sports word ("Cowboys tickets"), so
+  "Heat wave" or "Magic the Gathering" are not tagged
+- Whole-word matching on normalized text (NFKC, casefold, punctuation ignored)
+- Longest match wins; a match shared by several teams (e.g. "Giants") is
+  only used if a longer match does not decide
+- Uses pyahocorasick when installed, a word-level pure-Python automaton otherwise
+- CSV stage: streams rows in, writes the same rows plus team/sport columns
+
+Usage:
+    python team_tagger.py output/merged_results.csv
+    python team_tagger.py output/merged_results.csv --output output/tagged.csv
+    python team_tagger.py --benchmark 1000000
+"""
+
+from __future__ import annotations
+
+# Standard library imports
+import os          # File paths
+import re          # Tokenization
+import sys         # Exit codes
+import csv         # CSV input/output
+import time        # Benchmark timing
+import logging     # Logging alias problems
+import argparse    # Command-line arguments
+from configparser import ConfigParser  # Team list options and aliases
+from typing import Dict, Iterable, List, MutableMapping, Optional, Sequence, Tuple  # Type hints
+
+# Local module imports
+from input_processor import load_teams_from_resources, normalize_keyword  # Team list and normalization
+
+# Optional C implementation
+try:
+    import ahocorasick  # type: ignore
+except ImportError:
+    ahocorasick = None
+
+
+# Text fields tried in order; later fields are only used if earlier ones name no team
+TAG_FIELDS = ("group_name", "description")
+
+# Words never used as automatic nicknames
+_NICKNAME_STOPWORDS = frozenset({"city", "club", "team", "united", "state", "fc", "sc"})
+
+# A bare nickname only counts directly before or after one of these words (or the team's sport)
+_NICKNAME_CONTEXT = frozenset({
+    "ticket", "tickets", "tix", "seats", "season", "psl", "game", "games", "gameday",
+    "tailgate", "fan", "fans", "nation", "football", "baseball", "basketball", "hockey", "soccer",
+})
+
+_WORD = re.compile(r"\w+")
+
+
+def _tokens(text: str) -> List[str]:
+    return _WORD.findall(normalize_keyword(text)) if text else []
+
+
+class _WordAutomaton:
+    """Aho-Corasick automaton over word tokens (pure-Python fallback)."""
+
+    def __init__(self) -> None:
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List[int]] = [[]]
+
+    def add(self, words: Sequence[str], value: int) -> None:
+        state = 0
+        for word in words:
+            nxt = self.goto[state].get(word)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][word] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            state = nxt
+        self.out[state].append(value)
+
+    def build(self) -> None:
+        # Breadth-first failure links; outputs of the failure state are merged in
+        queue = list(self.goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for word, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and word not in self.goto[f]:
+                    f = self.fail[f]
+                target = self.goto[f].get(word, 0)
+                self.fail[nxt] = target if target != nxt else 0
+                if self.out[self.fail[nxt]]:
+                    self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def iter(self, words: Sequence[str]) -> Iterable[int]:
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for word in words:
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            if out[state]:
+                yield from out[state]
+
+
+class TeamTagger:
+    """Finds the team (and its sport) named in a text."""
+
+    def __init__(self, teams: Iterable[Tuple[str, str]], aliases: Optional[Dict[str, List[str]]] = None,
+                 nicknames: bool = False):
+        # Distinct (team, sport) entries
+        self.entries: List[Tuple[str, str]] = []
+        index: Dict[Tuple[str, str], int] = {}
+        by_name: Dict[str, List[int]] = {}
+        sport_words: Dict[str, set] = {}
+        for team, sport in teams:
+            team = " ".join((team or "").split())
+            key = (normalize_keyword(team), sport)
+            if not team or key in index:
+                continue
+            index[key] = len(self.entries)
+            by_name.setdefault(key[0], []).append(index[key])
+            sport_words.setdefault(key[0], set()).update(_tokens(sport))
+            self.entries.append((team, sport))
+
+        # Pattern (token tuple) -> entry ids
+        patterns: Dict[Tuple[str, ...], set] = {}
+        for norm_team, ids in by_name.items():
+            patterns.setdefault(tuple(_WORD.findall(norm_team)), set()).update(ids)
+        for team, names in (aliases or {}).items():
+            ids = by_name.get(normalize_keyword(team))
+            if not ids:
+                logging.warning("Alias entry for unknown team %r ignored", team)
+                continue
+            for name in names:
+                words = tuple(_tokens(name))
+                if words:
+                    patterns.setdefault(words, set()).update(ids)
+        if nicknames:
+            for norm_team, ids in by_name.items():
+                words = _WORD.findall(norm_team)
+                last = words[-1] if words else ""
+                if len(words) > 1 and len(last) >= 4 and not last.isdigit() and last not in _NICKNAME_STOPWORDS:
+                    # The city is covered by the full team name pattern
+                    for context in _NICKNAME_CONTEXT | sport_words[norm_team]:
+                        patterns.setdefault((last, context), set()).update(ids)
+                        patterns.setdefault((context, last), set()).update(ids)
+
+        # Pattern id -> (length in words, entry ids)
+        self.patterns: List[Tuple[int, Tuple[int, ...]]] = []
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+        else:
+            self._automaton = _WordAutomaton()
+        for words, ids in patterns.items():
+            pattern_id = len(self.patterns)
+            self.patterns.append((len(words), tuple(sorted(ids))))
+            if ahocorasick is not None:
+                self._automaton.add_word(" " + " ".join(words) + " ", pattern_id)
+            else:
+                self._automaton.add(words, pattern_id)
+        if ahocorasick is not None:
+            if self.patterns:
+                self._automaton.make_automaton()
+        else:
+            self._automaton.build()
+
+    @classmethod
+    def from_config(cls, cfg: ConfigParser, resources_dir: str = "Resources") -> "TeamTagger":
+        """Team list from [keywords] options, aliases from [team_aliases], nicknames per [tagging]."""
+        def _list(value: str) -> List[str]:
+            return [v.strip() for v in (value or "").split(",") if v.strip()]
+
+        teams = load_teams_from_resources(
+            resources_dir,
+            sheets=_list(cfg.get("keywords", "sheets", fallback="")),
+            columns=_list(cfg.get("keywords", "columns", fallback="A")) or ["A"],
+            header_rows=int(cfg.get("keywords", "header_rows", fallback="1")),
+            cache_file=cfg.get("keywords", "cache_file", fallback="output/keyword_cache.json").strip() or None,
+            workers=int(cfg.get("keywords", "workers", fallback="0")),
+        )
+        aliases: Dict[str, List[str]] = {}
+        if cfg.has_section("team_aliases"):
+            for team, value in cfg.items("team_aliases"):
+                aliases[team] = _list(value)
+        return cls(teams, aliases, nicknames=cfg.getboolean("tagging", "auto_nicknames", fallback=False))
+
+    def _matches(self, words: List[str]) -> Iterable[int]:
+        if not words or not self.patterns:
+            return ()
+        if ahocorasick is not None:
+            return (value for _, value in self._automaton.iter(" " + " ".join(words) + " "))
+        return self._automaton.iter(words)
+
+    def tag_text(self, text: str) -> Optional[Tuple[str, str]]:
+        """
+        Team and sport named in the text.
+
+        Returns:
+            (team, sport) - sports are joined with '; ' if the team is listed under
+            several - or None if no team (or only an ambiguous alias) was found
+        """
+        best_len = 0
+        best_ids: set = set()
+        patterns = self.patterns
+        for pattern_id in self._matches(_tokens(text)):
+            length, ids = patterns[pattern_id]
+            if length > best_len:
+                best_len, best_ids = length, set(ids)
+            elif length == best_len:
+                best_ids.update(ids)
+        if not best_ids:
+            return None
+        names = {self.entries[i][0] for i in best_ids}
+        if len(names) != 1:
+            return None
+        sports = sorted({self.entries[i][1] for i in best_ids if self.entries[i][1]})
+        return names.pop(), "; ".join(sports)
+
+    def tag(self, record: MutableMapping, fields: Sequence[str] = TAG_FIELDS) -> bool:
+        """Set record['team'] and record['sport'] ('' if untagged). Returns True if tagged."""
+        for field in fields:
+            found = self.tag_text(record.get(field) or "")
+            if found:
+                record["team"], record["sport"] = found
+                return True
+        record["team"] = record["sport"] = ""
+        return False
+
+
+def tag_csv(tagger: TeamTagger, input_file: str, output_file: str) -> Tuple[int, int]:
+    """Copy a CSV adding team/sport columns. Returns (rows, tagged rows)."""
+    rows = tagged = 0
+    with open(input_file, "r", encoding="utf-8", newline="") as src, \
+            open(output_file, "w", encoding="utf-8", newline="") as dst:
+        reader = csv.DictReader(src)
+        fieldnames = list(reader.fieldnames or [])
+        fieldnames += [c for c in ("team", "sport") if c not in fieldnames]
+        writer = csv.DictWriter(dst, fieldnames=fieldnames)
+        writer.writeheader()
+        for row in reader:
+            rows += 1
+            if tagger.tag(row):
+                tagged += 1
+            writer.writerow(row)
+    return rows, tagged
+
+
+def _run_benchmark(count: int) -> None:
+    """Tag synthetic group names against a few thousand synthetic teams."""
+    import random
+
+    rng = random.Random(7)
+    cities = [f"City{i}" for i in range(400)]
+    mascots = [f"Mascot{i}" for i in range(300)]
+    teams = [(f"{rng.choice(cities)} {rng.choice(mascots)}", f"Sport{i % 6}") for i in range(4000)]
+    tagger = TeamTagger(teams)
+    names = []
+    for i in range(count):
+        team = teams[i % len(teams)][0]
+        names.append(f"{team} Season Tickets Exchange" if i % 3 else f"Buy and sell tickets group {i}")
+
+    print("=" * 60)
+    print(f"TEAM TAGGER BENCHMARK ({count:,} names, {len(tagger.entries):,} teams, "
+          f"{'pyahocorasick' if ahocorasick is not None else 'pure Python'})")
+    print("=" * 60)
+    start = time.perf_counter()
+    tagged = sum(1 for name in names if tagger.tag_text(name))
+    elapsed = time.perf_counter() - start
+    print(f"Tagged {tagged:,} of {count:,} in {elapsed:.1f}s ({count / max(elapsed, 1e-9):,.0f} names/s)")
+    print("=" * 60)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function to handle command-line arguments"""
+    parser = argparse.ArgumentParser(description='Tag group records with the team and sport they belong to')
+    parser.add_argument('input', nargs='?', help='CSV file with group_name/description columns')
+    parser.add_argument('--output', default=None, help='Output CSV (default: <input>_tagged.csv)')
+    parser.add_argument('--resources', default='Resources', help='Team list directory (default: Resources)')
+    parser.add_argument('--benchmark', type=int, default=None, metavar='N', help='Run a synthetic benchmark with N names')
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        _run_benchmark(args.benchmark)
+        return 0
+    if not args.input:
+        parser.error("input CSV is required (or use --benchmark)")
+    if not os.path.exists(args.input):
+        print(f"❌ Input file not found: {args.input}")
+        return 1
+
+    cfg = ConfigParser()
+    cfg.read("config.ini")
+    tagger = TeamTagger.from_config(cfg, resources_dir=args.resources)
+    output = args.output or os.path.splitext(args.input)[0] + "_tagged.csv"
+    start = time.perf_counter()
+    rows, tagged = tag_csv(tagger, args.input, output)
+    print(f"✅ Tagged {tagged:,} of {rows:,} rows in {time.perf_counter() - start:.1f}s -> {output}")
+    return 0
+
+
+__all__ = [
+    "TeamTagger",
+    "tag_csv",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,322 @@
+"""
+Keyword Template Overlap Analysis
+Facebook Group Data Extractor - Prune keyword templates that add no new groups
+
+Purpose:
+- Measure how much the groups found by different keyword templates overlap
+  for the same team ("{team} Tickets" vs "{team} Verified Tickets", ...)
+- Mark templates whose marginal new yield is too low, so the keyword
+  generator stops spending searches on them
+
+Key Features:
+- Reads keyword -> group hits from the results database (keyword_hits)
+- Pairwise template overlap: Jaccard similarity estimated from MinHash
+  signatures over (team, group) pairs (numpy-vectorized when available)
+- Marginal yield per template: groups per search that no other kept template
+  found for the same team, counted only on teams searched with both
+- Greedy pruning: the weakest template below the threshold is dropped and
+  the others are re-evaluated, so two redundant templates never both go
+- Templates with too few comparable searches are never pruned
+- Templates pruned by an earlier run stay pruned until they are searched again
+  (they drop out of the --days window because they are no longer searched)
+- Writes the pruned list to [keywords] pruned_templates_file, which
+  input_processor.load_keyword_templates() honors
+
+Usage:
+    python template_analysis.py                    # report only
+    python template_analysis.py --write            # report and save pruned templates
+    python template_analysis.py --min-yield 0.5 --min-searches 20 --days 90 --write
+"""
+
+from __future__ import annotations
+
+# Standard library imports
+import os          # File existence checks
+import sys         # Exit codes
+import hashlib     # Stable 64-bit token hashes
+import logging     # Logging pruning decisions
+import argparse    # Command-line arguments
+import random      # MinHash permutation coefficients
+from datetime import datetime, timedelta  # Analysis window
+from configparser import ConfigParser  # Default paths and thresholds
+from typing import Dict, Iterable, List, Optional, Set, Tuple  # Type hints
+
+# Local module imports
+from json_store import load_json, save_json  # Pruning file persistence
+from results_db import ResultsDB  # Keyword hits
+
+
+# Bumped when the pruning file layout changes
+PRUNING_VERSION = 1
+
+# Mersenne prime for the universal hash family used by MinHash
+# (a * h stays below 2**62, so numpy can compute it in uint64)
+_MERSENNE_PRIME = (1 << 31) - 1
+
+# template -> team -> group keys / searches
+TemplateHits = Dict[str, Dict[str, Set[str]]]
+TemplateSearches = Dict[str, Dict[str, int]]
+
+
+def load_template_hits(db: ResultsDB, since: Optional[str] = None) -> Tuple[TemplateHits, TemplateSearches]:
+    """
+    Read hits and search counts per template and team from the results database.
+
+    Args:
+        db: Open results database
+        since: Only keywords last searched at or after this timestamp
+
+    Returns:
+        (hits, searches): template -> team -> set of group keys / number of keywords searched
+    """
+    date_filter = " AND k.last_searched >= ?" if since else ""
+    params = [since] if since else []
+
+    searches: TemplateSearches = {}
+    for template, team, count in db.conn.execute(
+            "SELECT k.template, COALESCE(k.team, ''), COUNT(*) FROM keywords AS k "
+            "WHERE k.template IS NOT NULL" + date_filter + " GROUP BY k.template, k.team", params):
+        searches.setdefault(template, {})[team] = count
+
+    hits: TemplateHits = {template: {} for template in searches}
+    for template, team, key in db.conn.execute(
+            "SELECT k.template, COALESCE(k.team, ''), h.group_key FROM keyword_hits AS h "
+            "JOIN keywords AS k ON k.id = h.keyword_id "
+            "WHERE k.template IS NOT NULL" + date_filter, params):
+        hits.setdefault(template, {}).setdefault(team, set()).add(key)
+    return hits, searches
+
+
+def templates_searched_since(db: ResultsDB, templates: Iterable[str], since: str) -> Set[str]:
+    """Templates with at least one keyword searched after the given timestamp."""
+    templates = list(templates)
+    if not templates:
+        return set()
+    marks = ", ".join("?" for _ in templates)
+    return {template for (template,) in db.conn.execute(
+        "SELECT DISTINCT template FROM keywords "
+        f"WHERE template IN ({marks}) AND last_searched > ?", [*templates, since])}
+
+
+def _token_hashes(team_hits: Dict[str, Set[str]]) -> List[int]:
+    hashes = []
+    for team, keys in team_hits.items():
+        prefix = team.encode("utf-8") + b"\x1f"
+        for key in keys:
+            digest = hashlib.blake2b(prefix + key.encode("utf-8"), digest_size=8).digest()
+            hashes.append(int.from_bytes(digest, "little") % _MERSENNE_PRIME)
+    return hashes
+
+
+def minhash_signature(hashes: List[int], num_perm: int = 128, seed: int = 1) -> List[int]:
+    """
+    MinHash signature of a set given as token hashes (already reduced mod the prime).
+
+    Permutation i is h -> (a_i * h + b_i) mod p; the same seed gives the same
+    permutations, so signatures built with the same seed are comparable.
+    """
+    rng = random.Random(seed)
+    coeffs = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm)]
+    if not hashes:
+        return [_MERSENNE_PRIME] * num_perm
+    try:
+        import numpy as np  # type: ignore
+    except ImportError:
+        p = _MERSENNE_PRIME
+        return [min((a * h + b) % p for h in hashes) for a, b in coeffs]
+
+    h = np.asarray(hashes, dtype=np.uint64)
+    p = np.uint64(_MERSENNE_PRIME)
+    return [int(((np.uint64(a) * h + np.uint64(b)) % p).min()) for a, b in coeffs]
+
+
+def estimate_jaccard(sig_a: List[int], sig_b: List[int]) -> float:
+    """Fraction of matching MinHash slots (estimated Jaccard similarity)."""
+    if not sig_a or len(sig_a) != len(sig_b):
+        return 0.0
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+def overlap_matrix(hits: TemplateHits, num_perm: int = 128) -> Dict[Tuple[str, str], float]:
+    """Estimated Jaccard similarity of the (team, group) sets of every template pair."""
+    signatures = {t: minhash_signature(_token_hashes(team_hits), num_perm) for t, team_hits in hits.items()}
+    templates = sorted(signatures)
+    matrix: Dict[Tuple[str, str], float] = {}
+    for i, a in enumerate(templates):
+        for b in templates[i + 1:]:
+            matrix[(a, b)] = matrix[(b, a)] = estimate_jaccard(signatures[a], signatures[b])
+    return matrix
+
+
+def marginal_yields(hits: TemplateHits, searches: TemplateSearches,
+                    active: Iterable[str]) -> Dict[str, Tuple[int, int, float]]:
+    """
+    Groups each template found that no other active template found for the same team.
+
+    Only teams searched with the template and with at least one other active
+    template are compared.
+
+    Returns:
+        template -> (unique groups, comparable searches, unique groups per search)
+    """
+    active = list(active)
+    result: Dict[str, Tuple[int, int, float]] = {}
+    for template in active:
+        others = [t for t in active if t != template]
+        unique = compared = 0
+        for team, count in searches.get(template, {}).items():
+            if not any(team in searches.get(t, {}) for t in others):
+                continue
+            compared += count
+            found = hits.get(template, {}).get(team, set())
+            if found:
+                covered: Set[str] = set()
+                for t in others:
+                    covered |= hits.get(t, {}).get(team, set())
+                unique += len(found - covered)
+        result[template] = (unique, compared, unique / compared if compared else 0.0)
+    return result
+
+
+def choose_pruned(hits: TemplateHits, searches: TemplateSearches,
+                  min_yield: float = 0.5, min_searches: int = 10,
+                  keep_pruned: Iterable[str] = ()) -> List[str]:
+    """
+    Greedily drop the template with the lowest marginal yield while it is below min_yield.
+
+    Yields are recomputed after every drop, and at least one template is kept.
+    Templates in keep_pruned start out pruned and are not re-evaluated.
+    """
+    pruned: List[str] = list(dict.fromkeys(keep_pruned))
+    active = [t for t in sorted(searches) if t not in pruned]
+    while len(active) > 1:
+        yields = marginal_yields(hits, searches, active)
+        candidates = [(y, t) for t, (_, compared, y) in yields.items()
+                      if compared >= min_searches and y < min_yield]
+        if not candidates:
+            break
+        _, weakest = min(candidates)
+        logging.info("Pruning template %r: %.2f new groups per search", weakest, yields[weakest][2])
+        active.remove(weakest)
+        pruned.append(weakest)
+    return pruned
+
+
+def load_pruning_file(path: str) -> Tuple[List[str], str]:
+    """Pruned templates and generation time of an earlier pruning file (([], '') if none)."""
+    data = load_json(path, None) if path and os.path.exists(path) else None
+    if not isinstance(data, dict) or data.get("version") != PRUNING_VERSION:
+        return [], ""
+    pruned = [t for t in data.get("pruned", []) if isinstance(t, str)]
+    return pruned, str(data.get("generated_at", ""))
+
+
+def write_pruning_file(path: str, pruned: List[str], min_yield: float, min_searches: int,
+                       yields: Dict[str, Tuple[int, int, float]]) -> None:
+    save_json(path, {
+        "version": PRUNING_VERSION,
+        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "min_yield": min_yield,
+        "min_searches": min_searches,
+        "pruned": pruned,
+        "yields": {t: {"unique": u, "searches": c, "yield": round(y, 4)} for t, (u, c, y) in yields.items()},
+    })
+
+
+def _print_report(hits: TemplateHits, searches: TemplateSearches,
+                  matrix: Dict[Tuple[str, str], float], yields: Dict[str, Tuple[int, int, float]],
+                  pruned: List[str]) -> None:
+    print("=" * 60)
+    print("KEYWORD TEMPLATE OVERLAP")
+    print("=" * 60)
+    for template in sorted(searches):
+        groups = sum(len(keys) for keys in hits.get(template, {}).values())
+        print(f"  {template!r}: {sum(searches[template].values())} searches, {groups} team/group hits")
+
+    if matrix:
+        print("\nEstimated Jaccard overlap (MinHash):")
+        for (a, b), value in sorted(matrix.items(), key=lambda item: -item[1]):
+            if a < b:
+                print(f"  {value:5.0%}  {a!r} ~ {b!r}")
+
+    print("\nMarginal new groups per search (vs. all other templates):")
+    for template, (unique, compared, value) in sorted(yields.items(), key=lambda item: item[1][2]):
+        print(f"  {value:6.2f}  {template!r} ({unique} unique over {compared} comparable searches)")
+
+    print()
+    if pruned:
+        print(f"✂️  Templates to prune: {', '.join(repr(t) for t in pruned)}")
+    else:
+        print("✅ No template below the threshold")
+    print("=" * 60)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function to handle command-line arguments"""
+    cfg = ConfigParser()
+    cfg.read("config.ini")
+
+    parser = argparse.ArgumentParser(description='Analyze keyword template overlap and prune low-yield templates')
+    parser.add_argument('--db', default=cfg.get("database", "path", fallback="output/results.db"),
+                        help='Results database (default: [database] path in config.ini)')
+    parser.add_argument('--output', default=cfg.get("keywords", "pruned_templates_file",
+                                                    fallback="output/pruned_templates.json"),
+                        help='Pruned templates file read by the keyword generator')
+    parser.add_argument('--min-yield', type=float,
+                        default=float(cfg.get("keywords", "prune_min_yield", fallback="0.5")),
+                        help='Prune templates finding fewer new groups per search than this')
+    parser.add_argument('--min-searches', type=int,
+                        default=int(cfg.get("keywords", "prune_min_searches", fallback="10")),
+                        help='Comparable searches a template needs before it can be pruned')
+    parser.add_argument('--days', type=int, default=None, help='Only keywords searched in the last N days')
+    parser.add_argument('--num-perm', type=int, default=128, help='MinHash signature size')
+    parser.add_argument('--write', action='store_true', help='Save the pruned templates file')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"❌ Results database not found: {args.db}")
+        return 1
+
+    since = None
+    if args.days is not None:
+        since = (datetime.now() - timedelta(days=args.days)).strftime("%Y-%m-%d %H:%M:%S")
+
+    # Pruned templates are no longer searched, so they would fall out of the window
+    # and come back on the next run; they stay pruned unless searched since then
+    previous, generated_at = load_pruning_file(args.output)
+    with ResultsDB(args.db) as db:
+        hits, searches = load_template_hits(db, since=since)
+        retried = templates_searched_since(db, previous, generated_at)
+    if not searches:
+        print("⚠️  No keyword searches with template information in the database")
+        return 1
+    carried = [t for t in previous if t not in retried]
+    if carried:
+        logging.info("Keeping %d template(s) pruned without new searches: %s", len(carried), carried)
+
+    pruned = choose_pruned(hits, searches, min_yield=args.min_yield, min_searches=args.min_searches,
+                           keep_pruned=carried)
+    yields = marginal_yields(hits, searches, sorted(searches))
+    _print_report(hits, searches, overlap_matrix(hits, args.num_perm), yields, pruned)
+
+    if args.write:
+        write_pruning_file(args.output, pruned, args.min_yield, args.min_searches, yields)
+        print(f"💾 Pruned templates saved to {args.output}")
+    return 0
+
+
+__all__ = [
+    "load_template_hits",
+    "minhash_signature",
+    "estimate_jaccard",
+    "overlap_matrix",
+    "marginal_yields",
+    "choose_pruned",
+    "templates_searched_since",
+    "load_pruning_file",
+    "write_pruning_file",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,9 +10,25 @@ import sys
 import os
 import csv
 import time
+import configparser
 from datetime import datetime
 from login import get_driver_with_config, login_to_facebook, load_credentials_from_config, validate_credentials
 from scraper import scrape_group_data
+from parquet_store import write_parquet_batch
+from results_db import open_results_db
+
+# CSV columns, fixed so rows from different runs always line up with the header
+CSV_FIELDS = [
+    'group_name', 'group_url', 'member_count', 'description', 'privacy',
+    'admin_names', 'admin_profile_urls', 'member_names', 'member_profile_urls',
+    'extraction_date', 'restricted', 'timed_out_steps',
+]
+
+
+def _read_header(filepath):
+    """Header row of an existing CSV file ([] if empty)"""
+    with open(filepath, 'r', newline='', encoding='utf-8') as csvfile:
+        return next(csv.reader(csvfile), [])
 
 
 def save_to_csv(data, filename='test_single_group_results.csv'):
@@ -37,11 +53,16 @@ def save_to_csv(data, filename='test_single_group_results.csv'):
         # Check if file exists to determine if we need to write header
         file_exists = os.path.exists(filepath)
         
+        # A file written with other columns (older version) is kept under a new name
+        if file_exists and _read_header(filepath) != CSV_FIELDS:
+            name, ext = os.path.splitext(filepath)
+            old_filepath = f"{name}_old_{datetime.now().strftime('%Y%m%d_%H%M%S')}{ext}"
+            os.replace(filepath, old_filepath)
+            print(f"📁 Columns changed - previous results moved to: {old_filepath}")
+            file_exists = False
+        
         with open(filepath, 'a', newline='', encoding='utf-8') as csvfile:
-            # Get fieldnames from data dictionary
-            fieldnames = list(data.keys())
-            
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDS, extrasaction='ignore')
             
             # Write header only if file is new
             if not file_exists:
@@ -66,8 +87,7 @@ def save_to_csv(data, filename='test_single_group_results.csv'):
         
         try:
             with open(alt_filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = list(data.keys())
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDS, extrasaction='ignore')
                 writer.writeheader()
                 writer.writerow(data)
             
@@ -111,7 +131,7 @@ def load_urls_from_file(filename):
         return []
 
 
-def process_single_group(driver, group_url, index=1, total=1):
+def process_single_group(driver, group_url, index=1, total=1, write_csv=True, db=None):
     """
     Process a single group URL
     
@@ -120,6 +140,8 @@ def process_single_group(driver, group_url, index=1, total=1):
         group_url (str): Facebook group URL
         index (int): Current URL index (for progress tracking)
         total (int): Total number of URLs
+        write_csv (bool): Append the result to test_single_group_results.csv
+        db (ResultsDB): Optional results database to write the result through to
     
     Returns:
         dict: Extracted group data or None if failed
@@ -148,7 +170,10 @@ def process_single_group(driver, group_url, index=1, total=1):
         print(f"Extraction Date: {data.get('extraction_date', 'N/A')}")
         
         # Save to CSV
-        save_to_csv(data, filename='test_single_group_results.csv')
+        if write_csv:
+            save_to_csv(data, filename='test_single_group_results.csv')
+        if db is not None:
+            db.upsert_records([data], source='test_single_group')
         return data
     else:
         print(f"\n❌ Extraction failed for: {group_url}")
@@ -190,6 +215,14 @@ def main():
     print(f"MULTI-GROUP EXTRACTION ({len(urls)} URLs)")
     print("=" * 60)
     
+    # Output format: csv, parquet or both
+    config = configparser.ConfigParser()
+    config.read('config.ini')
+    output_format = config.get('scraping', 'output_format', fallback='csv').strip().lower()
+    parquet_dir = config.get('scraping', 'parquet_dir', fallback='output/parquet')
+    write_csv = output_format in ('csv', 'both')
+    db = open_results_db(config)
+    
     # Setup driver
     driver = get_driver_with_config()
     
@@ -213,7 +246,7 @@ def main():
     
     for i, group_url in enumerate(urls, 1):
         try:
-            data = process_single_group(driver, group_url, index=i, total=len(urls))
+            data = process_single_group(driver, group_url, index=i, total=len(urls), write_csv=write_csv, db=db)
             if data:
                 results.append(data)
                 successful += 1
@@ -241,7 +274,16 @@ def main():
     print(f"Total URLs: {len(urls)}")
     print(f"✅ Successful: {successful}")
     print(f"❌ Failed: {failed}")
-    print(f"📊 Results saved to: output/test_single_group_results.csv")
+    if write_csv:
+        print(f"📊 Results saved to: output/test_single_group_results.csv")
+    
+    # Parquet output is appended once per run as a single batch
+    if output_format in ('parquet', 'both') and results:
+        if write_parquet_batch(results, parquet_dir, source='test_single_group'):
+            print(f"📊 Results appended to Parquet dataset: {parquet_dir}")
+    if db is not None:
+        print(f"🗄️  Results written to database: {db.path}")
+        db.close()
     
     # Keep browser open for 10 seconds
     print("\n⚠️  Browser will close in 10 seconds...")